@@ -1,9 +1,10 @@
 import os
 import json
 import logging
+import threading
 from typing import Dict, Any, Optional, List
-import google.generativeai as genai
 from dotenv import load_dotenv
+from runtime.executor import task_executor
 
 # Load environment variables
 load_dotenv()
@@ -17,17 +18,29 @@ GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 if not GEMINI_API_KEY:
     logger.warning("GEMINI_API_KEY not found in environment variables")
 
-genai.configure(api_key=GEMINI_API_KEY)
-
 class GeminiClient:
     def __init__(self, model_name: str = "gemini-pro"):
         """Initialize the Gemini client.
         
+        The SDK is imported and configured when the model is first used.
+        
         Args:
             model_name: The name of the Gemini model to use.
         """
         self.model_name = model_name
-        self.model = genai.GenerativeModel(model_name)
+        self._model = None
+        self._lock = threading.Lock()
+    
+    @property
+    def model(self):
+        """The Gemini model, created on first use."""
+        with self._lock:
+            if self._model is None:
+                import google.generativeai as genai
+                
+                genai.configure(api_key=GEMINI_API_KEY)
+                self._model = genai.GenerativeModel(self.model_name)
+            return self._model
     
     async def generate_content(self, prompt: str, temperature: float = 0.7, max_output_tokens: int = 1024) -> str:
         """Generate content using the Gemini API.
@@ -48,7 +61,9 @@ class GeminiClient:
                 "top_k": 40,
             }
             
-            response = self.model.generate_content(
+            # The SDK call is synchronous; keep it off the event loop
+            response = await task_executor.run_io(
+                self.model.generate_content,
                 prompt,
                 generation_config=generation_config
             )
@@ -0,0 +1,140 @@
+"""Benchmark DataProcessor.get_dataset_profile against the per-column implementation.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_dataset_profile [--rows 100000] [--repeat 3]
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from data_processing.data_processor import data_processor
+
+def legacy_profile(df: pd.DataFrame) -> dict:
+    """Column-by-column profile, as implemented before the vectorized rewrite."""
+    profile = {
+        "row_count": len(df),
+        "column_count": len(df.columns),
+        "columns": {},
+        "missing_values": {},
+        "numeric_stats": {},
+        "categorical_stats": {},
+        "correlations": {}
+    }
+
+    # Column types
+    for col in df.columns:
+        if pd.api.types.is_numeric_dtype(df[col]):
+            profile["columns"][col] = "numeric"
+        elif pd.api.types.is_datetime64_dtype(df[col]):
+            profile["columns"][col] = "datetime"
+        else:
+            profile["columns"][col] = "categorical"
+
+    # Missing values
+    for col in df.columns:
+        missing_count = df[col].isna().sum()
+        if missing_count > 0:
+            profile["missing_values"][col] = {
+                "count": int(missing_count),
+                "percentage": float(missing_count / len(df) * 100)
+            }
+
+    # Numeric stats
+    for col in df.columns:
+        if profile["columns"][col] == "numeric":
+            profile["numeric_stats"][col] = {
+                "min": float(df[col].min()) if not pd.isna(df[col].min()) else None,
+                "max": float(df[col].max()) if not pd.isna(df[col].max()) else None,
+                "mean": float(df[col].mean()) if not pd.isna(df[col].mean()) else None,
+                "median": float(df[col].median()) if not pd.isna(df[col].median()) else None,
+                "std": float(df[col].std()) if not pd.isna(df[col].std()) else None
+            }
+
+    # Categorical stats
+    for col in df.columns:
+        if profile["columns"][col] == "categorical":
+            value_counts = df[col].value_counts().head(10).to_dict()
+            profile["categorical_stats"][col] = {
+                "unique_count": int(df[col].nunique()),
+                "top_values": {str(k): int(v) for k, v in value_counts.items()}
+            }
+
+    # Correlations (only for numeric columns)
+    numeric_cols = [col for col in df.columns if profile["columns"][col] == "numeric"]
+    if len(numeric_cols) > 1:
+        corr_matrix = df[numeric_cols].corr().round(3)
+        for col1 in numeric_cols:
+            profile["correlations"][col1] = {}
+            for col2 in numeric_cols:
+                if col1 != col2:
+                    profile["correlations"][col1][col2] = float(corr_matrix.loc[col1, col2])
+
+    return profile
+
+def make_frame(rows: int, columns: int, seed: int = 42) -> pd.DataFrame:
+    """Mixed frame: 80% float columns with 5% missing values, 20% low-cardinality strings."""
+    rng = np.random.default_rng(seed)
+    n_numeric = max(1, int(columns * 0.8))
+    data = rng.normal(size=(rows, n_numeric))
+    data[rng.random(size=data.shape) < 0.05] = np.nan
+    frame = {f"num_{i}": data[:, i] for i in range(n_numeric)}
+    levels = np.array([f"level_{i}" for i in range(20)])
+    for i in range(columns - n_numeric):
+        frame[f"cat_{i}"] = levels[rng.integers(0, len(levels), size=rows)]
+    return pd.DataFrame(frame)
+
+def profiles_match(expected, actual, atol: float = 1e-12) -> bool:
+    """Compare two profiles, allowing floating point rounding differences."""
+    if isinstance(expected, dict):
+        return (
+            isinstance(actual, dict)
+            and expected.keys() == actual.keys()
+            and all(profiles_match(expected[k], actual[k], atol) for k in expected)
+        )
+    if isinstance(expected, float) and isinstance(actual, float):
+        return bool(np.isclose(expected, actual, rtol=1e-9, atol=atol, equal_nan=True))
+    return expected == actual
+
+def check_profiles(expected: dict, actual: dict) -> None:
+    """Assert that the vectorized profile matches the legacy one.
+
+    Correlations are rounded to 3 decimals, so they may differ by one unit in
+    the last place; wide frames only keep the strongest pairs, which must
+    match the legacy values.
+    """
+    expected = dict(expected)
+    actual = dict(actual)
+    expected_corr = expected.pop("correlations")
+    actual_corr = actual.pop("correlations")
+    assert profiles_match(expected, actual), "profiles differ"
+    for col1, row in actual_corr.items():
+        for col2, value in row.items():
+            assert profiles_match(expected_corr[col1][col2], value, atol=1.5e-3), "correlations differ"
+
+def best_of(fn, df: pd.DataFrame, repeat: int) -> float:
+    """Best wall time of ``repeat`` calls of ``fn(df)``."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(df)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'columns':>8} {'legacy (s)':>11} {'vectorized (s)':>15} {'speedup':>8}")
+    for columns in [10, 100, 1000]:
+        df = make_frame(args.rows, columns)
+        check_profiles(legacy_profile(df), data_processor.get_dataset_profile(df))
+        legacy = best_of(legacy_profile, df, args.repeat)
+        vectorized = best_of(data_processor.get_dataset_profile, df, args.repeat)
+        print(f"{columns:>8} {legacy:>11.3f} {vectorized:>15.3f} {legacy / vectorized:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
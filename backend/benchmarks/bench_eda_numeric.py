@@ -0,0 +1,95 @@
+"""Benchmark AutomatedEDA's vectorized numeric analysis against the per-column implementation.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_eda_numeric [--rows 100000] [--repeat 3]
+"""
+import argparse
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+from eda.automated_eda import AutomatedEDA
+from benchmarks.bench_dataset_profile import best_of, profiles_match
+
+def legacy_numeric_analysis(df: pd.DataFrame) -> dict:
+    """Column-by-column numeric analysis, as implemented before the vectorized rewrite.
+
+    The original code shadowed ``scipy.stats`` with the statistics dict, so
+    the normality test never ran; here it runs, so both versions do the same
+    work.
+    """
+    numeric_analysis = {}
+    for col in df.select_dtypes(include=np.number).columns:
+        column_stats = df[col].describe().to_dict()
+        column_stats["skewness"] = float(df[col].skew())
+        column_stats["kurtosis"] = float(df[col].kurtosis())
+
+        q1 = column_stats["25%"]
+        q3 = column_stats["75%"]
+        iqr = q3 - q1
+        lower_bound = q1 - 1.5 * iqr
+        upper_bound = q3 + 1.5 * iqr
+        outliers = df[(df[col] < lower_bound) | (df[col] > upper_bound)][col]
+        column_stats["outliers"] = {
+            "count": len(outliers),
+            "percentage": float(len(outliers) / len(df) * 100),
+            "lower_bound": float(lower_bound),
+            "upper_bound": float(upper_bound)
+        }
+
+        if len(df) > 5000:
+            sample = df[col].dropna().sample(5000, random_state=42)
+        else:
+            sample = df[col].dropna()
+        shapiro_test = stats.shapiro(sample)
+        column_stats["normality_test"] = {
+            "test": "shapiro",
+            "statistic": float(shapiro_test[0]),
+            "p_value": float(shapiro_test[1]),
+            "is_normal": float(shapiro_test[1]) > 0.05
+        }
+
+        numeric_analysis[col] = column_stats
+    return numeric_analysis
+
+def make_frame(rows: int, columns: int, seed: int = 42) -> pd.DataFrame:
+    """Numeric frame with skewed and heavy-tailed columns and 2% missing values."""
+    rng = np.random.default_rng(seed)
+    data = np.column_stack([
+        rng.normal(size=rows) if i % 3 == 0 else
+        rng.lognormal(size=rows) if i % 3 == 1 else
+        rng.standard_t(3, size=rows)
+        for i in range(columns)
+    ])
+    data[rng.random(size=data.shape) < 0.02] = np.nan
+    return pd.DataFrame(data, columns=[f"num_{i}" for i in range(columns)])
+
+def check_analyses(expected: dict, actual: dict) -> None:
+    """Assert both analyses match, except for the normality samples, which differ by design."""
+    assert expected.keys() == actual.keys(), "columns differ"
+    for col in expected:
+        expected_stats = {k: v for k, v in expected[col].items() if k != "normality_test"}
+        actual_stats = {k: v for k, v in actual[col].items() if k != "normality_test"}
+        assert profiles_match(expected_stats, actual_stats, atol=1e-9), f"statistics of {col} differ"
+        assert actual[col]["normality_test"]["test"] == "shapiro"
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    # Single-threaded, to compare the per-column and vectorized work itself
+    eda = AutomatedEDA(max_workers=1)
+
+    print(f"{'columns':>8} {'legacy (s)':>11} {'vectorized (s)':>15} {'speedup':>8}")
+    for columns in [10, 100, 300]:
+        df = make_frame(args.rows, columns)
+        check_analyses(legacy_numeric_analysis(df), eda._analyze_numeric_columns(df))
+        legacy = best_of(legacy_numeric_analysis, df, args.repeat)
+        vectorized = best_of(eda._analyze_numeric_columns, df, args.repeat)
+        print(f"{columns:>8} {legacy:>11.3f} {vectorized:>15.3f} {legacy / vectorized:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Benchmark the model leaderboard against training the candidates one by one.
+
+The sequential baseline calls ModelTrainer.train_model once per candidate,
+as N /ml/train requests would, re-fitting the preprocessing each time.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_leaderboard [--rows 20000] [--workers 4] [--budget 600]
+"""
+import argparse
+import tempfile
+import time
+
+import numpy as np
+
+from benchmarks.bench_preprocess import make_frame
+from ml.leaderboard import model_leaderboard
+from ml.model_trainer import model_trainer
+
+# The kernel SVM and the MLP dominate the run time at these sizes
+CANDIDATES = ["logistic_regression", "random_forest", "gradient_boosting", "knn", "decision_tree"]
+# Seeded, so that both runs fit the same models
+HYPERPARAMETERS = {model_type: {"random_state": 0} for model_type in ["random_forest", "gradient_boosting", "decision_tree"]}
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--budget", type=float, default=600)
+    args = parser.parse_args()
+
+    df = make_frame(args.rows, 20, 10)
+    features = [col for col in df.columns if col != "target"]
+    model_trainer.models_dir = tempfile.mkdtemp(prefix="bench-models-")
+
+    started_at = time.perf_counter()
+    sequential = {}
+    for model_type in CANDIDATES:
+        result = model_trainer.train_model(
+            df, "target", features, model_type, "classification", hyperparameters=HYPERPARAMETERS.get(model_type)
+        )
+        sequential[model_type] = result["metrics"]["accuracy"]
+    sequential_seconds = time.perf_counter() - started_at
+
+    def on_event(event):
+        entry = event["data"]
+        print(f"  {entry['finished_at']:>7.2f}s  {entry['model_type']:<20} {entry['status']:<10} {entry.get('score', '')}")
+
+    started_at = time.perf_counter()
+    prepared = model_leaderboard.prepare(df, "target", features, "classification")
+    result = model_leaderboard.run(
+        prepared, "classification", CANDIDATES, "accuracy",
+        time_budget=args.budget, max_workers=args.workers, hyperparameters=HYPERPARAMETERS, on_event=on_event
+    )
+    leaderboard_seconds = time.perf_counter() - started_at
+
+    # Same split, preprocessing and defaults: the scores agree
+    for entry in result["candidates"]:
+        if entry["status"] == "completed":
+            assert np.isclose(entry["score"], sequential[entry["model_type"]]), entry["model_type"]
+
+    print(f"\n{'candidates':>10} {'sequential (s)':>15} {'leaderboard (s)':>16} {'speedup':>8}")
+    print(
+        f"{len(CANDIDATES):>10} {sequential_seconds:>15.2f} {leaderboard_seconds:>16.2f} "
+        f"{sequential_seconds / leaderboard_seconds:>7.1f}x"
+    )
+    print(f"preprocessing once: {prepared['preprocess_seconds']:.2f}s, best: {result['best']['model_type']}")
+
+if __name__ == "__main__":
+    main()
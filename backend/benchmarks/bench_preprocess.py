@@ -0,0 +1,169 @@
+"""Benchmark DataProcessor.preprocess_data against the per-column implementation.
+
+Also compares the dense, sparse and cardinality-aware ('auto') encodings of a
+high-cardinality column.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_preprocess [--rows 20000] [--repeat 3] [--levels 5000]
+"""
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from data_processing.data_processor import data_processor
+from data_processing.encoders import cross_fit_target
+from benchmarks.bench_dataset_profile import best_of, profiles_match
+
+def legacy_preprocess(
+    df: pd.DataFrame,
+    target_column=None,
+    impute_strategy: str = 'mean',
+    scaling_method=None,
+    encoding_method: str = 'onehot'
+):
+    """Column-by-column preprocessing, as implemented before the transform graph.
+
+    ``sparse=False`` is spelled ``sparse_output=False`` for current scikit-learn.
+    """
+    from sklearn.preprocessing import StandardScaler, MinMaxScaler, OneHotEncoder, LabelEncoder
+    from sklearn.impute import SimpleImputer
+
+    metadata = {"imputers": {}, "scalers": {}, "encoders": {}, "feature_names": []}
+    if target_column:
+        y = df[target_column].copy()
+        X = df.drop(columns=[target_column])
+    else:
+        y = None
+        X = df.copy()
+
+    categorical_columns = [col for col in X.columns if not pd.api.types.is_numeric_dtype(X[col])]
+    numeric_columns = [col for col in X.columns if pd.api.types.is_numeric_dtype(X[col])]
+
+    for col in numeric_columns:
+        if X[col].isna().any():
+            imputer = SimpleImputer(strategy=impute_strategy)
+            X[col] = imputer.fit_transform(X[col].values.reshape(-1, 1)).flatten()
+            metadata["imputers"][col] = {"strategy": impute_strategy, "statistics": float(imputer.statistics_[0])}
+
+    for col in categorical_columns:
+        if X[col].isna().any():
+            imputer = SimpleImputer(strategy='most_frequent')
+            X[col] = imputer.fit_transform(X[col].values.reshape(-1, 1)).flatten()
+            metadata["imputers"][col] = {"strategy": "most_frequent", "statistics": str(imputer.statistics_[0])}
+
+    if scaling_method:
+        for col in numeric_columns:
+            scaler = StandardScaler() if scaling_method == 'standard' else MinMaxScaler()
+            X[col] = scaler.fit_transform(X[col].values.reshape(-1, 1)).flatten()
+            metadata["scalers"][col] = {
+                "method": scaling_method,
+                "params": {
+                    "mean": float(scaler.mean_[0]) if hasattr(scaler, 'mean_') else None,
+                    "scale": float(scaler.scale_[0]) if hasattr(scaler, 'scale_') else None,
+                    "min": float(scaler.data_min_[0]) if hasattr(scaler, 'data_min_') else None,
+                    "max": float(scaler.data_max_[0]) if hasattr(scaler, 'data_max_') else None
+                }
+            }
+
+    for col in categorical_columns:
+        if encoding_method == 'onehot':
+            encoder = OneHotEncoder(sparse_output=False, handle_unknown='ignore')
+            encoded = encoder.fit_transform(X[col].values.reshape(-1, 1))
+            encoded_df = pd.DataFrame(
+                encoded, columns=[f"{col}_{cat}" for cat in encoder.categories_[0]], index=X.index
+            )
+            X = X.drop(columns=[col])
+            X = pd.concat([X, encoded_df], axis=1)
+            metadata["encoders"][col] = {"method": "onehot", "categories": [str(cat) for cat in encoder.categories_[0]]}
+        else:
+            encoder = LabelEncoder()
+            X[col] = encoder.fit_transform(X[col])
+            metadata["encoders"][col] = {"method": "label", "classes": [str(cls) for cls in encoder.classes_]}
+
+    metadata["feature_names"] = list(X.columns)
+    return (pd.concat([X, y], axis=1) if target_column else X), metadata
+
+def make_frame(rows: int, numeric: int, categorical: int, seed: int = 0) -> pd.DataFrame:
+    """Frame with missing values in both blocks, categoricals of 2 to 30 levels and a target."""
+    rng = np.random.default_rng(seed)
+    data = rng.normal(size=(rows, numeric))
+    data[rng.random(size=data.shape) < 0.05] = np.nan
+    frame = {f"num_{i}": data[:, i] for i in range(numeric)}
+    for i in range(categorical):
+        levels = np.array([f"level_{j}" for j in range(2 + i % 29)], dtype=object)
+        values = levels[rng.integers(0, len(levels), size=rows)]
+        values[rng.random(size=rows) < 0.02] = np.nan
+        frame[f"cat_{i}"] = values
+    frame["target"] = rng.integers(0, 2, size=rows)
+    return pd.DataFrame(frame)
+
+def check_outputs(expected, actual) -> None:
+    """Assert that both implementations give the same frame and metadata."""
+    expected_df, expected_metadata = expected
+    actual_df, actual_metadata = actual
+    assert list(expected_df.columns) == list(actual_df.columns), "columns differ"
+    np.testing.assert_allclose(
+        expected_df.to_numpy(dtype=float), actual_df.to_numpy(dtype=float), rtol=1e-9, atol=1e-12
+    )
+    actual_metadata = {key: value for key, value in actual_metadata.items() if key != "output"}
+    assert profiles_match(expected_metadata, actual_metadata), "metadata differ"
+
+def check_target_encoding() -> None:
+    """Assert that target encoding stays finite when levels are pure or absent from other folds."""
+    rng = np.random.default_rng(2)
+    for codes in [np.arange(1000), np.repeat(np.arange(300), 4)]:
+        y = (codes % 2).astype(float)
+        encoded, means, _ = cross_fit_target(codes, y, int(codes.max()) + 1, random_state=int(rng.integers(1000)))
+        assert np.isfinite(encoded).all() and np.isfinite(means).all(), "target encoding is not finite"
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--levels", type=int, default=5000, help="levels of the high-cardinality column")
+    args = parser.parse_args()
+
+    check_target_encoding()
+
+    settings = [
+        ("onehot", None, "mean"),
+        ("onehot", "standard", "median"),
+        ("label", "minmax", "most_frequent"),
+    ]
+    print(f"{'categorical':>11} {'encoding':<8} {'scaling':<9} {'legacy (s)':>11} {'graph (s)':>10} {'speedup':>8}")
+    for categorical in [20, 200]:
+        df = make_frame(args.rows, 50, categorical)
+        for encoding, scaling, strategy in settings:
+            kwargs = dict(
+                target_column="target", impute_strategy=strategy,
+                scaling_method=scaling, encoding_method=encoding
+            )
+            graph_kwargs = dict(kwargs, sparse_output=False)
+            check_outputs(legacy_preprocess(df, **kwargs), data_processor.preprocess_data(df, **graph_kwargs))
+            legacy = best_of(lambda frame: legacy_preprocess(frame, **kwargs), df, args.repeat)
+            graph = best_of(lambda frame: data_processor.preprocess_data(frame, **graph_kwargs), df, args.repeat)
+            print(
+                f"{categorical:>11} {encoding:<8} {str(scaling):<9} "
+                f"{legacy:>11.3f} {graph:>10.3f} {legacy / graph:>7.1f}x"
+            )
+
+    # One high-cardinality column: the dense one-hot output grows with rows x
+    # levels, the sparse one with rows, and the 'auto' encoding stays narrow
+    rng = np.random.default_rng(1)
+    df = make_frame(args.rows, 10, 0)
+    df["zip_code"] = rng.integers(0, args.levels, size=args.rows).astype(str)
+    print(f"\n{'encoding':<9} {'output':<8} {'columns':>8} {'estimated MiB':>14} {'actual MiB':>11} {'time (s)':>9}")
+    for encoding, sparse_output in [("onehot", False), ("onehot", True), ("auto", "auto")]:
+        kwargs = dict(target_column="target", encoding_method=encoding, sparse_output=sparse_output)
+        processed, metadata = data_processor.preprocess_data(df, **kwargs)
+        estimate = metadata["output"]
+        seconds = best_of(lambda frame: data_processor.preprocess_data(frame, **kwargs), df, args.repeat)
+        print(
+            f"{encoding:<9} {estimate['format']:<8} {estimate['columns']:>8} "
+            f"{estimate[estimate['format'] + '_bytes'] / 2 ** 20:>14.1f} "
+            f"{processed.memory_usage(deep=True).sum() / 2 ** 20:>11.1f} {seconds:>9.3f}"
+        )
+
+if __name__ == "__main__":
+    main()
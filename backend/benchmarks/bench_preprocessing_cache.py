@@ -0,0 +1,54 @@
+"""Benchmark training with cross-validation against a cold and a warm preprocessing cache.
+
+Each run trains a few model types on the same split with 5-fold
+cross-validation. Cold runs clear the cache before every model; warm runs
+reuse the preprocessors and matrices fitted for the first one.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_preprocessing_cache [--rows 200000] [--folds 5]
+"""
+import argparse
+import tempfile
+import time
+
+from benchmarks.bench_preprocess import make_frame
+from ml.model_trainer import model_trainer
+from ml.preprocessing_cache import preprocessing_cache
+
+MODEL_TYPES = ["logistic_regression", "decision_tree"]
+
+def run(df, features, folds: int, warm: bool) -> float:
+    """Train every model type with cross-validation; returns the wall time."""
+    preprocessing_cache.clear()
+    started_at = time.perf_counter()
+    for model_type in MODEL_TYPES:
+        if not warm:
+            preprocessing_cache.clear()
+        model_trainer.train_model(
+            df, "target", features, model_type, "classification",
+            perform_cv=True, cv_folds=folds
+        )
+    return time.perf_counter() - started_at
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--folds", type=int, default=5)
+    args = parser.parse_args()
+
+    df = make_frame(args.rows, 20, 5)
+    df["target"] = (df["num_0"].fillna(0) + 0.5 * df["num_1"].fillna(0) > 0).astype(int)
+    features = [col for col in df.columns if col != "target"]
+    model_trainer.models_dir = tempfile.mkdtemp(prefix="bench-models-")
+    preprocessing_cache.cache_dir = tempfile.mkdtemp(prefix="bench-preprocessing-")
+
+    cold_seconds = run(df, features, args.folds, warm=False)
+    warm_seconds = run(df, features, args.folds, warm=True)
+
+    print(f"{'cache':<6} {'models':>7} {'time (s)':>9}")
+    print(f"{'cold':<6} {len(MODEL_TYPES):>7} {cold_seconds:>9.1f}")
+    print(f"{'warm':<6} {len(MODEL_TYPES):>7} {warm_seconds:>9.1f}")
+    print(f"speedup: {cold_seconds / warm_seconds:.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Benchmark response serialization formats and compression on large analytical payloads.
+
+Formats and encodings whose optional library (orjson, msgpack, zstandard)
+is not installed are skipped.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_response_encoding [--rows 100000] [--repeat 3]
+"""
+import argparse
+import json
+
+import numpy as np
+import pandas as pd
+
+from eda.automated_eda import AutomatedEDA
+from runtime.serialization import (
+    ResponseEncoder, JSON, MSGPACK, ARROW, json_default, _optional_module
+)
+from benchmarks.bench_dataset_profile import best_of
+from benchmarks.bench_eda_numeric import make_frame
+
+def stdlib_json(payload) -> bytes:
+    """JSON serialization as done before: the standard library with a per-value default."""
+    return json.dumps(payload, default=json_default).encode("utf-8")
+
+def make_payloads(rows: int) -> dict:
+    """An EDA report, a prediction result and a dataset preview, with their tables."""
+    frame = make_frame(rows, 50)
+    frame["category"] = np.random.default_rng(0).choice(["a", "b", "c", "d"], size=rows)
+    report = AutomatedEDA().generate_eda_report(frame)
+
+    rng = np.random.default_rng(1)
+    probabilities = rng.dirichlet(np.ones(3), size=rows)
+    prediction = {
+        "model_id": "benchmark",
+        "predictions": probabilities.argmax(axis=1).tolist(),
+        "probabilities": probabilities.tolist(),
+        "input_shape": [rows, 50],
+    }
+    prediction_table = pd.DataFrame(probabilities, columns=[f"probability_{i}" for i in range(3)])
+    prediction_table.insert(0, "prediction", probabilities.argmax(axis=1))
+
+    preview = frame.head(10_000)
+    return {
+        "eda report": (report, None),
+        "predictions": (prediction, prediction_table),
+        "preview": (preview.to_dict(orient="records"), preview),
+    }
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    encoder = ResponseEncoder(compression_min_bytes=0)
+    zstd_available = _optional_module("zstandard") is not None
+
+    header = f"{'payload':<12} {'format':<18} {'encode (ms)':>12} {'bytes':>12} {'gzip bytes':>12} {'gzip (ms)':>10}"
+    if zstd_available:
+        header += f" {'zstd bytes':>12} {'zstd (ms)':>10}"
+    print(header)
+
+    for name, (payload, table) in make_payloads(args.rows).items():
+        variants = [("json (stdlib)", lambda: stdlib_json(payload))]
+        if _optional_module("orjson") is not None:
+            variants.append(("json (orjson)", lambda: encoder.serialize(payload, JSON)))
+        if MSGPACK in encoder.formats():
+            variants.append(("msgpack", lambda: encoder.serialize(payload, MSGPACK)))
+        if table is not None:
+            variants.append(("arrow ipc", lambda: encoder.serialize(None, ARROW, table)))
+
+        for label, serialize in variants:
+            body = serialize()
+            line = (
+                f"{name:<12} {label:<18} {best_of(lambda _: serialize(), None, args.repeat) * 1000:>12.1f} "
+                f"{len(body):>12,} {len(encoder.compress(body, 'gzip')[0]):>12,} "
+                f"{best_of(lambda _: encoder.compress(body, 'gzip'), None, args.repeat) * 1000:>10.1f}"
+            )
+            if zstd_available:
+                line += (
+                    f" {len(encoder.compress(body, 'zstd')[0]):>12,} "
+                    f"{best_of(lambda _: encoder.compress(body, 'zstd'), None, args.repeat) * 1000:>10.1f}"
+                )
+            print(line)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""Benchmark successive halving against training every configuration on all rows.
+
+Both runs draw the same Sobol configurations of a random forest. The
+exhaustive baseline is a halving bracket with a single full-resource rung.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_search [--rows 200000] [--candidates 27] [--workers 4]
+"""
+import argparse
+import tempfile
+import time
+
+from benchmarks.bench_preprocess import make_frame
+from ml.leaderboard import model_leaderboard
+from ml.search import hyperparameter_search
+from ml.model_trainer import model_trainer
+
+def run(df, features, candidates: int, workers: int, **kwargs):
+    """Prepare the data and run one search; returns the result and its wall time."""
+    started_at = time.perf_counter()
+    prepared = model_leaderboard.prepare(df, "target", features, "classification")
+    result = hyperparameter_search.run(
+        prepared, "classification", ["random_forest"], "accuracy",
+        strategy="halving", n_candidates=candidates, resource="samples",
+        time_budget=24 * 3600, max_workers=workers, **kwargs
+    )
+    return result, time.perf_counter() - started_at
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--candidates", type=int, default=27)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    df = make_frame(args.rows, 20, 5)
+    # A learnable target: the sign of a combination of two features (missing values add noise)
+    df["target"] = (df["num_0"].fillna(0) + 0.5 * df["num_1"].fillna(0) > 0).astype(int)
+    features = [col for col in df.columns if col != "target"]
+    model_trainer.models_dir = tempfile.mkdtemp(prefix="bench-models-")
+
+    halving, halving_seconds = run(df, features, args.candidates, args.workers)
+    exhaustive, exhaustive_seconds = run(df, features, args.candidates, args.workers, max_rungs=1)
+
+    print(f"{'strategy':<12} {'trials':>7} {'time (s)':>9} {'best accuracy':>14}")
+    for name, result, seconds in [
+        ("halving", halving, halving_seconds), ("exhaustive", exhaustive, exhaustive_seconds)
+    ]:
+        print(f"{name:<12} {len(result['trials']):>7} {seconds:>9.1f} {result['best']['score']:>14.4f}")
+
+if __name__ == "__main__":
+    main()
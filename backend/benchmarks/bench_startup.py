@@ -0,0 +1,105 @@
+"""Benchmark the cold start of the API: import cost per module and time to first request.
+
+Every measurement runs in a fresh interpreter, like a new uvicorn worker.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_startup [--repeat 3] [--target 2.0]
+"""
+import argparse
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+# Modules imported by the API process, from the lowest layer up to the app
+MODULES = [
+    "data_processing.dataset_loader",
+    "eda.report_cache",
+    "eda.automated_eda",
+    "runtime.tasks",
+    "ai.gemini_client",
+    "education.content_generator",
+    "ml.model_trainer",
+    "main",
+]
+
+# Imports the app and serves one request, printing both times in seconds
+FIRST_REQUEST = """
+import time
+started = time.perf_counter()
+import main
+imported = time.perf_counter()
+from fastapi.testclient import TestClient
+with TestClient(main.app) as client:
+    client.get("/")
+    print(imported - started, time.perf_counter() - started)
+"""
+
+def import_profile(module: str) -> List[Tuple[str, int, int]]:
+    """Import a module in a fresh interpreter with ``-X importtime``.
+
+    Returns:
+        ``(name, self_us, cumulative_us)`` of every module imported.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, check=True
+    )
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        entries.append((name.strip(), int(self_us), int(cumulative_us)))
+    return entries
+
+def cumulative_seconds(module: str, repeat: int) -> float:
+    """Best-of-``repeat`` cumulative import time of a module."""
+    times = []
+    for _ in range(repeat):
+        entries = import_profile(module)
+        times.append(next(cumulative for name, _, cumulative in reversed(entries) if name == module) / 1e6)
+    return min(times)
+
+def cost_by_package(entries: List[Tuple[str, int, int]]) -> Dict[str, float]:
+    """Sum the self import time of every module per top-level package, in seconds."""
+    totals: Dict[str, float] = defaultdict(float)
+    for name, self_us, _ in entries:
+        totals[name.split(".")[0]] += self_us / 1e6
+    return dict(totals)
+
+def first_request_seconds(repeat: int) -> Tuple[float, float]:
+    """Best-of-``repeat`` import time of the app and time until its first response."""
+    runs = []
+    for _ in range(repeat):
+        result = subprocess.run(
+            [sys.executable, "-c", FIRST_REQUEST], capture_output=True, text=True, check=True
+        )
+        imported, responded = result.stdout.split()[-2:]
+        runs.append((float(imported), float(responded)))
+    return min(runs, key=lambda run: run[1])
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--target", type=float, default=2.0, help="time-to-first-request target in seconds")
+    parser.add_argument("--top", type=int, default=10, help="number of packages listed")
+    args = parser.parse_args()
+
+    print(f"{'module':<32} {'import (s)':>11}")
+    for module in MODULES:
+        print(f"{module:<32} {cumulative_seconds(module, args.repeat):>11.3f}")
+
+    print(f"\n{'package (imported by main)':<32} {'self (s)':>11}")
+    packages = cost_by_package(import_profile("main"))
+    for package, seconds in sorted(packages.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"{package:<32} {seconds:>11.3f}")
+
+    imported, responded = first_request_seconds(args.repeat)
+    status = "met" if responded <= args.target else "MISSED"
+    print(f"\nimport main: {imported:.3f}s, first request: {responded:.3f}s (target {args.target:.1f}s {status})")
+    if responded > args.target:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Benchmark peak memory of in-memory and out-of-core (streaming) training as datasets grow.
+
+Each run trains in a fresh interpreter and reports its peak resident set
+size: in memory, the whole CSV is loaded and fed to ``train_model``;
+streaming, it is read in chunks and fed to ``partial_fit``.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_streaming_train [--rows 250000 1000000] [--chunk-rows 50000]
+"""
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.bench_preprocess import make_frame
+
+# Trains one model on a CSV file, printing the wall time and peak RSS in MiB
+RUN = """
+import resource, sys, tempfile, time
+import pandas as pd
+from data_processing.data_processor import data_processor
+from ml.model_trainer import model_trainer
+from ml.preprocessing_cache import preprocessing_cache
+from ml.streaming_trainer import streaming_trainer
+
+mode, path, chunk_rows = sys.argv[1], sys.argv[2], int(sys.argv[3])
+features = [col for col in pd.read_csv(path, nrows=1).columns if col != "target"]
+model_trainer.models_dir = streaming_trainer.models_dir = tempfile.mkdtemp(prefix="bench-models-")
+preprocessing_cache.cache_dir = tempfile.mkdtemp(prefix="bench-preprocessing-")
+started = time.perf_counter()
+if mode == "memory":
+    result = model_trainer.train_model(pd.read_csv(path), "target", features, "logistic_regression", "classification")
+else:
+    result = streaming_trainer.train_model(
+        lambda: data_processor.iter_chunks(path, chunk_rows), "target", features, "sgd", "classification"
+    )
+print(time.perf_counter() - started, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, result["metrics"]["accuracy"])
+"""
+
+def write_csv(path: str, rows: int, block_rows: int = 100_000) -> None:
+    """Write a CSV with a learnable target block by block, never holding it whole."""
+    for block, start in enumerate(range(0, rows, block_rows)):
+        df = make_frame(min(block_rows, rows - start), 20, 5, seed=block)
+        df["target"] = (df["num_0"].fillna(0) + 0.5 * df["num_1"].fillna(0) > 0).astype(int)
+        df.to_csv(path, mode="a", header=block == 0, index=False)
+
+def check_held_out_classes() -> None:
+    """Assert that classes found only in held-out rows are scored as misses rather than failing."""
+    from ml.streaming_trainer import holdout_mask, streaming_trainer
+
+    streaming_trainer.models_dir = tempfile.mkdtemp(prefix="bench-models-")
+    try:
+        df = make_frame(2000, 5, 2, seed=3)
+        features = list(df.columns)
+        held_out = np.flatnonzero(holdout_mask(0, len(df), 0.2, 42))[:3]
+        for labels, rare in [(np.array(["no", "yes"]), "rare"), (np.array([0, 1]), 5)]:
+            target = pd.Series(labels[(df["num_0"].fillna(0) > 0).astype(int)], dtype=object)
+            target.iloc[held_out] = rare
+            data = df.assign(target=target)
+            result = streaming_trainer.train_model(
+                lambda: (data.iloc[start:start + 500] for start in range(0, len(data), 500)),
+                "target", features, "sgd", "classification"
+            )
+            assert np.isfinite(list(result["metrics"].values())).all(), "held-out class broke the metrics"
+    finally:
+        shutil.rmtree(streaming_trainer.models_dir, ignore_errors=True)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[250_000, 1_000_000])
+    parser.add_argument("--chunk-rows", type=int, default=50_000)
+    args = parser.parse_args()
+
+    check_held_out_classes()
+
+    work_dir = tempfile.mkdtemp(prefix="bench-streaming-")
+    backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    try:
+        print(f"{'rows':>9} {'mode':<10} {'time (s)':>9} {'peak RSS (MiB)':>15} {'accuracy':>9}")
+        for rows in args.rows:
+            path = os.path.join(work_dir, f"data_{rows}.csv")
+            write_csv(path, rows)
+            for mode in ("memory", "streaming"):
+                output = subprocess.run(
+                    [sys.executable, "-c", RUN, mode, path, str(args.chunk_rows)],
+                    capture_output=True, text=True, check=True, cwd=backend_dir
+                ).stdout.split()
+                seconds, peak, accuracy = (float(value) for value in output[-3:])
+                print(f"{rows:>9} {mode:<10} {seconds:>9.1f} {peak:>15.0f} {accuracy:>9.4f}")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
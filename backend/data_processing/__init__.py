@@ -1,3 +1,6 @@
 from .data_processor import data_processor
+from .dataset_loader import dataset_loader
+from .correlation import correlation_engine
+from .transform_graph import TransformGraph
 
-__all__ = ["data_processor"]
+__all__ = ["data_processor", "dataset_loader", "correlation_engine", "TransformGraph"]
@@ -0,0 +1,276 @@
+import os
+import logging
+from typing import Dict, List, Any, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Number of columns correlated against the rest per matrix product
+CORRELATION_BLOCK_SIZE = int(os.environ.get("CORRELATION_BLOCK_SIZE", 512))
+# Full matrices are only returned up to this many columns
+CORRELATION_MATRIX_MAX_COLUMNS = int(os.environ.get("CORRELATION_MATRIX_MAX_COLUMNS", 50))
+# Default number of pairs returned when the full matrix is not
+CORRELATION_TOP_K = int(os.environ.get("CORRELATION_TOP_K", 100))
+
+class CorrelationEngine:
+    """Correlation matrices computed blockwise with matrix products.
+
+    Columns are standardized once; the correlations of a block of columns
+    against all following columns are then a few BLAS matrix products, so
+    only the upper triangle is computed and memory stays bounded by the
+    block size. With missing values the correlations are pairwise complete,
+    like ``DataFrame.corr``: counts, sums and sums of squares over the rows
+    where both columns are present come from products with the presence
+    mask. Spearman correlations are Pearson correlations of ranks computed
+    in one ``DataFrame.rank`` pass.
+    """
+
+    def __init__(
+        self,
+        block_size: int = CORRELATION_BLOCK_SIZE,
+        max_matrix_columns: int = CORRELATION_MATRIX_MAX_COLUMNS,
+        top_k: int = CORRELATION_TOP_K
+    ):
+        """Initialize the CorrelationEngine.
+
+        Args:
+            block_size: Number of columns per block.
+            max_matrix_columns: Widest matrix returned in full.
+            top_k: Default number of pairs returned for wider data.
+        """
+        self.block_size = block_size
+        self.max_matrix_columns = max_matrix_columns
+        self.top_k = top_k
+
+    def correlation_matrix(self, df: pd.DataFrame, method: str = "pearson") -> np.ndarray:
+        """Compute the correlation matrix of numeric columns.
+
+        With missing values, Spearman ranks are computed per column over its
+        present values rather than per pair of columns as pandas does, a
+        close approximation when few values are missing.
+
+        Args:
+            df: DataFrame of numeric columns.
+            method: 'pearson' or 'spearman'.
+
+        Returns:
+            Square array of correlations (NaN where undefined).
+        """
+        try:
+            if method == "spearman":
+                values = df.rank().to_numpy(dtype=float, na_value=np.nan)
+            elif method == "pearson":
+                values = df.to_numpy(dtype=float, na_value=np.nan)
+            else:
+                raise ValueError(f"Unsupported correlation method: {method}")
+
+            present = ~np.isnan(values)
+            if present.all():
+                return self._complete_pearson(values)
+            return self._pairwise_pearson(values, present)
+        except Exception as e:
+            logger.error(f"Error computing correlation matrix: {str(e)}")
+            raise
+
+    def _complete_pearson(self, values: np.ndarray) -> np.ndarray:
+        """Pearson correlations of an array without missing values."""
+        n, p = values.shape
+        corr = np.full((p, p), np.nan)
+        if n < 2:
+            return corr
+
+        std = values.std(axis=0)
+        constant = std == 0
+        z = (values - values.mean(axis=0)) / np.where(constant, 1.0, std)
+
+        for start in range(0, p, self.block_size):
+            stop = min(start + self.block_size, p)
+            block = z[:, start:stop].T @ z[:, start:] / n
+            corr[start:stop, start:] = block
+            corr[start:, start:stop] = block.T
+
+        corr[constant, :] = np.nan
+        corr[:, constant] = np.nan
+        np.fill_diagonal(corr, np.where(constant, np.nan, 1.0))
+        return np.clip(corr, -1.0, 1.0)
+
+    def _pairwise_pearson(self, values: np.ndarray, present: np.ndarray) -> np.ndarray:
+        """Pairwise-complete Pearson correlations of an array with NaNs."""
+        p = values.shape[1]
+        corr = np.full((p, p), np.nan)
+
+        # Scaling does not change correlations but keeps the sums well conditioned
+        with np.errstate(invalid="ignore"):
+            mean = np.nan_to_num(np.nanmean(values, axis=0))
+            std = np.nanstd(values, axis=0)
+        std = np.where(np.isfinite(std) & (std > 0), std, 1.0)
+
+        mask = present.astype(float)
+        z = np.where(present, (values - mean) / std, 0.0)
+        zz = z * z
+
+        for start in range(0, p, self.block_size):
+            stop = min(start + self.block_size, p)
+            z_block, mask_block, zz_block = z[:, start:stop], mask[:, start:stop], zz[:, start:stop]
+            z_rest, mask_rest, zz_rest = z[:, start:], mask[:, start:], zz[:, start:]
+
+            n = mask_block.T @ mask_rest
+            sum_x = z_block.T @ mask_rest
+            sum_y = mask_block.T @ z_rest
+            with np.errstate(invalid="ignore", divide="ignore"):
+                covariance = z_block.T @ z_rest - sum_x * sum_y / n
+                var_x = zz_block.T @ mask_rest - sum_x ** 2 / n
+                var_y = mask_block.T @ zz_rest - sum_y ** 2 / n
+                block = covariance / np.sqrt(var_x * var_y)
+            block[(n < 2) | (var_x <= 0) | (var_y <= 0)] = np.nan
+
+            corr[start:stop, start:] = block
+            corr[start:, start:stop] = block.T
+
+        return np.clip(corr, -1.0, 1.0)
+
+    def top_pairs(
+        self,
+        matrix: np.ndarray,
+        columns: Sequence[str],
+        threshold: Optional[float] = None,
+        top_k: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Extract the strongest correlated pairs of columns.
+
+        Args:
+            matrix: Square correlation matrix.
+            columns: Column names of the matrix.
+            threshold: Only pairs with an absolute correlation above it.
+            top_k: Maximum number of pairs (all if None).
+
+        Returns:
+            Pairs ordered by decreasing absolute correlation, as dictionaries
+            with 'column1', 'column2' and the signed 'correlation'.
+        """
+        rows, cols = np.triu_indices(len(columns), k=1)
+        values = matrix[rows, cols]
+        strength = np.abs(values)
+
+        keep = np.isfinite(strength)
+        if threshold is not None:
+            keep &= strength > threshold
+        rows, cols, values, strength = rows[keep], cols[keep], values[keep], strength[keep]
+
+        if top_k is not None and len(strength) > top_k:
+            selected = np.argpartition(-strength, top_k - 1)[:top_k]
+        else:
+            selected = np.arange(len(strength))
+        selected = selected[np.argsort(-strength[selected], kind="stable")]
+
+        return [
+            {"column1": columns[i], "column2": columns[j], "correlation": round(float(value), 3)}
+            for i, j, value in zip(rows[selected], cols[selected], values[selected])
+        ]
+
+    def count_pairs(self, matrix: np.ndarray, threshold: float) -> int:
+        """Count the pairs of columns with an absolute correlation above a threshold."""
+        rows, cols = np.triu_indices(matrix.shape[0], k=1)
+        with np.errstate(invalid="ignore"):
+            return int((np.abs(matrix[rows, cols]) > threshold).sum())
+
+    def compact_matrix(self, matrix: np.ndarray, columns: Sequence[str], decimals: int = 3) -> Dict[str, Any]:
+        """Get a matrix as column names plus rows of rounded values.
+
+        Args:
+            matrix: Square correlation matrix.
+            columns: Column names of the matrix.
+            decimals: Number of decimals kept.
+
+        Returns:
+            Dictionary with 'columns' and 'matrix' (NaN as None).
+        """
+        rounded = np.round(matrix, decimals).astype(object)
+        rounded[np.isnan(matrix)] = None
+        return {"columns": list(columns), "matrix": rounded.tolist()}
+
+    def nested(self, matrix: np.ndarray, columns: Sequence[str], decimals: int = 3) -> Dict[str, Dict[str, float]]:
+        """Get a matrix as ``{column1: {column2: value}}`` without the diagonal.
+
+        Wider matrices than ``max_matrix_columns`` are reduced to their
+        ``top_k`` strongest pairs, listed under both columns.
+
+        Args:
+            matrix: Square correlation matrix.
+            columns: Column names of the matrix.
+            decimals: Number of decimals kept.
+
+        Returns:
+            Nested dictionary of correlations.
+        """
+        rounded = np.round(matrix, decimals)
+        if len(columns) <= self.max_matrix_columns:
+            return {
+                col1: {col2: float(rounded[i, j]) for j, col2 in enumerate(columns) if j != i}
+                for i, col1 in enumerate(columns)
+            }
+
+        result: Dict[str, Dict[str, float]] = {}
+        for pair in self.top_pairs(rounded, columns, top_k=self.top_k):
+            result.setdefault(pair["column1"], {})[pair["column2"]] = pair["correlation"]
+            result.setdefault(pair["column2"], {})[pair["column1"]] = pair["correlation"]
+        return result
+
+    def analyze(
+        self,
+        df: pd.DataFrame,
+        methods: Sequence[str] = ("pearson", "spearman"),
+        threshold: float = 0.7,
+        top_k: Optional[int] = None,
+        include_matrix: Optional[bool] = None
+    ) -> Dict[str, Any]:
+        """Correlate numeric columns and summarize the strongest pairs.
+
+        Args:
+            df: DataFrame of numeric columns.
+            methods: Correlation methods to compute.
+            threshold: Absolute Pearson correlation above which a pair is
+                reported as highly correlated.
+            top_k: Maximum number of highly correlated pairs returned
+                (engine default if None).
+            include_matrix: Whether to return the full matrices; by default
+                only up to ``max_matrix_columns`` columns.
+
+        Returns:
+            Dictionary with the compact matrix of every method (or None),
+            the highly correlated Pearson pairs and their total count, and
+            the ``top_pairs`` strongest Pearson pairs regardless of threshold.
+        """
+        try:
+            columns = list(df.columns)
+            if include_matrix is None:
+                include_matrix = len(columns) <= self.max_matrix_columns
+
+            analysis = {
+                "columns": columns,
+                "matrix_included": bool(include_matrix),
+                "highly_correlated_pairs": [],
+                "highly_correlated_pair_count": 0,
+                "top_pairs": []
+            }
+            for method in methods:
+                matrix = self.correlation_matrix(df, method)
+                analysis[method] = self.compact_matrix(matrix, columns) if include_matrix else None
+                if method == "pearson":
+                    analysis["highly_correlated_pairs"] = self.top_pairs(
+                        matrix, columns, threshold=threshold, top_k=top_k or self.top_k
+                    )
+                    analysis["highly_correlated_pair_count"] = self.count_pairs(matrix, threshold)
+                    analysis["top_pairs"] = self.top_pairs(matrix, columns, top_k=top_k or self.top_k)
+
+            return analysis
+        except Exception as e:
+            logger.error(f"Error analyzing correlations: {str(e)}")
+            raise
+
+# Create a singleton instance
+correlation_engine = CorrelationEngine()
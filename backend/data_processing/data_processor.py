@@ -2,16 +2,128 @@ import pandas as pd
 import numpy as np
 import os
 import json
+import math
 import logging
-from typing import Dict, List, Any, Optional, Tuple, Union
-from sklearn.preprocessing import StandardScaler, MinMaxScaler, OneHotEncoder, LabelEncoder
-from sklearn.impute import SimpleImputer
-from sklearn.feature_selection import SelectKBest, f_classif, f_regression
+from typing import Dict, List, Any, Iterator, Optional, Tuple, Union
+
+from .correlation import correlation_engine
+from .transform_graph import TransformGraph
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Number of rows per Parquet row group in the columnar copy of a dataset
+COLUMNAR_ROW_GROUP_SIZE = int(os.environ.get("COLUMNAR_ROW_GROUP_SIZE", 100_000))
+
+# Number of CSV rows parsed at a time when ingesting an upload
+INGEST_CHUNK_ROWS = int(os.environ.get("INGEST_CHUNK_ROWS", 50_000))
+
+def _merge_dtypes(left: np.dtype, right: np.dtype) -> np.dtype:
+    """Combine the dtypes inferred for the same column in two chunks.
+    
+    Mirrors what pandas infers when parsing the whole file at once: integer
+    and float chunks widen to float, anything else mixed becomes object.
+    """
+    if left == right:
+        return left
+    if (pd.api.types.is_numeric_dtype(left) and pd.api.types.is_numeric_dtype(right)
+            and not pd.api.types.is_bool_dtype(left) and not pd.api.types.is_bool_dtype(right)):
+        return np.result_type(left, right)
+    return np.dtype(object)
+
+def _zero_out_fperr(values: np.ndarray) -> np.ndarray:
+    """Treat sums that are zero up to rounding error as zero, as pandas does."""
+    return np.where(np.abs(values) < 1e-14, 0.0, values)
+
+def summarize_numeric_block(
+    df: Union[pd.DataFrame, np.ndarray],
+    quantiles: Optional[List[float]] = None,
+    moments: bool = False
+) -> Dict[str, Any]:
+    """Compute per-column summary statistics of a numeric block in a few array passes.
+    
+    The block is copied into one float array and sorted once along the rows,
+    which gives min, max and every requested quantile for all columns without
+    per-column pandas calls. Missing values are ignored, as in pandas.
+    
+    Args:
+        df: DataFrame whose columns are all numeric (or boolean), or a 2D
+            float array with NaN for missing values.
+        quantiles: Quantiles to compute, with linear interpolation.
+        moments: Also compute skewness and excess kurtosis, with the same
+            bias corrections as ``Series.skew`` and ``Series.kurtosis``.
+        
+    Returns:
+        Dictionary of arrays indexed like ``df.columns``: ``count``, ``mean``,
+        ``std`` (ddof=1), ``min``, ``max`` and ``quantiles`` (one array per
+        requested quantile), plus ``skewness`` and ``kurtosis`` if requested.
+        Statistics of empty columns are NaN.
+    """
+    if isinstance(df, pd.DataFrame):
+        values = df.to_numpy(dtype=float, na_value=np.nan)
+    else:
+        values = np.asarray(df, dtype=float)
+    n_columns = values.shape[1]
+    missing = np.isnan(values)
+    count = len(values) - missing.sum(axis=0)
+    
+    with np.errstate(invalid="ignore", divide="ignore"):
+        filled = np.where(missing, 0.0, values)
+        mean = filled.sum(axis=0) / count
+        deviations = np.where(missing, 0.0, values - mean)
+        squared = deviations ** 2
+        m2 = squared.sum(axis=0)
+        std = np.sqrt(m2 / (count - 1))
+    std[count < 2] = np.nan
+    
+    extra = {}
+    if moments:
+        # Float counts avoid integer overflow in the correction factors
+        n = count.astype(float)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            m3 = _zero_out_fperr((squared * deviations).sum(axis=0))
+            m4 = (squared * squared).sum(axis=0)
+            m2_clean = _zero_out_fperr(m2)
+            
+            skewness = (n * (n - 1) ** 0.5 / (n - 2)) * (m3 / m2_clean ** 1.5)
+            skewness = np.where(m2_clean == 0, 0.0, skewness)
+            skewness[count < 3] = np.nan
+            
+            numerator = _zero_out_fperr(n * (n + 1) * (n - 1) * m4)
+            denominator = _zero_out_fperr((n - 2) * (n - 3) * m2_clean ** 2)
+            adjustment = 3 * (n - 1) ** 2 / ((n - 2) * (n - 3))
+            kurtosis = np.where(denominator == 0, 0.0, numerator / denominator - adjustment)
+            kurtosis[count < 4] = np.nan
+        extra = {"skewness": skewness, "kurtosis": kurtosis}
+    
+    # NaNs sort last, so the valid values of each column come first
+    sorted_values = np.sort(values, axis=0)
+    columns = np.arange(n_columns)
+    has_values = count > 0
+    last = np.maximum(count - 1, 0)
+    
+    def take(positions: np.ndarray) -> np.ndarray:
+        return np.where(has_values, sorted_values[positions, columns], np.nan) if len(values) else np.full(n_columns, np.nan)
+    
+    quantile_values = []
+    for q in quantiles or []:
+        position = q * last
+        lower = np.floor(position).astype(int)
+        upper = np.minimum(lower + 1, last)
+        fraction = position - lower
+        quantile_values.append(take(lower) + (take(upper) - take(lower)) * fraction)
+    
+    return {
+        "count": count,
+        "mean": mean,
+        "std": std,
+        "min": take(np.zeros(n_columns, dtype=int)),
+        "max": take(last),
+        "quantiles": quantile_values,
+        **extra
+    }
+
 class DataProcessor:
     """Data processing class for handling various data operations."""
     
@@ -19,11 +131,18 @@ class DataProcessor:
         """Initialize the DataProcessor."""
         pass
     
-    def load_dataset(self, file_path: str) -> pd.DataFrame:
+    def load_dataset(
+        self,
+        file_path: str,
+        columns: Optional[List[str]] = None,
+        row_range: Optional[Tuple[int, int]] = None
+    ) -> pd.DataFrame:
         """Load a dataset from a file.
         
         Args:
             file_path: Path to the dataset file.
+            columns: Columns to load (all columns if None).
+            row_range: Half-open ``(start, stop)`` range of rows to load (all rows if None).
             
         Returns:
             Loaded DataFrame.
@@ -31,20 +150,291 @@ class DataProcessor:
         try:
             file_extension = os.path.splitext(file_path)[1].lower()
             
+            if file_extension == '.parquet':
+                return self._load_parquet(file_path, columns, row_range)
+            
+            # Text and spreadsheet formats can only skip rows while parsing
+            read_kwargs = {}
+            if columns is not None:
+                read_kwargs["usecols"] = columns
+            if row_range is not None:
+                start, stop = row_range
+                read_kwargs["skiprows"] = range(1, start + 1)
+                read_kwargs["nrows"] = max(stop - start, 0)
+            
             if file_extension == '.csv':
-                return pd.read_csv(file_path)
+                df = pd.read_csv(file_path, **read_kwargs)
             elif file_extension in ['.xls', '.xlsx']:
-                return pd.read_excel(file_path)
+                df = pd.read_excel(file_path, **read_kwargs)
             elif file_extension == '.json':
-                return pd.read_json(file_path)
-            elif file_extension == '.parquet':
-                return pd.read_parquet(file_path)
+                df = pd.read_json(file_path)
+                if row_range is not None:
+                    df = df.iloc[row_range[0]:row_range[1]]
             else:
                 raise ValueError(f"Unsupported file format: {file_extension}")
+            
+            # usecols keeps file order, so restore the requested order
+            return df[columns] if columns is not None else df
         except Exception as e:
             logger.error(f"Error loading dataset: {str(e)}")
             raise
     
+    def _load_parquet(
+        self,
+        file_path: str,
+        columns: Optional[List[str]] = None,
+        row_range: Optional[Tuple[int, int]] = None
+    ) -> pd.DataFrame:
+        """Load a Parquet file, reading only the needed columns and row groups.
+        
+        Args:
+            file_path: Path to the Parquet file.
+            columns: Columns to load (all columns if None).
+            row_range: Half-open ``(start, stop)`` range of rows to load (all rows if None).
+            
+        Returns:
+            Loaded DataFrame.
+        """
+        import pyarrow.parquet as pq
+        
+        parquet_file = pq.ParquetFile(file_path)
+        if row_range is None:
+            return parquet_file.read(columns=columns).to_pandas()
+        
+        # Only read the row groups overlapping the requested range
+        start, stop = row_range
+        row_groups = []
+        first_row = None
+        offset = 0
+        for i in range(parquet_file.num_row_groups):
+            num_rows = parquet_file.metadata.row_group(i).num_rows
+            if offset < stop and offset + num_rows > start:
+                row_groups.append(i)
+                if first_row is None:
+                    first_row = offset
+            offset += num_rows
+        
+        if not row_groups:
+            return parquet_file.schema_arrow.empty_table().select(
+                columns if columns is not None else parquet_file.schema_arrow.names
+            ).to_pandas()
+        
+        table = parquet_file.read_row_groups(row_groups, columns=columns)
+        table = table.slice(start - first_row, stop - start)
+        return table.to_pandas()
+    
+    def iter_chunks(
+        self,
+        file_path: str,
+        chunk_rows: int = None,
+        columns: Optional[List[str]] = None,
+        row_range: Optional[Tuple[int, int]] = None
+    ) -> Iterator[pd.DataFrame]:
+        """Iterate over a dataset in chunks of rows without loading it whole.
+        
+        Args:
+            file_path: Path to the dataset file.
+            chunk_rows: Rows per chunk (``INGEST_CHUNK_ROWS`` if None).
+            columns: Columns to load (all columns if None).
+            row_range: Half-open ``(start, stop)`` range of rows (Parquet only).
+            
+        Yields:
+            DataFrames of at most ``chunk_rows`` rows.
+        """
+        chunk_rows = chunk_rows or INGEST_CHUNK_ROWS
+        file_extension = os.path.splitext(file_path)[1].lower()
+        
+        if file_extension == '.parquet':
+            if row_range is not None:
+                # Row groups are already bounded; slice the range into chunks
+                start, stop = row_range
+                for chunk_start in range(start, stop, chunk_rows):
+                    yield self._load_parquet(file_path, columns, (chunk_start, min(chunk_start + chunk_rows, stop)))
+                return
+            import pyarrow.parquet as pq
+            for batch in pq.ParquetFile(file_path).iter_batches(batch_size=chunk_rows, columns=columns):
+                yield batch.to_pandas()
+        elif file_extension == '.csv' and row_range is None:
+            for chunk in pd.read_csv(file_path, chunksize=chunk_rows, usecols=columns):
+                yield chunk[columns] if columns is not None else chunk
+        else:
+            # Formats without incremental readers are loaded whole
+            df = self.load_dataset(file_path, columns=columns, row_range=row_range)
+            for chunk_start in range(0, len(df), chunk_rows):
+                yield df.iloc[chunk_start:chunk_start + chunk_rows]
+    
+    def get_row_partitions(self, file_path: str, partitions: int) -> List[Tuple[int, int]]:
+        """Split a Parquet dataset into row ranges aligned to row groups.
+        
+        Args:
+            file_path: Path to the Parquet file.
+            partitions: Maximum number of ranges.
+            
+        Returns:
+            List of half-open ``(start, stop)`` row ranges covering the file.
+        """
+        import pyarrow.parquet as pq
+        
+        metadata = pq.ParquetFile(file_path).metadata
+        group_rows = [metadata.row_group(i).num_rows for i in range(metadata.num_row_groups)]
+        per_partition = max(1, math.ceil(len(group_rows) / max(partitions, 1)))
+        
+        ranges = []
+        offset = 0
+        for i in range(0, len(group_rows), per_partition):
+            rows = sum(group_rows[i:i + per_partition])
+            ranges.append((offset, offset + rows))
+            offset += rows
+        return ranges
+    
+    def write_columnar(self, df: pd.DataFrame, file_path: str) -> Optional[str]:
+        """Write a columnar (Parquet) copy of a dataset next to its original file.
+        
+        Args:
+            df: DataFrame loaded from the original file.
+            file_path: Path to the original dataset file.
+            
+        Returns:
+            Path to the Parquet file, or None if the conversion failed.
+        """
+        columnar_path = os.path.splitext(file_path)[0] + ".parquet"
+        if columnar_path == file_path:
+            return file_path
+        
+        try:
+            df.to_parquet(columnar_path, index=False, row_group_size=COLUMNAR_ROW_GROUP_SIZE)
+            return columnar_path
+        except Exception as e:
+            # Mixed-type object columns cannot always be stored; keep the original only
+            logger.warning(f"Could not convert {file_path} to Parquet: {str(e)}")
+            if os.path.exists(columnar_path):
+                os.remove(columnar_path)
+            return None
+    
+    def ingest_dataset(self, file_path: str) -> Dict[str, Any]:
+        """Infer dataset metadata and write its columnar copy.
+        
+        CSV files are read in chunks of ``INGEST_CHUNK_ROWS`` rows, so memory
+        use does not grow with the file size: row count and dtypes are merged
+        chunk by chunk, and each chunk is appended to the Parquet copy on the
+        same pass. Spreadsheets cannot be read incrementally and are loaded
+        whole.
+        
+        Args:
+            file_path: Path to the uploaded dataset file.
+            
+        Returns:
+            Dictionary with ``row_count``, ``column_count``, ``columns``
+            (column name to dtype) and ``columnar_path``.
+        """
+        try:
+            file_extension = os.path.splitext(file_path)[1].lower()
+            
+            if file_extension != '.csv':
+                df = self.load_dataset(file_path)
+                return {
+                    "row_count": len(df),
+                    "column_count": len(df.columns),
+                    "columns": {col: str(df[col].dtype) for col in df.columns},
+                    "columnar_path": self.write_columnar(df, file_path),
+                }
+            
+            columnar_path = os.path.splitext(file_path)[0] + ".parquet"
+            row_count, dtypes, converted = self._scan_csv(file_path, columnar_path)
+            
+            if not converted:
+                # A later chunk did not fit the schema inferred from the first
+                # one; rewrite the copy with the dtypes merged over all chunks
+                converted = self._write_csv_columnar(file_path, columnar_path, dtypes)
+            
+            return {
+                "row_count": row_count,
+                "column_count": len(dtypes),
+                "columns": {col: str(dtype) for col, dtype in dtypes.items()},
+                "columnar_path": columnar_path if converted else None,
+            }
+        except Exception as e:
+            logger.error(f"Error ingesting dataset: {str(e)}")
+            raise
+    
+    def _scan_csv(self, file_path: str, columnar_path: str) -> Tuple[int, Dict[str, np.dtype], bool]:
+        """Single chunked pass over a CSV file collecting metadata and writing Parquet.
+        
+        Args:
+            file_path: Path to the CSV file.
+            columnar_path: Path of the Parquet copy to write.
+            
+        Returns:
+            Tuple of (row count, merged dtypes, whether the Parquet copy was written).
+        """
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        
+        row_count = 0
+        dtypes: Dict[str, np.dtype] = {}
+        writer = None
+        converted = True
+        
+        try:
+            for chunk in pd.read_csv(file_path, chunksize=INGEST_CHUNK_ROWS):
+                row_count += len(chunk)
+                for col, dtype in chunk.dtypes.items():
+                    dtypes[col] = _merge_dtypes(dtypes[col], dtype) if col in dtypes else dtype
+                
+                if not converted:
+                    continue
+                try:
+                    table = pa.Table.from_pandas(chunk, preserve_index=False)
+                    if writer is None:
+                        writer = pq.ParquetWriter(columnar_path, table.schema)
+                    else:
+                        table = table.cast(writer.schema)
+                    writer.write_table(table, row_group_size=COLUMNAR_ROW_GROUP_SIZE)
+                except (pa.ArrowInvalid, pa.ArrowNotImplementedError, pa.ArrowTypeError):
+                    converted = False
+        finally:
+            if writer is not None:
+                writer.close()
+        
+        if not dtypes:
+            # Header-only file: read the column names without any rows
+            header = pd.read_csv(file_path, nrows=0)
+            dtypes = dict(header.dtypes.items())
+            header.to_parquet(columnar_path, index=False)
+        
+        return row_count, dtypes, converted
+    
+    def _write_csv_columnar(self, file_path: str, columnar_path: str, dtypes: Dict[str, np.dtype]) -> bool:
+        """Write the Parquet copy of a CSV file with a fixed schema, chunk by chunk.
+        
+        Args:
+            file_path: Path to the CSV file.
+            columnar_path: Path of the Parquet copy to write.
+            dtypes: Dtypes merged over the whole file.
+            
+        Returns:
+            Whether the Parquet copy was written.
+        """
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        
+        schema = pa.schema([
+            (col, pa.string() if dtype == object else pa.from_numpy_dtype(dtype))
+            for col, dtype in dtypes.items()
+        ])
+        
+        try:
+            with pq.ParquetWriter(columnar_path, schema) as writer:
+                for chunk in pd.read_csv(file_path, chunksize=INGEST_CHUNK_ROWS, dtype=dtypes):
+                    table = pa.Table.from_pandas(chunk, schema=schema, preserve_index=False)
+                    writer.write_table(table, row_group_size=COLUMNAR_ROW_GROUP_SIZE)
+            return True
+        except Exception as e:
+            logger.warning(f"Could not convert {file_path} to Parquet: {str(e)}")
+            if os.path.exists(columnar_path):
+                os.remove(columnar_path)
+            return False
+    
     def get_dataset_profile(self, df: pd.DataFrame) -> Dict[str, Any]:
         """Generate a profile of the dataset.
         
@@ -66,53 +456,53 @@ class DataProcessor:
                 "correlations": {}
             }
             
-            # Column types
-            for col in df.columns:
-                if pd.api.types.is_numeric_dtype(df[col]):
+            # Column types (dtype checks only, no data is scanned)
+            for col, dtype in df.dtypes.items():
+                if pd.api.types.is_numeric_dtype(dtype):
                     profile["columns"][col] = "numeric"
-                elif pd.api.types.is_datetime64_dtype(df[col]):
+                elif pd.api.types.is_datetime64_dtype(dtype):
                     profile["columns"][col] = "datetime"
                 else:
                     profile["columns"][col] = "categorical"
             
-            # Missing values
-            for col in df.columns:
-                missing_count = df[col].isna().sum()
-                if missing_count > 0:
-                    profile["missing_values"][col] = {
-                        "count": int(missing_count),
-                        "percentage": float(missing_count / len(df) * 100)
-                    }
+            # Missing values, counted for every column in one pass
+            missing_counts = df.isna().sum()
+            for col, missing_count in missing_counts[missing_counts > 0].items():
+                profile["missing_values"][col] = {
+                    "count": int(missing_count),
+                    "percentage": float(missing_count / len(df) * 100)
+                }
             
-            # Numeric stats
-            for col in df.columns:
-                if profile["columns"][col] == "numeric":
+            # Numeric stats, computed for the whole numeric block at once
+            numeric_cols = [col for col in df.columns if profile["columns"][col] == "numeric"]
+            if numeric_cols:
+                summary = summarize_numeric_block(df[numeric_cols], quantiles=[0.5])
+                stat_columns = {
+                    "min": summary["min"],
+                    "max": summary["max"],
+                    "mean": summary["mean"],
+                    "median": summary["quantiles"][0],
+                    "std": summary["std"]
+                }
+                for i, col in enumerate(numeric_cols):
                     profile["numeric_stats"][col] = {
-                        "min": float(df[col].min()) if not pd.isna(df[col].min()) else None,
-                        "max": float(df[col].max()) if not pd.isna(df[col].max()) else None,
-                        "mean": float(df[col].mean()) if not pd.isna(df[col].mean()) else None,
-                        "median": float(df[col].median()) if not pd.isna(df[col].median()) else None,
-                        "std": float(df[col].std()) if not pd.isna(df[col].std()) else None
+                        name: None if np.isnan(values[i]) else float(values[i])
+                        for name, values in stat_columns.items()
                     }
             
-            # Categorical stats
+            # Categorical stats (value_counts also gives the unique count)
             for col in df.columns:
                 if profile["columns"][col] == "categorical":
-                    value_counts = df[col].value_counts().head(10).to_dict()
+                    value_counts = df[col].value_counts()
                     profile["categorical_stats"][col] = {
-                        "unique_count": int(df[col].nunique()),
-                        "top_values": {str(k): int(v) for k, v in value_counts.items()}
+                        "unique_count": int(len(value_counts)),
+                        "top_values": {str(k): int(v) for k, v in value_counts.head(10).items()}
                     }
             
-            # Correlations (only for numeric columns)
-            numeric_cols = [col for col in df.columns if profile["columns"][col] == "numeric"]
+            # Correlations (only for numeric columns; strongest pairs only for wide data)
             if len(numeric_cols) > 1:
-                corr_matrix = df[numeric_cols].corr().round(3)
-                for col1 in numeric_cols:
-                    profile["correlations"][col1] = {}
-                    for col2 in numeric_cols:
-                        if col1 != col2:
-                            profile["correlations"][col1][col2] = float(corr_matrix.loc[col1, col2])
+                corr_matrix = correlation_engine.correlation_matrix(df[numeric_cols])
+                profile["correlations"] = correlation_engine.nested(corr_matrix, numeric_cols)
             
             return profile
         except Exception as e:
@@ -127,41 +517,49 @@ class DataProcessor:
         numeric_columns: Optional[List[str]] = None,
         impute_strategy: str = 'mean',
         scaling_method: Optional[str] = None,
-        encoding_method: str = 'onehot'
+        encoding_method: str = 'auto',
+        sparse_output: Union[bool, str] = 'auto'
     ) -> Tuple[pd.DataFrame, Dict[str, Any]]:
         """Preprocess the data for machine learning.
         
+        Imputation, scaling and encoding run as one fitted ``TransformGraph``:
+        the numeric block is imputed and scaled with whole-array operations
+        and the encoded blocks are assembled once, so the cost stays linear
+        in the number of columns.
+        
+        One-hot outputs of high-cardinality columns can be built sparse: the
+        features are then columns of ``pd.SparseDtype`` backed by one CSR
+        matrix, which ``ModelTrainer.train_model`` passes to the estimator
+        without densifying. The estimated size of the output is logged before
+        it is built and returned under ``output`` in the metadata.
+        
         Args:
             df: Input DataFrame.
             target_column: Name of the target column (if any).
             categorical_columns: List of categorical columns to encode.
             numeric_columns: List of numeric columns to scale.
-            impute_strategy: Strategy for imputing missing values ('mean', 'median', 'most_frequent').
+            impute_strategy: Strategy for imputing missing values ('mean', 'median', 'most_frequent', 'constant').
             scaling_method: Method for scaling numeric features ('standard', 'minmax', None).
-            encoding_method: Method for encoding categorical features ('onehot', 'label').
+            encoding_method: Method for encoding categorical features: 'auto'
+                (one-hot for low-cardinality columns, rare-level bucketing,
+                cross-fitted target, frequency or hashing encoding for the
+                others, picked from each column's profile and recorded in the
+                metadata), or one of 'onehot', 'label', 'rare', 'target',
+                'frequency', 'hashing' for every column.
+            sparse_output: Build sparse feature columns (True), dense ones
+                (False), or sparse ones when the estimated density is low ('auto').
             
         Returns:
             Tuple of (preprocessed DataFrame, preprocessing metadata).
         """
         try:
-            # Make a copy of the DataFrame to avoid modifying the original
-            processed_df = df.copy()
-            
-            # Metadata to store preprocessing information
-            metadata = {
-                "imputers": {},
-                "scalers": {},
-                "encoders": {},
-                "feature_names": []
-            }
-            
             # Separate features and target
             if target_column:
-                y = processed_df[target_column].copy()
-                X = processed_df.drop(columns=[target_column])
+                y = df[target_column]
+                X = df.drop(columns=[target_column])
             else:
                 y = None
-                X = processed_df.copy()
+                X = df
             
             # Automatically detect column types if not provided
             if categorical_columns is None:
@@ -170,80 +568,15 @@ class DataProcessor:
             if numeric_columns is None:
                 numeric_columns = [col for col in X.columns if pd.api.types.is_numeric_dtype(X[col])]
             
-            # Handle missing values in numeric columns
-            for col in numeric_columns:
-                if X[col].isna().any():
-                    imputer = SimpleImputer(strategy=impute_strategy)
-                    X[col] = imputer.fit_transform(X[col].values.reshape(-1, 1)).flatten()
-                    metadata["imputers"][col] = {
-                        "strategy": impute_strategy,
-                        "statistics": float(imputer.statistics_[0])
-                    }
-            
-            # Handle missing values in categorical columns
-            for col in categorical_columns:
-                if X[col].isna().any():
-                    imputer = SimpleImputer(strategy='most_frequent')
-                    X[col] = imputer.fit_transform(X[col].values.reshape(-1, 1)).flatten()
-                    metadata["imputers"][col] = {
-                        "strategy": "most_frequent",
-                        "statistics": str(imputer.statistics_[0])
-                    }
-            
-            # Scale numeric features
-            if scaling_method:
-                for col in numeric_columns:
-                    if scaling_method == 'standard':
-                        scaler = StandardScaler()
-                    elif scaling_method == 'minmax':
-                        scaler = MinMaxScaler()
-                    else:
-                        raise ValueError(f"Unsupported scaling method: {scaling_method}")
-                    
-                    X[col] = scaler.fit_transform(X[col].values.reshape(-1, 1)).flatten()
-                    metadata["scalers"][col] = {
-                        "method": scaling_method,
-                        "params": {
-                            "mean": float(scaler.mean_[0]) if hasattr(scaler, 'mean_') else None,
-                            "scale": float(scaler.scale_[0]) if hasattr(scaler, 'scale_') else None,
-                            "min": float(scaler.data_min_[0]) if hasattr(scaler, 'data_min_') else None,
-                            "max": float(scaler.data_max_[0]) if hasattr(scaler, 'data_max_') else None
-                        }
-                    }
-            
-            # Encode categorical features
-            encoded_columns = []
-            for col in categorical_columns:
-                if encoding_method == 'onehot':
-                    encoder = OneHotEncoder(sparse=False, handle_unknown='ignore')
-                    encoded = encoder.fit_transform(X[col].values.reshape(-1, 1))
-                    encoded_df = pd.DataFrame(
-                        encoded, 
-                        columns=[f"{col}_{cat}" for cat in encoder.categories_[0]],
-                        index=X.index
-                    )
-                    X = X.drop(columns=[col])
-                    X = pd.concat([X, encoded_df], axis=1)
-                    encoded_columns.extend(encoded_df.columns)
-                    
-                    metadata["encoders"][col] = {
-                        "method": "onehot",
-                        "categories": [str(cat) for cat in encoder.categories_[0]]
-                    }
-                elif encoding_method == 'label':
-                    encoder = LabelEncoder()
-                    X[col] = encoder.fit_transform(X[col])
-                    encoded_columns.append(col)
-                    
-                    metadata["encoders"][col] = {
-                        "method": "label",
-                        "classes": [str(cls) for cls in encoder.classes_]
-                    }
-                else:
-                    raise ValueError(f"Unsupported encoding method: {encoding_method}")
-            
-            # Store feature names
-            metadata["feature_names"] = list(X.columns)
+            graph = TransformGraph(
+                categorical_columns=categorical_columns,
+                numeric_columns=numeric_columns,
+                impute_strategy=impute_strategy,
+                scaling_method=scaling_method,
+                encoding_method=encoding_method,
+                sparse_output=sparse_output
+            )
+            X = graph.fit_transform(X, y)
             
             # Recombine with target if provided
             if target_column:
@@ -251,7 +584,7 @@ class DataProcessor:
             else:
                 processed_df = X
             
-            return processed_df, metadata
+            return processed_df, graph.metadata
         except Exception as e:
             logger.error(f"Error preprocessing data: {str(e)}")
             raise
@@ -0,0 +1,221 @@
+import os
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Any, Optional, Tuple
+
+import pandas as pd
+
+from .data_processor import data_processor
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Upper bound on the memory held by cached DataFrames (default 1 GiB)
+DATASET_CACHE_MAX_BYTES = int(os.environ.get("DATASET_CACHE_MAX_BYTES", 1024 ** 3))
+# Budget of the cache of each CPU pool worker (default 128 MiB). Every worker
+# has its own cache, so workers hold up to EXECUTOR_CPU_WORKERS times this.
+DATASET_CACHE_WORKER_MAX_BYTES = int(os.environ.get("DATASET_CACHE_WORKER_MAX_BYTES", 128 * 1024 ** 2))
+
+# Block size used when hashing dataset files
+HASH_BLOCK_SIZE = 1024 * 1024
+
+class DatasetLoader:
+    """Loads datasets by ID and keeps recently used parsed frames in memory.
+
+    Cached frames are shared between callers, so they must be treated as
+    read-only. Anything that needs to modify a frame should copy it first.
+    """
+
+    def __init__(self, max_bytes: int = DATASET_CACHE_MAX_BYTES):
+        """Initialize the DatasetLoader.
+
+        Args:
+            max_bytes: Maximum total memory (as reported by
+                ``memory_usage(deep=True)``) of the cached DataFrames.
+        """
+        self.max_bytes = max_bytes
+        self._cache: "OrderedDict[Tuple, Tuple[pd.DataFrame, int]]" = OrderedDict()
+        self._current_bytes = 0
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._content_hashes: Dict[Tuple, str] = {}
+
+    def source_path(self, dataset_info: Dict[str, Any]) -> str:
+        """Pick the file to read a dataset from, preferring its columnar copy."""
+        columnar_path = dataset_info.get("columnar_path")
+        if columnar_path and os.path.exists(columnar_path):
+            return columnar_path
+        return dataset_info["file_path"]
+
+    def _cache_key(
+        self,
+        dataset_info: Dict[str, Any],
+        source_path: str,
+        columns: Optional[List[str]] = None,
+        row_range: Optional[Tuple[int, int]] = None
+    ) -> Tuple:
+        """Build the cache key for a dataset.
+
+        The file's mtime and size are part of the key so that a dataset whose
+        file is replaced on disk is never served from a stale entry.
+        """
+        stat = os.stat(source_path)
+        return (
+            dataset_info["id"],
+            source_path,
+            stat.st_mtime_ns,
+            stat.st_size,
+            tuple(columns) if columns is not None else None,
+            tuple(row_range) if row_range is not None else None,
+        )
+
+    def load(
+        self,
+        dataset_info: Dict[str, Any],
+        columns: Optional[List[str]] = None,
+        row_range: Optional[Tuple[int, int]] = None
+    ) -> pd.DataFrame:
+        """Load a dataset, serving it from the cache when possible.
+
+        Args:
+            dataset_info: Dataset record as stored in the database.
+            columns: Columns to load (all columns if None).
+            row_range: Half-open ``(start, stop)`` range of rows to load (all rows if None).
+
+        Returns:
+            Parsed DataFrame. The frame is shared and must not be mutated.
+        """
+        source_path = self.source_path(dataset_info)
+        key = self._cache_key(dataset_info, source_path, columns, row_range)
+        full_key = key[:4] + (None, None)
+
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None:
+                self._cache.move_to_end(key)
+                self._hits += 1
+                return entry[0]
+
+            # A cached full frame can serve any projection without touching disk
+            full_entry = self._cache.get(full_key)
+            if full_entry is not None:
+                self._cache.move_to_end(full_key)
+                self._hits += 1
+                df = full_entry[0]
+                if row_range is not None:
+                    df = df.iloc[row_range[0]:row_range[1]]
+                return df[columns] if columns is not None else df
+            self._misses += 1
+
+        # Parse outside the lock so other datasets can be served meanwhile
+        df = data_processor.load_dataset(source_path, columns=columns, row_range=row_range)
+        size = int(df.memory_usage(deep=True).sum())
+
+        with self._lock:
+            if size > self.max_bytes:
+                logger.info(
+                    f"Dataset {dataset_info['id']} ({size} bytes) exceeds the cache budget, not caching"
+                )
+                return df
+
+            # Drop stale entries for the same dataset (older file versions)
+            for stale_key in [k for k in self._cache if k[0] == key[0] and k[1:4] != key[1:4]]:
+                self._current_bytes -= self._cache.pop(stale_key)[1]
+
+            if key not in self._cache:
+                self._cache[key] = (df, size)
+                self._current_bytes += size
+            self._evict()
+
+            return self._cache[key][0] if key in self._cache else df
+
+    def content_hash(self, dataset_info: Dict[str, Any]) -> str:
+        """Get the SHA-256 digest of a dataset's original file.
+
+        Digests are memoized per file version (path, mtime, size), so a file
+        is hashed at most once per process unless it changes.
+
+        Args:
+            dataset_info: Dataset record as stored in the database.
+
+        Returns:
+            Hex digest of the file content.
+        """
+        file_path = dataset_info["file_path"]
+        stat = os.stat(file_path)
+        key = (file_path, stat.st_mtime_ns, stat.st_size)
+
+        with self._lock:
+            digest = self._content_hashes.get(key)
+        if digest is not None:
+            return digest
+
+        hasher = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b""):
+                hasher.update(block)
+        digest = hasher.hexdigest()
+
+        self.remember_content_hash(file_path, digest)
+        return digest
+
+    def remember_content_hash(self, file_path: str, digest: str) -> None:
+        """Record the digest of a file hashed elsewhere (e.g. while uploading it).
+
+        Args:
+            file_path: Path to the dataset file.
+            digest: SHA-256 hex digest of its current content.
+        """
+        stat = os.stat(file_path)
+        with self._lock:
+            # Only the current version of a file is worth remembering
+            for key in [k for k in self._content_hashes if k[0] == file_path]:
+                del self._content_hashes[key]
+            self._content_hashes[(file_path, stat.st_mtime_ns, stat.st_size)] = digest
+
+    def _evict(self) -> None:
+        """Evict least recently used entries until the cache fits its budget."""
+        while self._current_bytes > self.max_bytes and self._cache:
+            _, (_, size) = self._cache.popitem(last=False)
+            self._current_bytes -= size
+            self._evictions += 1
+
+    def invalidate(self, dataset_id: str) -> None:
+        """Remove every cached entry for a dataset.
+
+        Args:
+            dataset_id: ID of the dataset to drop from the cache.
+        """
+        with self._lock:
+            for key in [k for k in self._cache if k[0] == dataset_id]:
+                self._current_bytes -= self._cache.pop(key)[1]
+
+    def clear(self) -> None:
+        """Remove all cached entries."""
+        with self._lock:
+            self._cache.clear()
+            self._current_bytes = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics.
+
+        Returns:
+            Dictionary with hit/miss/eviction counters and memory usage.
+        """
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "entries": len(self._cache),
+                "current_bytes": self._current_bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+# Create a singleton instance
+dataset_loader = DatasetLoader()
@@ -0,0 +1,362 @@
+import os
+import logging
+from typing import Dict, List, Any, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+from sklearn.base import BaseEstimator, TransformerMixin
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Columns with at most this many levels are one-hot encoded; rare-level
+# bucketing keeps this many levels
+ENCODING_ONEHOT_MAX_LEVELS = int(os.environ.get("ENCODING_ONEHOT_MAX_LEVELS", 50))
+# Rare-level bucketing is used when the kept levels cover this share of the rows
+ENCODING_RARE_COVERAGE = float(os.environ.get("ENCODING_RARE_COVERAGE", 0.95))
+# Columns with at least this share of distinct values are ID- or text-like and hashed
+ENCODING_ID_RATIO = float(os.environ.get("ENCODING_ID_RATIO", 0.5))
+# Width of the block shared by all hashed columns
+ENCODING_HASH_FEATURES = int(os.environ.get("ENCODING_HASH_FEATURES", 256))
+# Cross-fitting folds and smoothing of target encoding: the pseudo-count of
+# the prior mean, or 'auto' for the empirical Bayes estimate
+ENCODING_TARGET_FOLDS = int(os.environ.get("ENCODING_TARGET_FOLDS", 5))
+ENCODING_TARGET_SMOOTHING = os.environ.get("ENCODING_TARGET_SMOOTHING", "auto")
+if ENCODING_TARGET_SMOOTHING != "auto":
+    ENCODING_TARGET_SMOOTHING = float(ENCODING_TARGET_SMOOTHING)
+
+# Level that replaces the levels dropped by rare-level bucketing
+RARE_LEVEL = "__rare__"
+
+# Encodings of a categorical column
+ENCODINGS = ("onehot", "rare", "target", "frequency", "hashing")
+
+def column_stats(series: pd.Series, max_levels: int = ENCODING_ONEHOT_MAX_LEVELS) -> Dict[str, Any]:
+    """Profile statistics used to pick the encoding of a categorical column.
+
+    Args:
+        series: Column values.
+        max_levels: Number of most frequent levels whose coverage is measured.
+
+    Returns:
+        Dictionary with ``rows`` (non-missing), ``unique_count`` and
+        ``top_coverage`` (share of the rows in the ``max_levels`` most
+        frequent levels).
+    """
+    counts = series.value_counts(dropna=True)
+    rows = int(counts.sum())
+    return {
+        "rows": rows,
+        "unique_count": int(len(counts)),
+        "top_coverage": float(counts.iloc[:max_levels].sum() / rows) if rows else 1.0
+    }
+
+def choose_encoding(
+    stats: Dict[str, Any],
+    has_target: bool,
+    max_levels: int = ENCODING_ONEHOT_MAX_LEVELS
+) -> str:
+    """Pick the encoding of a categorical column from its profile statistics.
+
+    - Up to ``max_levels`` levels: one-hot.
+    - A few frequent levels and a long tail: one-hot of the frequent levels,
+      with the tail bucketed into one rare level.
+    - ID- or text-like columns (mostly distinct values) are hashed into a
+      fixed-width block: their levels have too few rows to target encode.
+    - Otherwise, with a target: cross-fitted target encoding; without one,
+      frequency encoding.
+
+    Every choice except one-hot bounds the width of the column's encoding
+    independently of its number of levels.
+
+    Args:
+        stats: Statistics from ``column_stats``.
+        has_target: Whether a target is available for target encoding.
+        max_levels: Largest number of levels that is one-hot encoded.
+
+    Returns:
+        One of ``ENCODINGS``.
+    """
+    if stats["unique_count"] <= max_levels:
+        return "onehot"
+    if stats["top_coverage"] >= ENCODING_RARE_COVERAGE:
+        return "rare"
+    if stats["unique_count"] >= ENCODING_ID_RATIO * stats["rows"]:
+        return "hashing"
+    if has_target:
+        return "target"
+    return "frequency"
+
+def encoded_width(encoding: str, unique_count: int, max_levels: int = ENCODING_ONEHOT_MAX_LEVELS) -> int:
+    """Number of output columns of one column's encoding (hashed columns share one block)."""
+    if encoding == "onehot":
+        return unique_count
+    if encoding == "rare":
+        return min(unique_count, max_levels) + 1
+    if encoding == "hashing":
+        return 0
+    return 1
+
+def frequent_levels(series: pd.Series, max_levels: int = ENCODING_ONEHOT_MAX_LEVELS) -> pd.Index:
+    """The ``max_levels`` most frequent levels of a column (ties broken by value)."""
+    counts = series.value_counts(dropna=True)
+    order = np.lexsort((counts.index.astype(str), -counts.to_numpy()))
+    return counts.index[order[:max_levels]]
+
+def bucket_rare(series: pd.Series, levels: pd.Index) -> pd.Series:
+    """Replace the values outside ``levels`` (including unseen ones) by ``RARE_LEVEL``."""
+    return series.where(series.isin(levels) | series.isna(), RARE_LEVEL)
+
+def hash_values(values: Any, column: Any, n_features: int = ENCODING_HASH_FEATURES) -> Tuple[np.ndarray, np.ndarray]:
+    """Hash the values of a column into ``n_features`` signed buckets.
+
+    Hashes are computed with pandas' deterministic hashing, so they are the
+    same in every process. The column name is mixed in, so equal values of
+    different columns fall in different buckets; the top bit gives the
+    sign, which keeps collisions unbiased as in ``FeatureHasher``.
+
+    Args:
+        values: Column values (converted to strings).
+        column: Column name.
+        n_features: Number of buckets.
+
+    Returns:
+        Tuple of (bucket per value, sign per value as +1.0/-1.0).
+    """
+    strings = pd.Series(values).astype(str).to_numpy(dtype=object)
+    salt = pd.util.hash_array(np.array([str(column)], dtype=object))[0]
+    hashes = pd.util.hash_array(strings) ^ salt
+    buckets = (hashes % np.uint64(n_features)).astype(np.int64)
+    signs = np.where(hashes >> np.uint64(63), -1.0, 1.0)
+    return buckets, signs
+
+def target_vector(y: Any, target_type: str) -> Optional[np.ndarray]:
+    """Numeric target used for target encoding, or None if it cannot be encoded.
+
+    Continuous targets are used as is; binary classification targets become
+    the indicator of the second class. Multiclass targets return None (they
+    would need one encoding per class), and callers fall back to frequency
+    encoding.
+    """
+    y = pd.Series(np.asarray(y))
+    if target_type == "continuous":
+        return y.to_numpy(dtype=float)
+    classes = np.sort(y.dropna().unique())
+    if len(classes) != 2:
+        return None
+    return (y == classes[1]).to_numpy(dtype=float)
+
+def target_means(
+    codes: np.ndarray,
+    y: np.ndarray,
+    n_levels: int,
+    prior: float,
+    smoothing: Union[float, str] = ENCODING_TARGET_SMOOTHING
+) -> np.ndarray:
+    """Smoothed mean of the target per level: (sum + m * prior) / (count + m).
+
+    With ``smoothing='auto'``, ``m`` is the ratio of the variance of the
+    target within levels to the variance of the level means (empirical
+    Bayes), so noisy levels shrink more towards the prior. It is at least
+    1, so pure levels still shrink; levels without rows get the prior.
+    """
+    known = codes >= 0
+    counts = np.bincount(codes[known], minlength=n_levels)
+    sums = np.bincount(codes[known], weights=y[known], minlength=n_levels)
+    if smoothing == "auto":
+        seen = counts > 0
+        level_means = sums[seen] / counts[seen]
+        squares = np.bincount(codes[known], weights=y[known] ** 2, minlength=n_levels)
+        within = (squares[seen].sum() - (sums[seen] ** 2 / counts[seen]).sum()) / max(counts.sum(), 1)
+        between = level_means.var() if len(level_means) > 1 else 0.0
+        smoothing = max(within / between, 1.0) if between > 0 else max(float(counts.sum()), 1.0)
+    means = np.full(n_levels, prior, dtype=float)
+    fitted = counts + smoothing > 0
+    means[fitted] = (sums[fitted] + smoothing * prior) / (counts[fitted] + smoothing)
+    return means
+
+def cross_fit_target(
+    codes: np.ndarray,
+    y: np.ndarray,
+    n_levels: int,
+    folds: int = ENCODING_TARGET_FOLDS,
+    smoothing: Union[float, str] = ENCODING_TARGET_SMOOTHING,
+    random_state: int = 0
+) -> Tuple[np.ndarray, np.ndarray, float]:
+    """Cross-fitted target encoding of integer level codes.
+
+    Rows are split into ``folds`` random folds, and each row is encoded
+    with the level means of the other folds, so a row's own target never
+    leaks into its encoding.
+
+    Args:
+        codes: Level code per row (-1 for unknown levels).
+        y: Numeric target per row.
+        n_levels: Number of levels.
+        folds: Number of cross-fitting folds.
+        smoothing: Pseudo-count of the prior mean, or 'auto'.
+        random_state: Seed of the fold assignment.
+
+    Returns:
+        Tuple of (out-of-fold encoding per row, level means fitted on all
+        rows, prior mean).
+    """
+    prior = float(y.mean()) if len(y) else 0.0
+    fold = np.random.default_rng(random_state).permutation(len(codes)) % max(folds, 2)
+    encoded = np.empty(len(codes))
+    for k in range(max(folds, 2)):
+        held_out = fold == k
+        fold_prior = float(y[~held_out].mean()) if (~held_out).any() else prior
+        means = target_means(codes[~held_out], y[~held_out], n_levels, fold_prior, smoothing)
+        fold_codes = codes[held_out]
+        encoded[held_out] = np.where(fold_codes >= 0, means[fold_codes], fold_prior)
+    return encoded, target_means(codes, y, n_levels, prior, smoothing), prior
+
+def _columns(X: Any) -> List[pd.Series]:
+    """Columns of a DataFrame or 2D array as Series."""
+    if isinstance(X, pd.DataFrame):
+        return [X.iloc[:, i] for i in range(X.shape[1])]
+    X = np.asarray(X, dtype=object)
+    if X.ndim == 1:
+        X = X.reshape(-1, 1)
+    return [pd.Series(X[:, i]) for i in range(X.shape[1])]
+
+def _input_names(X: Any) -> np.ndarray:
+    """Column names of a DataFrame, or positional names of an array."""
+    if isinstance(X, pd.DataFrame):
+        return np.asarray([str(col) for col in X.columns], dtype=object)
+    return np.asarray([f"x{i}" for i in range(np.shape(X)[1] if np.ndim(X) > 1 else 1)], dtype=object)
+
+class RareLevelBucketer(TransformerMixin, BaseEstimator):
+    """Keep the most frequent levels of each column and bucket the rest.
+
+    Levels outside the ``max_levels`` most frequent ones, and levels unseen
+    during fitting, become ``RARE_LEVEL``. Followed by a one-hot encoder,
+    each column has at most ``max_levels + 1`` output columns.
+    """
+
+    def __init__(self, max_levels: int = ENCODING_ONEHOT_MAX_LEVELS):
+        self.max_levels = max_levels
+
+    def fit(self, X: Any, y: Any = None) -> "RareLevelBucketer":
+        self.feature_names_in_ = _input_names(X)
+        self.levels_ = [frequent_levels(column, self.max_levels) for column in _columns(X)]
+        return self
+
+    def transform(self, X: Any) -> np.ndarray:
+        columns = [bucket_rare(column, levels) for column, levels in zip(_columns(X), self.levels_)]
+        return np.column_stack([column.to_numpy(dtype=object) for column in columns])
+
+    def get_feature_names_out(self, input_features: Any = None) -> np.ndarray:
+        return np.asarray(input_features if input_features is not None else self.feature_names_in_, dtype=object)
+
+class FrequencyEncoder(TransformerMixin, BaseEstimator):
+    """Encode each level by its share of the training rows (0 for unseen levels)."""
+
+    def fit(self, X: Any, y: Any = None) -> "FrequencyEncoder":
+        self.feature_names_in_ = _input_names(X)
+        self.frequencies_ = [column.value_counts(normalize=True, dropna=True) for column in _columns(X)]
+        return self
+
+    def transform(self, X: Any) -> np.ndarray:
+        encoded = []
+        for column, frequencies in zip(_columns(X), self.frequencies_):
+            codes = frequencies.index.get_indexer(column)
+            encoded.append(np.where(codes >= 0, frequencies.to_numpy()[codes], 0.0))
+        return np.column_stack(encoded)
+
+    def get_feature_names_out(self, input_features: Any = None) -> np.ndarray:
+        return np.asarray(input_features if input_features is not None else self.feature_names_in_, dtype=object)
+
+class CrossFitTargetEncoder(TransformerMixin, BaseEstimator):
+    """Encode each level by the smoothed mean of the target.
+
+    ``fit_transform`` returns cross-fitted (out-of-fold) encodings, so the
+    model is not trained on encodings that saw each row's own target;
+    ``transform`` uses the means fitted on all rows. Multiclass targets
+    cannot be summarized by one mean and are frequency encoded instead.
+    """
+
+    def __init__(
+        self,
+        target_type: str = "continuous",
+        folds: int = ENCODING_TARGET_FOLDS,
+        smoothing: Union[float, str] = ENCODING_TARGET_SMOOTHING,
+        random_state: int = 0
+    ):
+        self.target_type = target_type
+        self.folds = folds
+        self.smoothing = smoothing
+        self.random_state = random_state
+
+    def fit(self, X: Any, y: Any = None) -> "CrossFitTargetEncoder":
+        self.fit_transform(X, y)
+        return self
+
+    def fit_transform(self, X: Any, y: Any = None, **fit_params) -> np.ndarray:
+        self.feature_names_in_ = _input_names(X)
+        columns = _columns(X)
+        target = target_vector(y, self.target_type)
+        if target is None:
+            self.method_ = "frequency"
+            self.frequency_encoder_ = FrequencyEncoder().fit(X)
+            return self.frequency_encoder_.transform(X)
+
+        self.method_ = "target"
+        self.levels_, self.means_ = [], []
+        encoded = []
+        for i, column in enumerate(columns):
+            codes, levels = pd.factorize(column)
+            column_encoded, means, self.prior_ = cross_fit_target(
+                codes, target, len(levels), self.folds, self.smoothing, self.random_state + i
+            )
+            self.levels_.append(pd.Index(levels))
+            self.means_.append(means)
+            encoded.append(column_encoded)
+        return np.column_stack(encoded)
+
+    def transform(self, X: Any) -> np.ndarray:
+        if self.method_ == "frequency":
+            return self.frequency_encoder_.transform(X)
+        encoded = []
+        for column, levels, means in zip(_columns(X), self.levels_, self.means_):
+            codes = levels.get_indexer(column)
+            encoded.append(np.where(codes >= 0, means[codes], self.prior_))
+        return np.column_stack(encoded)
+
+    def get_feature_names_out(self, input_features: Any = None) -> np.ndarray:
+        return np.asarray(input_features if input_features is not None else self.feature_names_in_, dtype=object)
+
+class HashingEncoder(TransformerMixin, BaseEstimator):
+    """Hash the levels of all columns into one sparse block of fixed width.
+
+    Stateless: memory and output width do not depend on the number of
+    levels, and unseen levels are hashed like any other.
+    """
+
+    def __init__(self, n_features: int = ENCODING_HASH_FEATURES):
+        self.n_features = n_features
+
+    def fit(self, X: Any, y: Any = None) -> "HashingEncoder":
+        self.feature_names_in_ = _input_names(X)
+        return self
+
+    def transform(self, X: Any) -> Any:
+        from scipy import sparse
+
+        rows, buckets, signs = [], [], []
+        for name, column in zip(self.feature_names_in_, _columns(X)):
+            column_buckets, column_signs = hash_values(column.to_numpy(dtype=object), name, self.n_features)
+            rows.append(np.arange(len(column)))
+            buckets.append(column_buckets)
+            signs.append(column_signs)
+        n_rows = len(rows[0]) if rows else 0
+        # Duplicate (row, bucket) entries are summed, like colliding features
+        return sparse.csr_matrix(
+            (np.concatenate(signs), (np.concatenate(rows), np.concatenate(buckets))),
+            shape=(n_rows, self.n_features)
+        )
+
+    def get_feature_names_out(self, input_features: Any = None) -> np.ndarray:
+        return np.asarray([f"hashed_{i}" for i in range(self.n_features)], dtype=object)
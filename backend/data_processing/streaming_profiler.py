@@ -0,0 +1,578 @@
+import math
+import logging
+from typing import Dict, List, Any, Optional, Iterable
+
+import numpy as np
+import pandas as pd
+
+from .correlation import correlation_engine
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Sketch sizes: KLL compactor size, HyperLogLog precision (2**p registers),
+# Misra-Gries counters and the number of distinct values counted exactly
+KLL_K = 200
+HLL_PRECISION = 14
+TOP_VALUES_CAPACITY = 100
+EXACT_DISTINCT_LIMIT = 4096
+
+class MomentAccumulator:
+    """Count, min, max and central moments up to order 4 of one column.
+
+    Chunks are folded in with the pairwise update of Chan et al. and Pébay,
+    which is also how two partial accumulators are merged.
+    """
+
+    def __init__(self):
+        """Initialize an empty MomentAccumulator."""
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.m3 = 0.0
+        self.m4 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def update(self, values: np.ndarray) -> None:
+        """Fold a chunk of non-missing values into the accumulator."""
+        if len(values) == 0:
+            return
+        chunk = MomentAccumulator()
+        chunk.n = len(values)
+        chunk.mean = float(values.mean())
+        deviations = values - chunk.mean
+        squared = deviations * deviations
+        chunk.m2 = float(squared.sum())
+        chunk.m3 = float((squared * deviations).sum())
+        chunk.m4 = float((squared * squared).sum())
+        chunk.min = float(values.min())
+        chunk.max = float(values.max())
+        self.merge(chunk)
+
+    def merge(self, other: "MomentAccumulator") -> None:
+        """Merge another accumulator into this one."""
+        if other.n == 0:
+            return
+        if self.n == 0:
+            self.__dict__.update(other.__dict__)
+            return
+
+        n_a, n_b = self.n, other.n
+        n = n_a + n_b
+        delta = other.mean - self.mean
+        delta_n = delta / n
+
+        m2 = self.m2 + other.m2 + delta * delta_n * n_a * n_b
+        m3 = (self.m3 + other.m3
+              + delta * delta_n * delta_n * n_a * n_b * (n_a - n_b)
+              + 3.0 * delta_n * (n_a * other.m2 - n_b * self.m2))
+        m4 = (self.m4 + other.m4
+              + delta * delta_n ** 3 * n_a * n_b * (n_a * n_a - n_a * n_b + n_b * n_b)
+              + 6.0 * delta_n * delta_n * (n_a * n_a * other.m2 + n_b * n_b * self.m2)
+              + 4.0 * delta_n * (n_a * other.m3 - n_b * self.m3))
+
+        self.mean += delta_n * n_b
+        self.n, self.m2, self.m3, self.m4 = n, m2, m3, m4
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def std(self) -> Optional[float]:
+        """Sample standard deviation (ddof=1), as in pandas."""
+        if self.n < 2:
+            return None
+        return math.sqrt(self.m2 / (self.n - 1))
+
+    def skewness(self) -> Optional[float]:
+        """Adjusted Fisher-Pearson skewness, as in ``Series.skew``."""
+        n = self.n
+        if n < 3 or self.m2 == 0:
+            return None
+        g1 = math.sqrt(n) * self.m3 / self.m2 ** 1.5
+        return g1 * math.sqrt(n * (n - 1)) / (n - 2)
+
+    def kurtosis(self) -> Optional[float]:
+        """Bias-corrected excess kurtosis, as in ``Series.kurtosis``."""
+        n = self.n
+        if n < 4 or self.m2 == 0:
+            return None
+        g2 = n * self.m4 / (self.m2 * self.m2) - 3.0
+        return ((n + 1) * g2 + 6.0) * (n - 1) / ((n - 2) * (n - 3))
+
+class KLLSketch:
+    """KLL quantile sketch (Karnin, Lang and Liberty).
+
+    Items live in levels of compactors; an item at level ``h`` stands for
+    ``2**h`` input values. A full level is sorted and every other item is
+    promoted to the next level. Sketches built on different chunks are
+    merged by concatenating their levels and compacting again. Results are
+    exact while fewer than ``k`` values have been seen.
+    """
+
+    def __init__(self, k: int = KLL_K, seed: int = 0):
+        """Initialize an empty KLLSketch.
+
+        Args:
+            k: Size of the top compactor; the rank error shrinks as ~1/k.
+            seed: Seed of the random offsets used when compacting.
+        """
+        self.k = k
+        self.n = 0
+        self.levels: List[np.ndarray] = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def _capacity(self, level: int) -> int:
+        """Capacity of a level; lower levels get geometrically smaller compactors."""
+        depth = len(self.levels) - level - 1
+        return max(int(math.ceil(self.k * (2.0 / 3.0) ** depth)), 2)
+
+    def update(self, values: np.ndarray) -> None:
+        """Add a chunk of non-missing values."""
+        if len(values) == 0:
+            return
+        self.levels[0] = np.concatenate([self.levels[0], values.astype(float)])
+        self.n += len(values)
+        self._compress()
+
+    def merge(self, other: "KLLSketch") -> None:
+        """Merge another sketch into this one."""
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for level, items in enumerate(other.levels):
+            self.levels[level] = np.concatenate([self.levels[level], items])
+        self.n += other.n
+        self._compress()
+
+    def _compress(self) -> None:
+        """Compact levels until each fits its capacity."""
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if len(items) > self._capacity(level):
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                items = np.sort(items)
+                # An odd item out stays behind so the promoted weight is exact
+                keep = items[-1:] if len(items) % 2 else items[:0]
+                paired = items[:len(items) - len(keep)]
+                promoted = paired[self._rng.integers(2)::2]
+                self.levels[level] = keep
+                self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+                # Capacities depend on the number of levels; start over
+                level = 0
+                continue
+            level += 1
+
+    def quantiles(self, qs: Iterable[float]) -> List[Optional[float]]:
+        """Estimate quantiles (lower-rank convention) of the values seen."""
+        qs = list(qs)
+        if self.n == 0:
+            return [None] * len(qs)
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(level_items), 2 ** level) for level, level_items in enumerate(self.levels)])
+        order = np.argsort(items, kind="stable")
+        items, cumulative = items[order], np.cumsum(weights[order])
+        total = cumulative[-1]
+        return [float(items[min(np.searchsorted(cumulative, q * total, side="left"), len(items) - 1)]) for q in qs]
+
+    def rank(self, value: float) -> float:
+        """Estimate the fraction of values strictly below ``value``."""
+        if self.n == 0:
+            return 0.0
+        below = sum(int((items < value).sum()) * 2 ** level for level, items in enumerate(self.levels))
+        total = sum(len(items) * 2 ** level for level, items in enumerate(self.levels))
+        return below / total
+
+    def rank_error(self) -> float:
+        """Approximate normalized rank error (99% confidence) of the estimates."""
+        if self.n <= self.k:
+            return 0.0
+        # Empirical KLL bound: about 1.65% at k=200, scaling as 1/k
+        return 3.3 / self.k
+
+def _hash_values(values: np.ndarray) -> np.ndarray:
+    """Deterministic 64-bit hashes, stable across chunks and processes."""
+    return pd.util.hash_array(values, categorize=False)
+
+class HyperLogLog:
+    """HyperLogLog distinct counter (Flajolet et al.).
+
+    Counts are exact up to ``EXACT_DISTINCT_LIMIT`` distinct values; beyond
+    that the sketch falls back to the register estimate. Two sketches are
+    merged by taking the register-wise maximum.
+    """
+
+    def __init__(self, precision: int = HLL_PRECISION):
+        """Initialize an empty HyperLogLog.
+
+        Args:
+            precision: Number of index bits; uses ``2**precision`` registers.
+        """
+        self.precision = precision
+        self.registers = np.zeros(2 ** precision, dtype=np.uint8)
+        self.exact: Optional[np.ndarray] = np.empty(0, dtype=np.uint64)
+
+    def update(self, hashes: np.ndarray) -> None:
+        """Add a chunk of value hashes (see ``_hash_values``)."""
+        if len(hashes) == 0:
+            return
+        p = self.precision
+        index = (hashes >> np.uint64(64 - p)).astype(np.int64)
+        remainder = hashes & np.uint64((1 << (64 - p)) - 1)
+        # frexp gives the exact bit length for integers below 2**53
+        _, bit_length = np.frexp(remainder.astype(float))
+        rank = (64 - p - bit_length + 1).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+        self._update_exact(np.unique(hashes))
+
+    def _update_exact(self, unique_hashes: np.ndarray) -> None:
+        """Track distinct hashes exactly until there are too many."""
+        if self.exact is None:
+            return
+        self.exact = np.union1d(self.exact, unique_hashes)
+        if len(self.exact) > EXACT_DISTINCT_LIMIT:
+            self.exact = None
+
+    def merge(self, other: "HyperLogLog") -> None:
+        """Merge another sketch into this one."""
+        np.maximum(self.registers, other.registers, out=self.registers)
+        if other.exact is None:
+            self.exact = None
+        else:
+            self._update_exact(other.exact)
+
+    def count(self) -> int:
+        """Estimate the number of distinct values."""
+        if self.exact is not None:
+            return int(len(self.exact))
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.power(2.0, -self.registers.astype(float)))
+        zeros = int((self.registers == 0).sum())
+        if estimate <= 2.5 * m and zeros > 0:
+            # Small-range correction (linear counting)
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
+
+    def relative_error(self) -> float:
+        """Standard relative error of ``count`` (0 while counting exactly)."""
+        if self.exact is not None:
+            return 0.0
+        return 1.04 / math.sqrt(len(self.registers))
+
+class MisraGries:
+    """Misra-Gries heavy hitters summary with mergeable counters.
+
+    Counts are lower bounds of the true frequencies, off by at most
+    ``max_error()``.
+    """
+
+    def __init__(self, capacity: int = TOP_VALUES_CAPACITY):
+        """Initialize an empty MisraGries summary.
+
+        Args:
+            capacity: Number of counters kept.
+        """
+        self.capacity = capacity
+        self.counters: Dict[Any, int] = {}
+        self.n = 0
+
+    def update(self, values: pd.Series) -> None:
+        """Add a chunk of non-missing values."""
+        self._merge_counts(values.value_counts().to_dict(), len(values))
+
+    def merge(self, other: "MisraGries") -> None:
+        """Merge another summary into this one."""
+        self._merge_counts(other.counters, other.n)
+
+    def _merge_counts(self, counts: Dict[Any, int], n: int) -> None:
+        """Mergeable-summaries combine step (Agarwal et al.)."""
+        counters = dict(self.counters)
+        for value, count in counts.items():
+            counters[value] = counters.get(value, 0) + int(count)
+        if len(counters) > self.capacity:
+            # Subtract the (capacity + 1)-th largest count and drop non-positive counters
+            threshold = sorted(counters.values(), reverse=True)[self.capacity]
+            counters = {value: count - threshold for value, count in counters.items() if count > threshold}
+        self.counters = counters
+        self.n += n
+
+    def top(self, count: int = 10) -> Dict[Any, int]:
+        """The most frequent values with their (lower bound) counts."""
+        return dict(sorted(self.counters.items(), key=lambda item: item[1], reverse=True)[:count])
+
+    def max_error(self) -> int:
+        """Maximum undercount of any reported frequency."""
+        return int((self.n - sum(self.counters.values())) // (self.capacity + 1))
+
+class CorrelationAccumulator:
+    """Pairwise-complete Pearson correlation from mergeable co-moment sums.
+
+    For every pair of columns it keeps the number of rows where both are
+    present and the sums of x, y, x*y, x*x and y*y over those rows, all
+    updated with matrix products. Values are shifted by the first chunk's
+    means to limit cancellation.
+    """
+
+    def __init__(self, columns: List[str]):
+        """Initialize an empty CorrelationAccumulator.
+
+        Args:
+            columns: Numeric columns to correlate.
+        """
+        self.columns = columns
+        p = len(columns)
+        self.shift: Optional[np.ndarray] = None
+        self.count = np.zeros((p, p))
+        self.sum_x = np.zeros((p, p))
+        self.sum_xy = np.zeros((p, p))
+        self.sum_xx = np.zeros((p, p))
+
+    def update(self, values: np.ndarray) -> None:
+        """Add a chunk given as a (rows, columns) float array with NaNs."""
+        if self.shift is None:
+            with np.errstate(invalid="ignore"):
+                self.shift = np.nan_to_num(np.nanmean(values, axis=0)) if len(values) else np.zeros(values.shape[1])
+        present = ~np.isnan(values)
+        mask = present.astype(float)
+        shifted = np.where(present, values - self.shift, 0.0)
+        self.count += mask.T @ mask
+        # sum_x[i, j]: sum of column i over rows where column j is present
+        self.sum_x += shifted.T @ mask
+        self.sum_xy += shifted.T @ shifted
+        self.sum_xx += (shifted * shifted).T @ mask
+
+    def merge(self, other: "CorrelationAccumulator") -> None:
+        """Merge another accumulator over the same columns into this one."""
+        if other.shift is None:
+            return
+        if self.shift is None:
+            self.__dict__.update({k: (v.copy() if isinstance(v, np.ndarray) else v) for k, v in other.__dict__.items()})
+            return
+        # Re-express the other sums relative to this accumulator's shift
+        d = (other.shift - self.shift)[:, None]
+        d_t = d.T
+        self.sum_xy += other.sum_xy + d * other.sum_x.T + d_t * other.sum_x + d * d_t * other.count
+        self.sum_xx += other.sum_xx + 2 * d * other.sum_x + d * d * other.count
+        self.sum_x += other.sum_x + d * other.count
+        self.count += other.count
+
+    def matrix(self) -> np.ndarray:
+        """Pearson correlation matrix (NaN where undefined)."""
+        n = self.count
+        sum_y = self.sum_x.T
+        sum_yy = self.sum_xx.T
+        with np.errstate(invalid="ignore", divide="ignore"):
+            covariance = self.sum_xy - self.sum_x * sum_y / n
+            var_x = self.sum_xx - self.sum_x ** 2 / n
+            var_y = sum_yy - sum_y ** 2 / n
+            corr = covariance / np.sqrt(var_x * var_y)
+        return np.clip(corr, -1.0, 1.0)
+
+class StreamingProfile:
+    """Mergeable per-column sketches producing a dataset profile.
+
+    ``update`` folds in one chunk; ``merge`` combines partial profiles
+    built on disjoint chunks (for example in parallel workers); and
+    ``to_profile`` renders the same schema as
+    ``DataProcessor.get_dataset_profile``, with quantiles, IQR outlier
+    bounds, skewness and kurtosis added to the numeric stats and an
+    ``error_bounds`` section describing the approximation.
+    """
+
+    def __init__(self):
+        """Initialize an empty StreamingProfile. Columns are taken from the first chunk."""
+        self.row_count = 0
+        self.column_types: Dict[str, str] = {}
+        self.missing: Dict[str, int] = {}
+        self.moments: Dict[str, MomentAccumulator] = {}
+        self.quantiles: Dict[str, KLLSketch] = {}
+        self.distinct: Dict[str, HyperLogLog] = {}
+        self.heavy_hitters: Dict[str, MisraGries] = {}
+        self.correlations: Optional[CorrelationAccumulator] = None
+
+    def _init_columns(self, chunk: pd.DataFrame) -> None:
+        """Create the sketches of each column from the first chunk's dtypes."""
+        for col, dtype in chunk.dtypes.items():
+            if pd.api.types.is_numeric_dtype(dtype):
+                self.column_types[col] = "numeric"
+                self.moments[col] = MomentAccumulator()
+                self.quantiles[col] = KLLSketch()
+            elif pd.api.types.is_datetime64_dtype(dtype):
+                self.column_types[col] = "datetime"
+            else:
+                self.column_types[col] = "categorical"
+                self.heavy_hitters[col] = MisraGries()
+            self.missing[col] = 0
+            self.distinct[col] = HyperLogLog()
+
+        numeric_cols = [col for col, kind in self.column_types.items() if kind == "numeric"]
+        if len(numeric_cols) > 1:
+            self.correlations = CorrelationAccumulator(numeric_cols)
+
+    def update(self, chunk: pd.DataFrame) -> None:
+        """Fold one chunk of rows into the sketches."""
+        if not self.column_types:
+            self._init_columns(chunk)
+        self.row_count += len(chunk)
+
+        # CSV chunks are parsed independently, so a column typed numeric from
+        # the first chunk may hold text later on; unparseable values count as missing
+        mixed = [
+            col for col, kind in self.column_types.items()
+            if kind == "numeric" and not pd.api.types.is_numeric_dtype(chunk[col].dtype)
+        ]
+        if mixed:
+            chunk = chunk.copy()
+            for col in mixed:
+                chunk[col] = pd.to_numeric(chunk[col], errors="coerce")
+
+        missing_counts = chunk.isna().sum()
+        for col, kind in self.column_types.items():
+            self.missing[col] += int(missing_counts[col])
+            series = chunk[col].dropna()
+            if kind == "numeric":
+                values = series.to_numpy(dtype=float)
+                self.moments[col].update(values)
+                self.quantiles[col].update(values)
+                self.distinct[col].update(_hash_values(values))
+            else:
+                self.distinct[col].update(_hash_values(series.astype(str).to_numpy(dtype=object)))
+                if kind == "categorical":
+                    self.heavy_hitters[col].update(series)
+
+        if self.correlations is not None:
+            self.correlations.update(chunk[self.correlations.columns].to_numpy(dtype=float, na_value=np.nan))
+
+    def merge(self, other: "StreamingProfile") -> None:
+        """Merge a partial profile built on other rows of the same dataset."""
+        if not other.column_types:
+            return
+        if not self.column_types:
+            self.__dict__.update(other.__dict__)
+            return
+
+        self.row_count += other.row_count
+        for col in self.column_types:
+            self.missing[col] += other.missing[col]
+            self.distinct[col].merge(other.distinct[col])
+            if col in self.moments:
+                self.moments[col].merge(other.moments[col])
+                self.quantiles[col].merge(other.quantiles[col])
+            if col in self.heavy_hitters:
+                self.heavy_hitters[col].merge(other.heavy_hitters[col])
+        if self.correlations is not None:
+            self.correlations.merge(other.correlations)
+
+    def to_profile(self) -> Dict[str, Any]:
+        """Render the profile.
+
+        Returns:
+            Dictionary with the keys of ``get_dataset_profile`` plus
+            ``error_bounds``.
+        """
+        profile = {
+            "row_count": self.row_count,
+            "column_count": len(self.column_types),
+            "columns": dict(self.column_types),
+            "missing_values": {},
+            "numeric_stats": {},
+            "categorical_stats": {},
+            "correlations": {},
+            "error_bounds": {
+                "numeric": {},
+                "categorical": {},
+                "method": {
+                    "quantiles": f"KLL (k={KLL_K})",
+                    "unique_count": f"HyperLogLog (p={HLL_PRECISION})",
+                    "top_values": f"Misra-Gries ({TOP_VALUES_CAPACITY} counters)",
+                    "moments": "exact (merged central moments)",
+                    "correlations": "exact (pairwise-complete co-moments)"
+                }
+            }
+        }
+
+        for col, missing_count in self.missing.items():
+            if missing_count > 0:
+                profile["missing_values"][col] = {
+                    "count": int(missing_count),
+                    "percentage": float(missing_count / self.row_count * 100)
+                }
+
+        for col, moments in self.moments.items():
+            sketch = self.quantiles[col]
+            q1, median, q3 = sketch.quantiles([0.25, 0.5, 0.75])
+            stats = {
+                "min": moments.min if moments.n else None,
+                "max": moments.max if moments.n else None,
+                "mean": moments.mean if moments.n else None,
+                "median": median,
+                "std": moments.std(),
+                "25%": q1,
+                "75%": q3,
+                "skewness": moments.skewness(),
+                "kurtosis": moments.kurtosis(),
+                "unique_count": self.distinct[col].count()
+            }
+            if q1 is not None:
+                iqr = q3 - q1
+                lower_bound, upper_bound = q1 - 1.5 * iqr, q3 + 1.5 * iqr
+                outlier_fraction = sketch.rank(lower_bound) + (1.0 - sketch.rank(np.nextafter(upper_bound, np.inf)))
+                stats["outliers"] = {
+                    "count_estimate": int(round(outlier_fraction * moments.n)),
+                    "percentage_estimate": float(outlier_fraction * moments.n / self.row_count * 100),
+                    "lower_bound": float(lower_bound),
+                    "upper_bound": float(upper_bound)
+                }
+            profile["numeric_stats"][col] = stats
+            profile["error_bounds"]["numeric"][col] = {
+                "quantile_rank_error": sketch.rank_error(),
+                "unique_count_relative_error": self.distinct[col].relative_error()
+            }
+
+        for col, summary in self.heavy_hitters.items():
+            profile["categorical_stats"][col] = {
+                "unique_count": self.distinct[col].count(),
+                "top_values": {str(k): int(v) for k, v in summary.top(10).items()}
+            }
+            profile["error_bounds"]["categorical"][col] = {
+                "unique_count_relative_error": self.distinct[col].relative_error(),
+                "top_values_max_undercount": summary.max_error()
+            }
+
+        if self.correlations is not None:
+            profile["correlations"] = correlation_engine.nested(
+                self.correlations.matrix(), self.correlations.columns
+            )
+
+        return profile
+
+def profile_chunks(chunks: Iterable[pd.DataFrame]) -> StreamingProfile:
+    """Build a streaming profile from an iterable of chunks.
+
+    Args:
+        chunks: DataFrames with the same columns, e.g. from
+            ``DataProcessor.iter_chunks``.
+
+    Returns:
+        The (partial) StreamingProfile, ready to merge or render.
+    """
+    profile = StreamingProfile()
+    for chunk in chunks:
+        profile.update(chunk)
+    return profile
+
+def merge_profiles(partials: Iterable[StreamingProfile]) -> Dict[str, Any]:
+    """Merge partial profiles of disjoint row ranges and render the result.
+
+    Args:
+        partials: Partial StreamingProfiles, e.g. built by parallel workers.
+
+    Returns:
+        The rendered profile (see ``StreamingProfile.to_profile``).
+    """
+    merged = StreamingProfile()
+    for partial in partials:
+        merged.merge(partial)
+    return merged.to_profile()
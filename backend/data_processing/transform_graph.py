@@ -0,0 +1,524 @@
+import os
+import logging
+from typing import Dict, List, Any, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Imputation strategies for numeric columns; categorical columns use 'most_frequent'
+IMPUTE_STRATEGIES = ("mean", "median", "most_frequent", "constant")
+SCALING_METHODS = ("standard", "minmax")
+# 'auto' picks one of the encodings of data_processing.encoders per column
+ENCODING_METHODS = ("auto", "onehot", "label", "rare", "target", "frequency", "hashing")
+SPARSE_OUTPUTS = (False, True, "auto")
+
+# With sparse_output='auto', outputs whose estimated density (share of
+# nonzero cells) is below this are built as sparse (CSR) matrices
+SPARSE_DENSITY_THRESHOLD = float(os.environ.get("SPARSE_DENSITY_THRESHOLD", 0.1))
+
+def _handle_zeros_in_scale(scale: np.ndarray) -> np.ndarray:
+    """Replace near-zero scales by 1, as scikit-learn scalers do for constant columns."""
+    return np.where(scale < 10 * np.finfo(float).eps, 1.0, scale)
+
+def _most_frequent(values: pd.Series) -> Any:
+    """Most frequent non-missing value, the smallest one on ties (like SimpleImputer)."""
+    counts = values.value_counts(dropna=True)
+    if counts.empty:
+        return np.nan
+    return min(counts.index[counts.to_numpy() == counts.iloc[0]])
+
+def estimate_output_size(rows: int, columns: int, nonzeros: int) -> Dict[str, Any]:
+    """Estimate the memory of a feature matrix before it is built.
+
+    Args:
+        rows: Number of rows.
+        columns: Number of output columns.
+        nonzeros: (Upper bound of the) number of nonzero cells.
+
+    Returns:
+        Dictionary with ``rows``, ``columns``, ``nonzeros``, ``density`` and
+        the sizes in bytes of the matrix stored as dense float64
+        (``dense_bytes``) and as CSR (``sparse_bytes``).
+    """
+    cells = rows * columns
+    index_bytes = 4 if nonzeros < 2 ** 31 else 8
+    return {
+        "rows": rows,
+        "columns": columns,
+        "nonzeros": nonzeros,
+        "density": nonzeros / cells if cells else 1.0,
+        "dense_bytes": cells * 8,
+        "sparse_bytes": nonzeros * (8 + index_bytes) + (rows + 1) * index_bytes
+    }
+
+def use_sparse(estimate: Dict[str, Any], sparse_output: Union[bool, str]) -> bool:
+    """Whether a matrix should be built sparse, for a ``sparse_output`` setting."""
+    if sparse_output == "auto":
+        return estimate["density"] < SPARSE_DENSITY_THRESHOLD
+    return bool(sparse_output)
+
+def sparse_frame_to_csr(X: Any) -> Any:
+    """Convert a frame of sparse columns (or any numeric frame) to a CSR matrix.
+
+    Used as a scikit-learn ``FunctionTransformer`` so that preprocessed sparse
+    frames reach estimators without being densified.
+    """
+    from scipy import sparse
+
+    if isinstance(X, pd.DataFrame):
+        if all(isinstance(dtype, pd.SparseDtype) for dtype in X.dtypes):
+            return X.sparse.to_coo().tocsr()
+        X = X.to_numpy(dtype=float, na_value=np.nan)
+    return sparse.csr_matrix(X)
+
+class TransformGraph:
+    """Preprocessing of a feature frame, fitted once and applied as whole blocks.
+
+    The graph has two branches joined at the end. The numeric branch
+    converts the numeric columns to one float array, fills the missing
+    values of every column and scales all columns with single broadcast
+    operations. The categorical branch fills missing categories and encodes
+    each column from one factorization into integer codes: one-hot blocks
+    (optionally with rare levels bucketed) and hashed columns are written
+    into one preallocated block, while label, target and frequency
+    encodings replace the column in place. The output frame is assembled
+    once, so the cost is linear in the number of columns.
+
+    With ``encoding_method='auto'`` each categorical column gets the
+    encoding picked by ``encoders.choose_encoding`` from its cardinality
+    profile, so high-cardinality columns have a bounded output width.
+
+    Before the output is built, its size is estimated from the category
+    counts. A one-hot output can be built sparse instead: the whole feature
+    matrix is assembled as one CSR matrix and returned as a frame of sparse
+    columns, which only stores the nonzero cells.
+
+    Dense results and metadata match the per-column scikit-learn
+    implementation (SimpleImputer, StandardScaler/MinMaxScaler,
+    OneHotEncoder/LabelEncoder) that ``DataProcessor.preprocess_data`` used
+    before.
+    """
+
+    def __init__(
+        self,
+        categorical_columns: List[str],
+        numeric_columns: List[str],
+        impute_strategy: str = "mean",
+        scaling_method: Optional[str] = None,
+        encoding_method: str = "onehot",
+        sparse_output: Union[bool, str] = "auto",
+        target_type: Optional[str] = None
+    ):
+        """Initialize the TransformGraph.
+
+        Args:
+            categorical_columns: Columns to encode.
+            numeric_columns: Columns to impute and scale.
+            impute_strategy: Strategy for imputing missing numeric values
+                ('mean', 'median', 'most_frequent', 'constant').
+            scaling_method: Method for scaling numeric features ('standard', 'minmax', None).
+            encoding_method: Method for encoding categorical features ('auto',
+                'onehot', 'label', 'rare', 'target', 'frequency', 'hashing').
+            sparse_output: Build the output as sparse columns (True), dense
+                columns (False), or sparse when its estimated density is below
+                ``SPARSE_DENSITY_THRESHOLD`` ('auto'). Sparse outputs need all
+                non-categorical columns to be numeric.
+            target_type: Target of target encoding, 'continuous' or
+                'classification' (inferred from the target dtype if None).
+        """
+        if impute_strategy not in IMPUTE_STRATEGIES:
+            raise ValueError(f"Unsupported imputation strategy: {impute_strategy}")
+        if scaling_method is not None and scaling_method not in SCALING_METHODS:
+            raise ValueError(f"Unsupported scaling method: {scaling_method}")
+        if encoding_method not in ENCODING_METHODS:
+            raise ValueError(f"Unsupported encoding method: {encoding_method}")
+        if sparse_output not in SPARSE_OUTPUTS:
+            raise ValueError(f"Unsupported sparse output setting: {sparse_output}")
+
+        self.categorical_columns = list(categorical_columns)
+        self.numeric_columns = list(numeric_columns)
+        self.impute_strategy = impute_strategy
+        self.scaling_method = scaling_method
+        self.encoding_method = encoding_method
+        self.sparse_output = sparse_output
+        self.target_type = target_type
+
+        # Fitted state
+        self.fill_values: Optional[np.ndarray] = None
+        self.offset: Optional[np.ndarray] = None
+        self.scale: Optional[np.ndarray] = None
+        self.categorical_fill: Dict[str, Any] = {}
+        self.categories: Dict[str, pd.Index] = {}
+        self.encodings: Dict[str, str] = {}
+        self.encoding_stats: Dict[str, Dict[str, Any]] = {}
+        self.rare_levels: Dict[str, pd.Index] = {}
+        self.level_values: Dict[str, np.ndarray] = {}
+        self.level_defaults: Dict[str, float] = {}
+        self.hash_features = 0
+        self.feature_names: List[str] = []
+        self.sparse = False
+        self.output_estimate: Optional[Dict[str, Any]] = None
+        self._scaler_params: List[Dict[str, Optional[float]]] = []
+
+    def fit(self, X: pd.DataFrame, y: Optional[pd.Series] = None) -> "TransformGraph":
+        """Fit the imputation, scaling and encoding parameters.
+
+        Args:
+            X: Feature frame.
+            y: Target, needed for target encoding.
+
+        Returns:
+            The fitted graph.
+        """
+        self._fit_transform(X, y, fit=True)
+        return self
+
+    def transform(self, X: pd.DataFrame) -> pd.DataFrame:
+        """Apply the fitted graph to a feature frame.
+
+        Categories unseen during fitting are encoded as all-zero one-hot
+        rows, label -1, the rare level, the prior target mean or frequency 0;
+        target encodings use the means fitted on all rows.
+
+        Args:
+            X: Feature frame with the fitted columns.
+
+        Returns:
+            Preprocessed frame.
+        """
+        if self.output_estimate is None:
+            raise ValueError("TransformGraph is not fitted")
+        return self._fit_transform(X, None, fit=False)
+
+    def fit_transform(self, X: pd.DataFrame, y: Optional[pd.Series] = None) -> pd.DataFrame:
+        """Fit the graph and apply it to the same frame.
+
+        Target encodings of the fitted frame are cross-fitted (out-of-fold).
+
+        Args:
+            X: Feature frame.
+            y: Target, needed for target encoding.
+
+        Returns:
+            Preprocessed frame.
+        """
+        return self._fit_transform(X, y, fit=True)
+
+    def _fit_transform(self, X: pd.DataFrame, y: Optional[pd.Series], fit: bool) -> pd.DataFrame:
+        """Run both branches of the graph and assemble the output frame."""
+        try:
+            replaced: Dict[str, Any] = {}
+
+            # Numeric branch: one float block, imputed and scaled at once
+            if self.numeric_columns:
+                values = X[self.numeric_columns].to_numpy(dtype=float, na_value=np.nan)
+                missing = np.isnan(values)
+                if fit:
+                    self._fit_numeric(X, values, missing)
+
+                imputed = ~np.isnan(self.fill_values)
+                fill = missing & imputed
+                if fill.any():
+                    values = np.where(fill, self.fill_values, values)
+
+                if self.scaling_method:
+                    values = (values - self.offset) * self.scale
+                    modified = range(len(self.numeric_columns))
+                else:
+                    modified = np.flatnonzero(imputed)
+                for i in modified:
+                    replaced[self.numeric_columns[i]] = values[:, i]
+
+            # Categorical branch: integer codes per column
+            if fit:
+                self._plan_encodings(X, y)
+            onehot_blocks, hashed = [], []
+            for col in self.categorical_columns:
+                encoding = self.encodings[col]
+                if encoding == "hashing":
+                    hashed.append((col, self._hashing_values(col, X[col], fit)))
+                    continue
+
+                series = X[col]
+                if encoding == "rare":
+                    series = self._bucket_rare(col, series, fit)
+                if fit:
+                    codes = self._fit_categorical(col, series)
+                else:
+                    codes = self._category_codes(col, series)
+
+                if encoding == "label":
+                    replaced[col] = codes
+                elif encoding in ("target", "frequency"):
+                    replaced[col] = self._level_encoding(col, codes, y, fit)
+                else:
+                    onehot_blocks.append((col, codes))
+
+            # Join: untouched columns keep their position and dtype, encoded
+            # one-hot blocks and the hashed block are appended in column order
+            dropped = {col for col, encoding in self.encodings.items() if encoding in ("onehot", "rare", "hashing")}
+            output = pd.DataFrame(
+                {col: replaced.get(col, X[col]) for col in X.columns if col not in dropped},
+                index=X.index
+            )
+
+            names = [
+                f"{col}_{category}"
+                for col, _ in onehot_blocks for category in self.categories[col]
+            ]
+            if hashed:
+                names += [f"hashed_{i}" for i in range(self.hash_features)]
+            if fit:
+                self.sparse = self._choose_output(output, len(names), len(onehot_blocks) + len(hashed))
+
+            rows, columns, data = self._encoded_entries(onehot_blocks, hashed)
+            if self.sparse:
+                output = self._sparse_output(output, rows, columns, data, names)
+            elif names:
+                encoded = np.zeros((len(X), len(names)))
+                if hashed:
+                    # Hashed columns of a row may collide in one bucket
+                    np.add.at(encoded, (rows, columns), data)
+                else:
+                    encoded[rows, columns] = data
+                encoded = pd.DataFrame(encoded, columns=names, index=X.index, copy=False)
+                output = pd.concat([output, encoded], axis=1, copy=False)
+
+            if fit:
+                self.feature_names = list(output.columns)
+            return output
+        except Exception as e:
+            logger.error(f"Error applying transform graph: {str(e)}")
+            raise
+
+    def _plan_encodings(self, X: pd.DataFrame, y: Optional[pd.Series]) -> None:
+        """Pick the encoding of every categorical column."""
+        self.encodings, self.encoding_stats = {}, {}
+        if self.encoding_method in ("onehot", "label"):
+            self.encodings = {col: self.encoding_method for col in self.categorical_columns}
+            return
+
+        from .encoders import column_stats, choose_encoding, ENCODING_HASH_FEATURES
+
+        if self.encoding_method == "target" and y is None:
+            raise ValueError("Target encoding needs a target column")
+        self.hash_features = ENCODING_HASH_FEATURES
+        for col in self.categorical_columns:
+            if self.encoding_method == "auto":
+                self.encoding_stats[col] = column_stats(X[col])
+                self.encodings[col] = choose_encoding(self.encoding_stats[col], has_target=y is not None)
+            else:
+                self.encodings[col] = self.encoding_method
+
+    def _bucket_rare(self, col: str, series: pd.Series, fit: bool) -> pd.Series:
+        """Replace the levels outside the most frequent ones by the rare level."""
+        from .encoders import frequent_levels, bucket_rare
+
+        if fit:
+            self.rare_levels[col] = frequent_levels(series)
+        return bucket_rare(series, self.rare_levels[col])
+
+    def _hashing_values(self, col: str, series: pd.Series, fit: bool) -> Any:
+        """Filled values of a hashed column (its levels are not stored)."""
+        if fit and series.isna().any():
+            self.categorical_fill[col] = _most_frequent(series)
+        if col in self.categorical_fill:
+            series = series.fillna(self.categorical_fill[col])
+        return series.to_numpy(dtype=object)
+
+    def _level_encoding(self, col: str, codes: np.ndarray, y: Optional[pd.Series], fit: bool) -> np.ndarray:
+        """Target or frequency encoding of a column's level codes.
+
+        When fitting, target encodings are cross-fitted; a target that cannot
+        be encoded (multiclass) switches the column to frequency encoding.
+        """
+        from .encoders import target_vector, cross_fit_target
+
+        n_levels = len(self.categories[col])
+        if fit and self.encodings[col] == "target":
+            target_type = self.target_type or (
+                "continuous" if pd.api.types.is_numeric_dtype(y) else "classification"
+            )
+            target = target_vector(y, target_type)
+            if target is None:
+                self.encodings[col] = "frequency"
+            else:
+                encoded, self.level_values[col], self.level_defaults[col] = cross_fit_target(
+                    codes, target, n_levels
+                )
+                return encoded
+        if fit:
+            self.level_values[col] = np.bincount(codes, minlength=n_levels) / max(len(codes), 1)
+            self.level_defaults[col] = 0.0
+        values = self.level_values[col]
+        return np.where(codes >= 0, values[np.maximum(codes, 0)], self.level_defaults[col])
+
+    def _encoded_entries(self, onehot_blocks: List[Any], hashed: List[Any]) -> Any:
+        """Row, column and value of every nonzero of the encoded block."""
+        from .encoders import hash_values
+
+        row_index, column_index, data = [], [], []
+        start = 0
+        for col, codes in onehot_blocks:
+            known = np.flatnonzero(codes >= 0)
+            row_index.append(known)
+            column_index.append(start + codes[known])
+            data.append(np.ones(len(known)))
+            start += len(self.categories[col])
+        for col, values in hashed:
+            buckets, signs = hash_values(values, col, self.hash_features)
+            row_index.append(np.arange(len(values)))
+            column_index.append(start + buckets)
+            data.append(signs)
+        if not row_index:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0)
+        return np.concatenate(row_index), np.concatenate(column_index), np.concatenate(data)
+
+    def _choose_output(self, output: pd.DataFrame, encoded_columns: int, encoded_inputs: int) -> bool:
+        """Estimate the size of the output and decide whether to build it sparse.
+
+        Every row has at most one nonzero per kept column and per one-hot
+        encoded or hashed input column, which bounds the number of nonzero
+        cells.
+        """
+        rows = len(output)
+        estimate = estimate_output_size(
+            rows, output.shape[1] + encoded_columns, rows * (output.shape[1] + encoded_inputs)
+        )
+        sparse = use_sparse(estimate, self.sparse_output)
+
+        non_numeric = [col for col, dtype in output.dtypes.items() if not pd.api.types.is_numeric_dtype(dtype)]
+        if sparse and non_numeric:
+            if self.sparse_output is True:
+                raise ValueError(f"Sparse output needs numeric columns, got: {non_numeric}")
+            sparse = False
+
+        estimate["format"] = "sparse" if sparse else "dense"
+        self.output_estimate = estimate
+        logger.info(
+            f"Preprocessed matrix: {estimate['rows']} x {estimate['columns']}, {estimate['format']}, "
+            f"about {estimate[estimate['format'] + '_bytes'] / 2 ** 20:.1f} MiB "
+            f"(density {estimate['density']:.4f})"
+        )
+        return sparse
+
+    def _sparse_output(
+        self,
+        output: pd.DataFrame,
+        rows: np.ndarray,
+        columns: np.ndarray,
+        data: np.ndarray,
+        names: List[str]
+    ) -> pd.DataFrame:
+        """Assemble the kept columns and the encoded block as one CSR matrix."""
+        from scipy import sparse
+
+        # Duplicate entries (hash collisions within a row) are summed
+        encoded = sparse.csr_matrix((data, (rows, columns)), shape=(len(output), len(names)))
+
+        kept = sparse.csr_matrix(output.to_numpy(dtype=float, na_value=np.nan))
+        matrix = sparse.hstack([kept, encoded], format="csr")
+        return pd.DataFrame.sparse.from_spmatrix(matrix, index=output.index, columns=list(output.columns) + names)
+
+    def _fit_numeric(self, X: pd.DataFrame, values: np.ndarray, missing: np.ndarray) -> None:
+        """Fit the fill values (NaN for columns without missing values) and the scaling."""
+        needs_fill = missing.any(axis=0)
+        self.fill_values = np.full(values.shape[1], np.nan)
+        if needs_fill.any():
+            with np.errstate(invalid="ignore"):
+                if self.impute_strategy == "mean":
+                    statistics = np.nanmean(values[:, needs_fill], axis=0)
+                elif self.impute_strategy == "median":
+                    statistics = np.nanmedian(values[:, needs_fill], axis=0)
+                elif self.impute_strategy == "most_frequent":
+                    statistics = np.array([
+                        _most_frequent(X[col]) for col in np.array(self.numeric_columns, dtype=object)[needs_fill]
+                    ], dtype=float)
+                else:
+                    statistics = np.zeros(needs_fill.sum())
+            self.fill_values[needs_fill] = statistics
+
+        self._scaler_params = []
+        if not self.scaling_method:
+            return
+        filled = np.where(missing & ~np.isnan(self.fill_values), self.fill_values, values)
+        if self.scaling_method == "standard":
+            mean = filled.mean(axis=0)
+            scale = _handle_zeros_in_scale(filled.std(axis=0))
+            self.offset, self.scale = mean, 1.0 / scale
+            self._scaler_params = [
+                {"mean": float(m), "scale": float(s), "min": None, "max": None}
+                for m, s in zip(mean, scale)
+            ]
+        else:
+            data_min, data_max = filled.min(axis=0), filled.max(axis=0)
+            scale = 1.0 / _handle_zeros_in_scale(data_max - data_min)
+            self.offset, self.scale = data_min, scale
+            self._scaler_params = [
+                {"mean": None, "scale": float(s), "min": float(lo), "max": float(hi)}
+                for s, lo, hi in zip(scale, data_min, data_max)
+            ]
+
+    def _fit_categorical(self, col: str, series: pd.Series) -> np.ndarray:
+        """Fit the fill value and the sorted categories of a categorical column.
+
+        Returns:
+            Codes of the fitted column, from a single factorization.
+        """
+        codes, categories = pd.factorize(series, sort=True)
+        missing = codes < 0
+        if missing.any():
+            # Categories are sorted, so argmax picks the smallest of tied values
+            fill_code = int(np.argmax(np.bincount(codes[~missing], minlength=len(categories))))
+            self.categorical_fill[col] = categories[fill_code]
+            codes[missing] = fill_code
+        self.categories[col] = pd.Index(categories)
+        return codes.astype(np.int64)
+
+    def _category_codes(self, col: str, series: pd.Series) -> np.ndarray:
+        """Codes of a column in the fitted categories (-1 for unseen values)."""
+        codes = pd.Categorical(series, categories=self.categories[col]).codes.astype(np.int64)
+        if col in self.categorical_fill:
+            missing = series.isna().to_numpy()
+            codes[missing] = self.categories[col].get_loc(self.categorical_fill[col])
+        return codes
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        """Preprocessing metadata, in the format of ``DataProcessor.preprocess_data``."""
+        metadata = {
+            "imputers": {},
+            "scalers": {},
+            "encoders": {},
+            "feature_names": list(self.feature_names),
+            "output": dict(self.output_estimate) if self.output_estimate else None
+        }
+        if self.fill_values is not None:
+            for col, value in zip(self.numeric_columns, self.fill_values):
+                if not np.isnan(value):
+                    metadata["imputers"][col] = {"strategy": self.impute_strategy, "statistics": float(value)}
+        for col, value in self.categorical_fill.items():
+            metadata["imputers"][col] = {"strategy": "most_frequent", "statistics": str(value)}
+        for col, params in zip(self.numeric_columns, self._scaler_params):
+            metadata["scalers"][col] = {"method": self.scaling_method, "params": params}
+        for col in self.categorical_columns:
+            encoding = self.encodings.get(col, self.encoding_method)
+            categories = [str(category) for category in self.categories.get(col, [])]
+            if encoding in ("onehot", "rare"):
+                encoder = {"method": encoding, "categories": categories}
+            elif encoding == "label":
+                encoder = {"method": "label", "classes": categories}
+            elif encoding == "hashing":
+                encoder = {"method": "hashing", "n_features": self.hash_features}
+            else:
+                encoder = {"method": encoding, "levels": len(categories)}
+                if encoding == "target":
+                    encoder["prior"] = float(self.level_defaults[col])
+            # Profile statistics the encoding was picked from
+            encoder.update(self.encoding_stats.get(col, {}))
+            metadata["encoders"][col] = encoder
+        return metadata
@@ -1,3 +1,5 @@
 from .automated_eda import automated_eda
+from .report_cache import eda_report_cache
+from .report_stream import eda_stream_manager
 
-__all__ = ["automated_eda"]
+__all__ = ["automated_eda", "eda_report_cache", "eda_stream_manager"]
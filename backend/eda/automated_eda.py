@@ -1,65 +1,260 @@
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-import plotly.express as px
-import plotly.graph_objects as go
-import plotly.io as pio
+import os
 import json
-import base64
-import io
+import time
 import logging
-from typing import Dict, List, Any, Optional, Tuple, Union
-from scipy import stats
+from functools import partial
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Any, Callable, Iterator, Optional, Tuple, Union
+
+from data_processing.correlation import correlation_engine
+from data_processing.data_processor import summarize_numeric_block
+from .plot_data import (
+    column_distribution, grouped_box_data, scatter_data,
+    histogram_figure, bar_figure, grouped_box_figure, scatter_figure, heatmap_figure
+)
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Version of the report format; bump it whenever the content of generated
+# reports changes so that cached reports are recomputed
+EDA_VERSION = "8"
+
+# Threads the sections of a report are computed on. Sections share the
+# DataFrame read-only, so threads avoid copying it into other processes.
+# CPU pool workers use fewer (see runtime.tasks.init_worker), since several
+# of them compute reports at once.
+EDA_WORKERS = int(os.environ.get("EDA_WORKERS", min(8, os.cpu_count() or 1)))
+
+# Numeric columns analyzed together by one vectorized task
+NUMERIC_BLOCK_COLUMNS = 64
+# Rows sampled (once, for all columns) for the normality tests
+NORMALITY_SAMPLE_SIZE = 5000
+
+# Figures served by AutomatedEDA.plot, mapped to whether they are drawn
+# against a target column
+PLOT_KINDS = {
+    "histogram": False,
+    "bar": False,
+    "value_counts": False,
+    "heatmap": False,
+    "scatter": True,
+    "box": True
+}
+
 class AutomatedEDA:
     """Automated Exploratory Data Analysis class."""
     
-    def __init__(self):
-        """Initialize the AutomatedEDA."""
-        # Set default plot style
-        sns.set(style="whitegrid")
-        plt.rcParams["figure.figsize"] = (10, 6)
-        
-        # Set plotly renderer
-        pio.renderers.default = "json"
+    def __init__(self, max_workers: int = EDA_WORKERS):
+        """Initialize the AutomatedEDA.
+
+        Args:
+            max_workers: Number of threads used to compute a report.
+        """
+        self.max_workers = max_workers
     
-    def generate_eda_report(self, df: pd.DataFrame, target_column: Optional[str] = None) -> Dict[str, Any]:
+    def generate_eda_report(
+        self,
+        df: pd.DataFrame,
+        target_column: Optional[str] = None,
+        on_event: Optional[Callable[[Dict[str, Any]], None]] = None
+    ) -> Dict[str, Any]:
         """Generate a comprehensive EDA report.
         
         Args:
             df: Input DataFrame.
             target_column: Name of the target column (if any).
+            on_event: Optional callback receiving every event of
+                ``iter_eda_report`` as the report is built.
             
         Returns:
             Dictionary containing EDA results and visualizations.
         """
         try:
-            # Initialize report
-            report = {
-                "dataset_info": self._get_dataset_info(df),
-                "missing_values": self._analyze_missing_values(df),
-                "numeric_analysis": self._analyze_numeric_columns(df),
-                "categorical_analysis": self._analyze_categorical_columns(df),
-                "correlation_analysis": self._analyze_correlations(df),
-                "visualizations": {}
-            }
-            
-            # Add target-specific analysis if target column is provided
-            if target_column:
-                report["target_analysis"] = self._analyze_target(df, target_column)
-            
-            # Generate visualizations
-            report["visualizations"] = self._generate_visualizations(df, target_column)
+            report = self._empty_report(target_column)
+            for event in self._iter_events(df, target_column, report):
+                if on_event is not None:
+                    on_event(event)
             
             return report
         except Exception as e:
             logger.error(f"Error generating EDA report: {str(e)}")
             raise
+
+    def iter_eda_report(self, df: pd.DataFrame, target_column: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """Generate an EDA report progressively.
+        
+        Sections are yielded as soon as all of their tasks have finished, in
+        completion order, and the report metadata comes last. Each event is
+        ``{"path": [...], "data": ...}``, where ``path`` is the location of
+        ``data`` in the report (e.g. ``["numeric_analysis"]``), so a report
+        is rebuilt by assigning every event's data at its path.
+        
+        Args:
+            df: Input DataFrame.
+            target_column: Name of the target column (if any).
+            
+        Yields:
+            Report events.
+        """
+        return self._iter_events(df, target_column, self._empty_report(target_column))
+
+    def _iter_events(
+        self,
+        df: pd.DataFrame,
+        target_column: Optional[str],
+        report: Dict[str, Any]
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield the events of ``iter_eda_report`` while filling ``report``.
+
+        Unlike the events, the report is assembled in plan order, so its
+        layout does not depend on task completion order.
+        """
+        started_at = time.perf_counter()
+        section_spans: Dict[str, List[float]] = {}
+
+        def record(path: Tuple, task_start: float, task_end: float) -> None:
+            span = section_spans.setdefault(path[0], [task_start, task_end])
+            span[0] = min(span[0], task_start)
+            span[1] = max(span[1], task_end)
+
+        # Analysis sections: a section is complete once all of its tasks are
+        plan = self._build_plan(df, target_column)
+        remaining = Counter(path[0] for path, _ in plan)
+        results: Dict[int, Any] = {}
+        for index, task_start, task_end, value in self._iter_plan(plan):
+            path = plan[index][0]
+            results[index] = value
+            record(path, task_start, task_end)
+            remaining[path[0]] -= 1
+            if remaining[path[0]] == 0:
+                # Assemble in plan order so the section layout is deterministic
+                for task_index, (task_path, _) in enumerate(plan):
+                    if task_path[0] == path[0]:
+                        self._assign(report, task_path, results.pop(task_index))
+                yield {"path": [path[0]], "data": report[path[0]]}
+
+        report["metadata"] = {
+            "eda_version": EDA_VERSION,
+            "workers": self.max_workers,
+            "task_count": len(plan),
+            "section_timings": {
+                section: round(end - start, 4) for section, (start, end) in section_spans.items()
+            },
+            "total_seconds": round(time.perf_counter() - started_at, 4)
+        }
+        yield {"path": ["metadata"], "data": report["metadata"]}
+
+    def _empty_report(self, target_column: Optional[str] = None) -> Dict[str, Any]:
+        """Get a report with every section empty, in report order."""
+        report = {
+            "dataset_info": None,
+            "missing_values": None,
+            "numeric_analysis": {},
+            "categorical_analysis": {},
+            "correlation_analysis": None,
+            "histograms": {},
+            "visualizations": None
+        }
+        if target_column:
+            report["target_analysis"] = None
+        return report
+
+    def _build_plan(self, df: pd.DataFrame, target_column: Optional[str] = None) -> List[Tuple[Tuple, Callable[[], Any]]]:
+        """Build the execution plan of a report.
+
+        Every task is independent of the others and only reads the
+        DataFrame. Numeric columns are analyzed in vectorized blocks of
+        NUMERIC_BLOCK_COLUMNS columns; other per-column work is split into
+        one task per column.
+
+        Args:
+            df: Input DataFrame.
+            target_column: Name of the target column (if any).
+
+        Returns:
+            List of ``(path, task)`` pairs, where ``path`` is the location of
+            the task's result in the report.
+        """
+        numeric_cols = df.select_dtypes(include=np.number).columns
+        cat_cols = df.select_dtypes(include=["object", "category"]).columns
+
+        plan = [
+            (("dataset_info",), partial(self._get_dataset_info, df)),
+            (("missing_values",), partial(self._analyze_missing_values, df)),
+        ]
+        sample_index = self._normality_sample_index(len(df))
+        plan += [
+            (
+                ("numeric_analysis", None),
+                partial(self._analyze_numeric_columns, df, list(numeric_cols[start:start + NUMERIC_BLOCK_COLUMNS]), sample_index)
+            )
+            for start in range(0, len(numeric_cols), NUMERIC_BLOCK_COLUMNS)
+        ]
+        plan += [
+            (("categorical_analysis", col), partial(self._analyze_categorical_column, df, col))
+            for col in cat_cols
+        ]
+        plan.append((("correlation_analysis",), partial(self._analyze_correlations, df)))
+        plan += [
+            (("histograms", col), partial(column_distribution, df[col]))
+            for col in numeric_cols
+        ]
+        plan.append((("visualizations",), partial(self._describe_visualizations, df, target_column)))
+        if target_column:
+            plan.append((("target_analysis",), partial(self._analyze_target, df, target_column)))
+
+        return plan
+
+    def _iter_plan(self, plan: List[Tuple[Tuple, Callable[[], Any]]]) -> Iterator[Tuple[int, float, float, Any]]:
+        """Run the tasks of a plan on the worker threads.
+
+        Args:
+            plan: Plan built by ``_build_plan``.
+
+        Yields:
+            ``(index, started_at, finished_at, result)`` of every task, in
+            completion order.
+        """
+        def timed(task: Callable[[], Any]) -> Tuple[float, float, Any]:
+            task_start = time.perf_counter()
+            value = task()
+            return task_start, time.perf_counter(), value
+
+        if self.max_workers <= 1:
+            for index, (_, task) in enumerate(plan):
+                yield (index,) + timed(task)
+            return
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="eda-worker") as pool:
+            futures = {pool.submit(timed, task): index for index, (_, task) in enumerate(plan)}
+            for future in as_completed(futures):
+                yield (futures[future],) + future.result()
+
+    @staticmethod
+    def _assign(report: Dict[str, Any], path: Tuple, value: Any) -> None:
+        """Store a task result at its location in the report.
+
+        A path ending in None merges the result (a dictionary) into the
+        section instead, for tasks that analyze a block of columns.
+        """
+        if path[-1] is None:
+            container = report
+            for key in path[:-1]:
+                container = container[key]
+            container.update(value)
+            return
+        if len(path) == 1:
+            report[path[0]] = value
+            return
+        container = report
+        for key in path[:-1]:
+            container = container[key]
+        container[path[-1]] = value
     
     def _get_dataset_info(self, df: pd.DataFrame) -> Dict[str, Any]:
         """Get basic information about the dataset.
@@ -109,65 +304,96 @@ class AutomatedEDA:
         
         return missing
     
-    def _analyze_numeric_columns(self, df: pd.DataFrame) -> Dict[str, Dict[str, Any]]:
+    @staticmethod
+    def _normality_sample_index(row_count: int) -> Optional[np.ndarray]:
+        """Pick the rows shared by the normality tests of all columns (None for all rows)."""
+        if row_count <= NORMALITY_SAMPLE_SIZE:
+            return None
+        rng = np.random.default_rng(42)
+        return np.sort(rng.choice(row_count, NORMALITY_SAMPLE_SIZE, replace=False))
+
+    def _analyze_numeric_columns(
+        self,
+        df: pd.DataFrame,
+        columns: Optional[List[str]] = None,
+        sample_index: Optional[np.ndarray] = None
+    ) -> Dict[str, Dict[str, Any]]:
         """Analyze numeric columns in the dataset.
         
+        All statistics are computed for the whole block of columns at once:
+        one sort gives the quartiles, one broadcast comparison counts the
+        IQR outliers, and the normality tests share a single row sample.
+        
         Args:
             df: Input DataFrame.
+            columns: Numeric columns to analyze (all numeric columns if None).
+            sample_index: Rows used for the normality tests (drawn here if None).
             
         Returns:
             Dictionary containing numeric column analysis.
         """
-        numeric_analysis = {}
+        from scipy import stats
         
         # Get numeric columns
-        numeric_cols = df.select_dtypes(include=np.number).columns
+        if columns is None:
+            columns = list(df.select_dtypes(include=np.number).columns)
+        if not columns:
+            return {}
+        if sample_index is None:
+            sample_index = self._normality_sample_index(len(df))
         
-        for col in numeric_cols:
-            stats = df[col].describe().to_dict()
-            
-            # Add additional statistics
-            stats["skewness"] = float(df[col].skew())
-            stats["kurtosis"] = float(df[col].kurtosis())
-            
-            # Check for outliers using IQR method
-            q1 = stats["25%"]
-            q3 = stats["75%"]
-            iqr = q3 - q1
-            lower_bound = q1 - 1.5 * iqr
-            upper_bound = q3 + 1.5 * iqr
-            outliers = df[(df[col] < lower_bound) | (df[col] > upper_bound)][col]
-            
-            stats["outliers"] = {
-                "count": len(outliers),
-                "percentage": float(len(outliers) / len(df) * 100),
-                "lower_bound": float(lower_bound),
-                "upper_bound": float(upper_bound)
+        values = df[columns].to_numpy(dtype=float, na_value=np.nan)
+        summary = summarize_numeric_block(values, quantiles=[0.25, 0.5, 0.75], moments=True)
+        q1, median, q3 = summary["quantiles"]
+        
+        # Check for outliers using IQR method, for all columns in one comparison
+        iqr = q3 - q1
+        lower_bounds = q1 - 1.5 * iqr
+        upper_bounds = q3 + 1.5 * iqr
+        with np.errstate(invalid="ignore"):
+            outlier_counts = ((values < lower_bounds) | (values > upper_bounds)).sum(axis=0)
+        
+        # Check for normality using Shapiro-Wilk test on the shared sample
+        sample = values if sample_index is None else values[sample_index]
+        
+        numeric_analysis = {}
+        for i, col in enumerate(columns):
+            column_stats = {
+                "count": float(summary["count"][i]),
+                "mean": float(summary["mean"][i]),
+                "std": float(summary["std"][i]),
+                "min": float(summary["min"][i]),
+                "25%": float(q1[i]),
+                "50%": float(median[i]),
+                "75%": float(q3[i]),
+                "max": float(summary["max"][i]),
+                "skewness": float(summary["skewness"][i]),
+                "kurtosis": float(summary["kurtosis"][i]),
+                "outliers": {
+                    "count": int(outlier_counts[i]),
+                    "percentage": float(outlier_counts[i] / len(df) * 100),
+                    "lower_bound": float(lower_bounds[i]),
+                    "upper_bound": float(upper_bounds[i])
+                },
+                "normality_test": None
             }
             
-            # Check for normality using Shapiro-Wilk test
-            # Only use a sample if the dataset is large
-            if len(df) > 5000:
-                sample = df[col].dropna().sample(5000, random_state=42)
-            else:
-                sample = df[col].dropna()
-            
-            if len(sample) > 3:  # Shapiro-Wilk test requires at least 3 samples
+            column_sample = sample[:, i]
+            column_sample = column_sample[~np.isnan(column_sample)]
+            if len(column_sample) > 3:  # Shapiro-Wilk test requires at least 3 samples
                 try:
-                    shapiro_test = stats.shapiro(sample)
-                    stats["normality_test"] = {
+                    shapiro_test = stats.shapiro(column_sample)
+                    column_stats["normality_test"] = {
                         "test": "shapiro",
                         "statistic": float(shapiro_test[0]),
                         "p_value": float(shapiro_test[1]),
                         "is_normal": float(shapiro_test[1]) > 0.05
                     }
-                except:
+                except Exception:
                     # If Shapiro-Wilk test fails, skip normality test
-                    stats["normality_test"] = None
-            else:
-                stats["normality_test"] = None
+                    pass
             
-            numeric_analysis[col] = stats
+            numeric_analysis[col] = column_stats
         
         return numeric_analysis
     
@@ -180,71 +406,67 @@ class AutomatedEDA:
         Returns:
             Dictionary containing categorical column analysis.
         """
-        categorical_analysis = {}
-        
         # Get categorical columns
         cat_cols = df.select_dtypes(include=["object", "category"]).columns
+
+        return {col: self._analyze_categorical_column(df, col) for col in cat_cols}
+
+    def _analyze_categorical_column(self, df: pd.DataFrame, col: str) -> Dict[str, Any]:
+        """Analyze a categorical column.
+
+        Args:
+            df: Input DataFrame.
+            col: Name of the column.
+
+        Returns:
+            Dictionary containing the column analysis.
+        """
+        from scipy import stats
         
-        for col in cat_cols:
-            value_counts = df[col].value_counts()
-            
-            analysis = {
-                "unique_count": int(df[col].nunique()),
-                "top_values": value_counts.head(10).to_dict(),
-                "entropy": float(stats.entropy(value_counts.values) if len(value_counts) > 0 else 0),
-                "is_binary": df[col].nunique() == 2
-            }
-            
-            # If binary, identify the two values
-            if analysis["is_binary"]:
-                analysis["binary_values"] = list(df[col].dropna().unique())
-            
-            categorical_analysis[col] = analysis
+        value_counts = df[col].value_counts()
+        
+        analysis = {
+            "unique_count": int(df[col].nunique()),
+            "top_values": value_counts.head(10).to_dict(),
+            "entropy": float(stats.entropy(value_counts.values) if len(value_counts) > 0 else 0),
+            "is_binary": df[col].nunique() == 2
+        }
+        
+        # If binary, identify the two values
+        if analysis["is_binary"]:
+            analysis["binary_values"] = list(df[col].dropna().unique())
         
-        return categorical_analysis
+        return analysis
     
     def _analyze_correlations(self, df: pd.DataFrame) -> Dict[str, Any]:
         """Analyze correlations between columns.
         
+        Pearson and Spearman matrices are returned in compact form
+        (``{"columns": [...], "matrix": [[...]]}``) when there are at most
+        CORRELATION_MATRIX_MAX_COLUMNS numeric columns, and are None for
+        wider data; the strongest pairs are always returned.
+        
         Args:
             df: Input DataFrame.
             
         Returns:
             Dictionary containing correlation analysis.
         """
-        correlation_analysis = {
-            "pearson": {},
-            "spearman": {},
-            "highly_correlated_pairs": []
-        }
-        
         # Get numeric columns
         numeric_cols = df.select_dtypes(include=np.number).columns
         
-        if len(numeric_cols) > 1:
-            # Calculate Pearson correlation
-            pearson_corr = df[numeric_cols].corr(method="pearson").round(3)
-            correlation_analysis["pearson"] = pearson_corr.to_dict()
-            
-            # Calculate Spearman correlation
-            spearman_corr = df[numeric_cols].corr(method="spearman").round(3)
-            correlation_analysis["spearman"] = spearman_corr.to_dict()
-            
-            # Find highly correlated pairs
-            corr_matrix = pearson_corr.abs()
-            upper_tri = corr_matrix.where(np.triu(np.ones(corr_matrix.shape), k=1).astype(bool))
-            
-            for col1 in upper_tri.columns:
-                for col2 in upper_tri.index:
-                    corr_value = upper_tri.loc[col2, col1]
-                    if not pd.isna(corr_value) and corr_value > 0.7:
-                        correlation_analysis["highly_correlated_pairs"].append({
-                            "column1": col1,
-                            "column2": col2,
-                            "correlation": float(corr_value)
-                        })
-        
-        return correlation_analysis
+        if len(numeric_cols) < 2:
+            return {
+                "columns": list(numeric_cols),
+                "matrix_included": False,
+                "pearson": None,
+                "spearman": None,
+                "highly_correlated_pairs": [],
+                "highly_correlated_pair_count": 0,
+                "top_pairs": []
+            }
+        
+        return correlation_engine.analyze(df[numeric_cols], threshold=0.7)
     
     def _analyze_target(self, df: pd.DataFrame, target_column: str) -> Dict[str, Any]:
         """Analyze the target column and its relationship with other columns.
@@ -317,15 +539,19 @@ class AutomatedEDA:
         
         return target_analysis
     
-    def _generate_visualizations(self, df: pd.DataFrame, target_column: Optional[str] = None) -> Dict[str, Any]:
-        """Generate visualizations for the dataset.
+    def _describe_visualizations(self, df: pd.DataFrame, target_column: Optional[str] = None) -> Dict[str, Any]:
+        """List the figures suggested for the dataset.
+        
+        Figures are not drawn here: each one is described by its ``kind``,
+        ``column`` and, for target plots, ``target_column``, and is drawn on
+        demand by ``plot`` (served at ``/eda/{dataset_id}/plots/{kind}/{column}``).
         
         Args:
             df: Input DataFrame.
             target_column: Name of the target column (if any).
             
         Returns:
-            Dictionary containing visualizations.
+            Dictionary of plot descriptors by group and name.
         """
         visualizations = {
             "distribution_plots": {},
@@ -334,91 +560,159 @@ class AutomatedEDA:
             "target_plots": {}
         }
         
-        # Generate distribution plots for numeric columns
+        # Distribution plots for numeric columns
         numeric_cols = df.select_dtypes(include=np.number).columns
         
         for col in numeric_cols[:10]:  # Limit to first 10 columns to avoid too many plots
-            fig = px.histogram(df, x=col, marginal="box", title=f"Distribution of {col}")
-            visualizations["distribution_plots"][col] = pio.to_json(fig)
+            visualizations["distribution_plots"][col] = self._plot_descriptor("histogram", col)
         
-        # Generate correlation heatmap
+        # Correlation heatmap
         if len(numeric_cols) > 1:
-            corr_matrix = df[numeric_cols].corr()
-            fig = px.imshow(
-                corr_matrix, 
-                title="Correlation Heatmap",
-                labels=dict(color="Correlation"),
-                x=corr_matrix.columns,
-                y=corr_matrix.columns,
-                color_continuous_scale="RdBu_r"
-            )
-            visualizations["correlation_plots"]["heatmap"] = pio.to_json(fig)
+            visualizations["correlation_plots"]["heatmap"] = self._plot_descriptor("heatmap")
         
-        # Generate bar plots for categorical columns
+        # Bar plots for categorical columns
         cat_cols = df.select_dtypes(include=["object", "category"]).columns
         
         for col in cat_cols[:10]:  # Limit to first 10 columns
-            value_counts = df[col].value_counts().head(10)
-            fig = px.bar(
-                x=value_counts.index, 
-                y=value_counts.values,
-                title=f"Top 10 values for {col}",
-                labels={"x": col, "y": "Count"}
-            )
-            visualizations["categorical_plots"][col] = pio.to_json(fig)
+            visualizations["categorical_plots"][col] = self._plot_descriptor("bar", col)
         
-        # Generate target-related plots if target column is provided
+        # Target-related plots if target column is provided
         if target_column:
+            target_plots = visualizations["target_plots"]
             if target_column in numeric_cols:
                 # Target is numeric
+                target_plots["distribution"] = self._plot_descriptor("histogram", target_column)
                 
-                # Histogram of target
-                fig = px.histogram(
-                    df, 
-                    x=target_column,
-                    title=f"Distribution of {target_column}",
-                    marginal="box"
-                )
-                visualizations["target_plots"]["distribution"] = pio.to_json(fig)
-                
-                # Scatter plots with top correlated features
-                corr_with_target = df[numeric_cols].corr()[target_column].abs().sort_values(ascending=False)
-                top_features = corr_with_target.index[1:4]  # Top 3 features excluding target itself
+                # Scatter plots with the top 3 features correlated with the target
+                other_cols = [col for col in numeric_cols if col != target_column]
+                corr_with_target = df[other_cols].corrwith(df[target_column]).abs().sort_values(ascending=False)
                 
-                for feature in top_features:
-                    fig = px.scatter(
-                        df, 
-                        x=feature, 
-                        y=target_column,
-                        title=f"{feature} vs {target_column}",
-                        trendline="ols"
-                    )
-                    visualizations["target_plots"][f"{feature}_scatter"] = pio.to_json(fig)
+                for feature in corr_with_target.index[:3]:
+                    target_plots[f"{feature}_scatter"] = self._plot_descriptor("scatter", feature, target_column)
             
             else:
                 # Target is categorical
-                
-                # Bar plot of target distribution
-                value_counts = df[target_column].value_counts()
-                fig = px.bar(
-                    x=value_counts.index, 
-                    y=value_counts.values,
-                    title=f"Distribution of {target_column}",
-                    labels={"x": target_column, "y": "Count"}
-                )
-                visualizations["target_plots"]["distribution"] = pio.to_json(fig)
+                target_plots["distribution"] = self._plot_descriptor("value_counts", target_column)
                 
                 # Box plots for numeric features grouped by target
                 for col in numeric_cols[:3]:  # Top 3 numeric features
-                    fig = px.box(
-                        df, 
-                        x=target_column, 
-                        y=col,
-                        title=f"{col} by {target_column}"
-                    )
-                    visualizations["target_plots"][f"{col}_box"] = pio.to_json(fig)
+                    target_plots[f"{col}_box"] = self._plot_descriptor("box", col, target_column)
         
         return visualizations
 
+    @staticmethod
+    def _plot_descriptor(kind: str, column: Optional[str] = None, target_column: Optional[str] = None) -> Dict[str, Any]:
+        """Describe a figure drawn on demand by ``plot``."""
+        descriptor = {"kind": kind, "column": column}
+        if target_column is not None:
+            descriptor["target_column"] = target_column
+        return descriptor
+
+    @staticmethod
+    def _check_plot(kind: str, column: Optional[str], target_column: Optional[str]) -> None:
+        """Raise a ValueError if a figure cannot be drawn from these arguments."""
+        if kind not in PLOT_KINDS:
+            raise ValueError(f"Unknown plot kind: {kind}")
+        if kind != "heatmap" and not column:
+            raise ValueError(f"A column is required for {kind} plots")
+        if PLOT_KINDS[kind] and not target_column:
+            raise ValueError(f"A target column is required for {kind} plots")
+
+    def plot_columns(self, kind: str, column: Optional[str] = None, target_column: Optional[str] = None) -> Optional[List[str]]:
+        """Get the columns a figure is drawn from.
+        
+        Args:
+            kind: Kind of figure (a key of PLOT_KINDS).
+            column: Column the figure is drawn for.
+            target_column: Target column, for target plots.
+            
+        Returns:
+            Column names, or None if the figure needs every column.
+            
+        Raises:
+            ValueError: If the kind is unknown or a required column is missing.
+        """
+        self._check_plot(kind, column, target_column)
+        if kind == "heatmap":
+            return None
+        if PLOT_KINDS.get(kind) and target_column != column:
+            return [column, target_column]
+        return [column]
+
+    def plot(
+        self,
+        df: pd.DataFrame,
+        kind: str,
+        column: Optional[str] = None,
+        target_column: Optional[str] = None
+    ) -> str:
+        """Draw one figure of a report.
+        
+        Args:
+            df: Input DataFrame (at least the columns of ``plot_columns``).
+            kind: Kind of figure (a key of PLOT_KINDS).
+            column: Column the figure is drawn for (unused for 'heatmap').
+            target_column: Target column, required for 'scatter' and 'box'.
+            
+        Returns:
+            The figure serialized as Plotly JSON.
+            
+        Raises:
+            ValueError: If the kind is unknown or a required column is missing.
+        """
+        try:
+            self._check_plot(kind, column, target_column)
+            
+            if kind == "histogram":
+                return histogram_figure(column_distribution(df[column]), column)
+            if kind == "bar":
+                top_values = df[column].value_counts().head(10)
+                return bar_figure(top_values.index.tolist(), top_values.values.tolist(), f"Top 10 values for {column}", column)
+            if kind == "value_counts":
+                return self._plot_value_counts(df, column)
+            if kind == "heatmap":
+                return self._plot_correlation_heatmap(df)
+            if kind == "scatter":
+                return self._plot_scatter(df, column, target_column)
+            return self._plot_box_by_target(df, column, target_column)
+        except Exception as e:
+            logger.error(f"Error drawing {kind} plot: {str(e)}")
+            raise
+
+    def _plot_correlation_heatmap(self, df: pd.DataFrame) -> str:
+        """Heatmap of the Pearson correlations between numeric columns.
+
+        For data wider than CORRELATION_MATRIX_MAX_COLUMNS, only the columns
+        of the strongest pairs are shown.
+        """
+        columns = list(df.select_dtypes(include=np.number).columns)
+        matrix = correlation_engine.correlation_matrix(df[columns])
+        if len(columns) > correlation_engine.max_matrix_columns:
+            selected = []
+            for pair in correlation_engine.top_pairs(matrix, columns, top_k=correlation_engine.top_k):
+                for col in (pair["column1"], pair["column2"]):
+                    if col not in selected:
+                        selected.append(col)
+            index = [columns.index(col) for col in selected[:correlation_engine.max_matrix_columns]]
+            columns = [columns[i] for i in index]
+            matrix = matrix[np.ix_(index, index)]
+        pearson = correlation_engine.compact_matrix(matrix, columns)
+        return heatmap_figure(pearson["columns"], pearson["matrix"], "Correlation Heatmap")
+
+    def _plot_value_counts(self, df: pd.DataFrame, col: str) -> str:
+        """Bar plot of the distribution of a categorical column."""
+        value_counts = df[col].value_counts()
+        return bar_figure(value_counts.index.tolist(), value_counts.values.tolist(), f"Distribution of {col}", col)
+
+    def _plot_scatter(self, df: pd.DataFrame, feature: str, target_column: str) -> str:
+        """Scatter plot of a feature against a numeric target with an OLS trendline."""
+        data = scatter_data(df[feature], df[target_column])
+        return scatter_figure(data, feature, target_column, f"{feature} vs {target_column}")
+
+    def _plot_box_by_target(self, df: pd.DataFrame, col: str, target_column: str) -> str:
+        """Box plots of a numeric feature grouped by a categorical target."""
+        boxes = grouped_box_data(df[col], df[target_column])
+        return grouped_box_figure(boxes, col, target_column, f"{col} by {target_column}")
+
 # Create a singleton instance
 automated_eda = AutomatedEDA()
@@ -0,0 +1,455 @@
+"""Pre-aggregated plot data and the Plotly figures built from it.
+
+The helpers here reduce a column to a fixed number of values (histogram
+bins, box plot quantiles, category counts) with NumPy, so the size of a
+serialized figure depends on the number of bins or groups and not on the
+number of rows. The compact data is also returned in the EDA report for
+clients that render the plots themselves. Plotly is only imported by the
+figure builders, when the first figure is drawn.
+"""
+import os
+import logging
+from typing import TYPE_CHECKING, Dict, List, Any, Optional
+
+import numpy as np
+import pandas as pd
+
+if TYPE_CHECKING:
+    import plotly.graph_objects as go
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Upper bound on the number of histogram bins
+HISTOGRAM_MAX_BINS = int(os.environ.get("EDA_HISTOGRAM_MAX_BINS", 100))
+# Number of the most extreme outliers kept on each side of a box plot
+BOX_MAX_OUTLIERS = 50
+# Upper bound on the number of groups in a grouped box plot
+BOX_MAX_GROUPS = 20
+# Scatter plots with more points are downsampled to about this many points
+SCATTER_MAX_POINTS = int(os.environ.get("EDA_SCATTER_MAX_POINTS", 5000))
+# Cells per axis of the grid used to stratify scatter downsampling
+SCATTER_GRID_SIZE = 50
+
+def _finite_values(values: Any) -> np.ndarray:
+    """Get the finite values of a column as a float array."""
+    array = pd.Series(values).to_numpy(dtype=float, na_value=np.nan)
+    return array[np.isfinite(array)]
+
+def _auto_bin_count(finite: np.ndarray) -> int:
+    """Number of bins of NumPy's ``auto`` rule, without building its edges.
+
+    The rule takes the smaller of the Freedman-Diaconis and Sturges bin
+    widths (Sturges alone when the IQR is zero). A single far outlier can
+    make that count huge, so it is computed from the widths rather than by
+    materializing every edge.
+    """
+    span = float(finite.max() - finite.min())
+    if span == 0:
+        return 1
+    width = span / (np.log2(len(finite)) + 1.0)
+    q1, q3 = np.percentile(finite, [25, 75])
+    fd_width = 2.0 * (q3 - q1) * len(finite) ** (-1.0 / 3.0)
+    if fd_width > 0:
+        width = min(width, fd_width)
+    return max(int(np.ceil(span / width)), 1)
+
+def histogram_data(values: Any, max_bins: int = HISTOGRAM_MAX_BINS) -> Dict[str, Any]:
+    """Bin a numeric column.
+
+    The bin width follows NumPy's ``auto`` rule, capped at ``max_bins`` bins.
+
+    Args:
+        values: Column values; missing and infinite values are ignored.
+        max_bins: Maximum number of bins.
+
+    Returns:
+        Dictionary with the bin ``edges`` (one more than the bins), the
+        ``counts`` per bin and the ``count`` of binned values.
+    """
+    finite = _finite_values(values)
+    if len(finite) == 0:
+        return {"edges": [], "counts": [], "count": 0}
+
+    bins = min(_auto_bin_count(finite), max_bins)
+    counts, edges = np.histogram(finite, bins=bins, range=(float(finite.min()), float(finite.max())))
+
+    return {
+        "edges": edges.tolist(),
+        "counts": counts.tolist(),
+        "count": int(len(finite))
+    }
+
+def box_data(values: Any, max_outliers: int = BOX_MAX_OUTLIERS) -> Optional[Dict[str, Any]]:
+    """Compute the statistics of a box plot.
+
+    Whiskers follow Tukey's rule: they end at the most extreme values within
+    1.5 IQR of the quartiles, as in Plotly's own box plots.
+
+    Args:
+        values: Column values; missing and infinite values are ignored.
+        max_outliers: Number of the most extreme outliers kept on each side.
+
+    Returns:
+        Dictionary with quartiles, fences, mean and outliers, or None if the
+        column has no finite values.
+    """
+    finite = _finite_values(values)
+    if len(finite) == 0:
+        return None
+
+    q1, median, q3 = np.quantile(finite, [0.25, 0.5, 0.75])
+    iqr = q3 - q1
+    inside = finite[(finite >= q1 - 1.5 * iqr) & (finite <= q3 + 1.5 * iqr)]
+    low = finite[finite < q1 - 1.5 * iqr]
+    high = finite[finite > q3 + 1.5 * iqr]
+
+    # Keep only the most extreme outliers of each side
+    if len(low) > max_outliers:
+        low = np.partition(low, max_outliers - 1)[:max_outliers]
+    if len(high) > max_outliers:
+        high = np.partition(high, len(high) - max_outliers)[-max_outliers:]
+
+    return {
+        "q1": float(q1),
+        "median": float(median),
+        "q3": float(q3),
+        "lowerfence": float(inside.min()),
+        "upperfence": float(inside.max()),
+        "mean": float(finite.mean()),
+        "min": float(finite.min()),
+        "max": float(finite.max()),
+        "outlier_count": int((finite < q1 - 1.5 * iqr).sum() + (finite > q3 + 1.5 * iqr).sum()),
+        "outliers": np.sort(np.concatenate([low, high])).tolist()
+    }
+
+def column_distribution(values: Any, max_bins: int = HISTOGRAM_MAX_BINS) -> Dict[str, Any]:
+    """Get the histogram and box plot data of a numeric column.
+
+    Args:
+        values: Column values.
+        max_bins: Maximum number of histogram bins.
+
+    Returns:
+        Dictionary with the histogram ``edges``/``counts`` and the ``box`` statistics.
+    """
+    finite = _finite_values(values)
+    distribution = histogram_data(finite, max_bins)
+    distribution["box"] = box_data(finite)
+    return distribution
+
+def grouped_box_data(values: pd.Series, groups: pd.Series, max_groups: int = BOX_MAX_GROUPS) -> Dict[str, Any]:
+    """Compute box plot statistics of a numeric column per group.
+
+    Args:
+        values: Numeric column.
+        groups: Group labels, aligned with ``values``.
+        max_groups: Maximum number of groups; the most frequent are kept.
+
+    Returns:
+        Dictionary mapping group labels (as strings) to box statistics.
+    """
+    top_groups = groups.value_counts().index[:max_groups]
+    frame = pd.DataFrame({"value": values, "group": groups})
+    frame = frame[frame["group"].isin(top_groups)]
+
+    result = {}
+    for group, group_values in frame.groupby("group", sort=False)["value"]:
+        box = box_data(group_values.to_numpy())
+        if box is not None:
+            result[str(group)] = box
+    return result
+
+def linear_fit(x: np.ndarray, y: np.ndarray) -> Optional[Dict[str, float]]:
+    """Fit ``y = slope * x + intercept`` by ordinary least squares in closed form.
+
+    The fit only needs the means and the centered sums of squares and
+    cross products, which are computed in one vectorized pass over the data.
+
+    Args:
+        x: Finite x values.
+        y: Finite y values, aligned with ``x``.
+
+    Returns:
+        Dictionary with slope, intercept, r2 and n, or None if the fit is
+        undefined (fewer than two points or constant x).
+    """
+    n = len(x)
+    if n < 2:
+        return None
+
+    x_mean = x.mean()
+    y_mean = y.mean()
+    dx = x - x_mean
+    dy = y - y_mean
+    sxx = float(dx @ dx)
+    sxy = float(dx @ dy)
+    syy = float(dy @ dy)
+    if sxx == 0:
+        return None
+
+    slope = sxy / sxx
+    return {
+        "slope": slope,
+        "intercept": float(y_mean - slope * x_mean),
+        "r2": sxy * sxy / (sxx * syy) if syy > 0 else 1.0,
+        "n": int(n)
+    }
+
+def stratified_sample(
+    x: np.ndarray,
+    y: np.ndarray,
+    max_points: int = SCATTER_MAX_POINTS,
+    grid_size: int = SCATTER_GRID_SIZE,
+    random_state: int = 42
+) -> np.ndarray:
+    """Pick a density-preserving sample of scatter points.
+
+    Points are stratified on a ``grid_size`` x ``grid_size`` grid over the
+    data range. Each point is kept with probability ``max_points / n``,
+    raised to ``1 / count`` in sparse cells so that every occupied cell
+    keeps one point on average. Dense regions keep their relative density
+    while sparse regions and isolated outliers stay visible. The sample is
+    drawn in linear time, without sorting.
+
+    Args:
+        x: Finite x values.
+        y: Finite y values, aligned with ``x``.
+        max_points: Target number of points; the expected sample size is at
+            most this plus the number of occupied cells.
+        grid_size: Number of grid cells per axis.
+        random_state: Seed of the random draw.
+
+    Returns:
+        Sorted indices of the sampled points.
+    """
+    n = len(x)
+    if n <= max_points:
+        return np.arange(n)
+
+    def cell_index(values: np.ndarray) -> np.ndarray:
+        low, high = values.min(), values.max()
+        if high == low:
+            return np.zeros(len(values), dtype=np.int64)
+        scaled = (values - low) * (grid_size / (high - low))
+        return np.minimum(scaled.astype(np.int64), grid_size - 1)
+
+    cells = cell_index(x) * grid_size + cell_index(y)
+    cell_counts = np.bincount(cells, minlength=grid_size * grid_size)
+
+    keep_probability = np.maximum(max_points / n, 1.0 / np.maximum(cell_counts, 1))
+    rng = np.random.default_rng(random_state)
+    return np.flatnonzero(rng.random(n) < keep_probability[cells])
+
+def scatter_data(x_values: Any, y_values: Any, max_points: int = SCATTER_MAX_POINTS) -> Dict[str, Any]:
+    """Get the points and the OLS trendline of a scatter plot.
+
+    The trendline is fitted on all rows; only the drawn points are sampled.
+
+    Args:
+        x_values: x column.
+        y_values: y column, aligned with ``x_values``.
+        max_points: Target number of drawn points.
+
+    Returns:
+        Dictionary with the sampled ``x``/``y`` points, the ``total_points``
+        they were sampled from and the ``trendline`` fit.
+    """
+    x = pd.Series(x_values).to_numpy(dtype=float, na_value=np.nan)
+    y = pd.Series(y_values).to_numpy(dtype=float, na_value=np.nan)
+    finite = np.isfinite(x) & np.isfinite(y)
+    x = x[finite]
+    y = y[finite]
+
+    sample = stratified_sample(x, y, max_points)
+    return {
+        "x": x[sample].tolist(),
+        "y": y[sample].tolist(),
+        "total_points": int(len(x)),
+        "sampled": bool(len(sample) < len(x)),
+        "trendline": linear_fit(x, y)
+    }
+
+def _box_trace(box: Dict[str, Any], name: str, horizontal: bool = False) -> "go.Box":
+    """Build a box trace from precomputed statistics."""
+    import plotly.graph_objects as go
+
+    position = {"y": [name]} if horizontal else {"x": [name]}
+    return go.Box(
+        q1=[box["q1"]],
+        median=[box["median"]],
+        q3=[box["q3"]],
+        lowerfence=[box["lowerfence"]],
+        upperfence=[box["upperfence"]],
+        mean=[box["mean"]],
+        name=str(name),
+        orientation="h" if horizontal else "v",
+        boxpoints=False,
+        showlegend=False,
+        **position
+    )
+
+def _outlier_trace(box: Dict[str, Any], name: str, horizontal: bool = False) -> "go.Scatter":
+    """Build a marker trace of the outliers kept in box statistics."""
+    import plotly.graph_objects as go
+
+    outliers = box["outliers"]
+    positions = [str(name)] * len(outliers)
+    return go.Scatter(
+        x=outliers if horizontal else positions,
+        y=positions if horizontal else outliers,
+        mode="markers",
+        marker=dict(size=4),
+        name="outliers",
+        showlegend=False
+    )
+
+def histogram_figure(distribution: Dict[str, Any], column: str, title: Optional[str] = None) -> str:
+    """Build a histogram with a box plot marginal from binned data.
+
+    Args:
+        distribution: Output of ``column_distribution``.
+        column: Column name, used for labels.
+        title: Figure title.
+
+    Returns:
+        The figure serialized as Plotly JSON.
+    """
+    import plotly.graph_objects as go
+    import plotly.io as pio
+    from plotly.subplots import make_subplots
+
+    edges = np.asarray(distribution["edges"], dtype=float)
+    fig = make_subplots(rows=2, cols=1, shared_xaxes=True, row_heights=[0.2, 0.8], vertical_spacing=0.02)
+
+    if len(edges) > 1:
+        fig.add_trace(
+            go.Bar(
+                x=((edges[:-1] + edges[1:]) / 2).tolist(),
+                y=distribution["counts"],
+                width=np.diff(edges).tolist(),
+                name=column,
+                showlegend=False
+            ),
+            row=2, col=1
+        )
+
+    box = distribution.get("box")
+    if box is not None:
+        fig.add_trace(_box_trace(box, column, horizontal=True), row=1, col=1)
+        if box["outliers"]:
+            fig.add_trace(_outlier_trace(box, column, horizontal=True), row=1, col=1)
+
+    fig.update_layout(title=title or f"Distribution of {column}", bargap=0)
+    fig.update_xaxes(title_text=column, row=2, col=1)
+    fig.update_yaxes(title_text="count", row=2, col=1)
+    fig.update_yaxes(showticklabels=False, row=1, col=1)
+    return pio.to_json(fig)
+
+def bar_figure(labels: List[Any], counts: List[int], title: str, column: str) -> str:
+    """Build a bar chart from precomputed category counts.
+
+    Args:
+        labels: Category labels.
+        counts: Count per category.
+        title: Figure title.
+        column: Column name, used for the axis label.
+
+    Returns:
+        The figure serialized as Plotly JSON.
+    """
+    import plotly.graph_objects as go
+    import plotly.io as pio
+
+    fig = go.Figure(go.Bar(x=[str(label) for label in labels], y=list(counts)))
+    fig.update_layout(title=title, xaxis_title=column, yaxis_title="Count")
+    return pio.to_json(fig)
+
+def grouped_box_figure(boxes: Dict[Any, Dict[str, Any]], column: str, group_column: str, title: str) -> str:
+    """Build box plots of a column per group from precomputed statistics.
+
+    Args:
+        boxes: Output of ``grouped_box_data``.
+        column: Name of the numeric column.
+        group_column: Name of the grouping column.
+        title: Figure title.
+
+    Returns:
+        The figure serialized as Plotly JSON.
+    """
+    import plotly.graph_objects as go
+    import plotly.io as pio
+
+    fig = go.Figure()
+    for group, box in boxes.items():
+        fig.add_trace(_box_trace(box, group))
+        if box["outliers"]:
+            fig.add_trace(_outlier_trace(box, group))
+    fig.update_layout(title=title, xaxis_title=group_column, yaxis_title=column)
+    return pio.to_json(fig)
+
+def scatter_figure(data: Dict[str, Any], x_column: str, y_column: str, title: str) -> str:
+    """Build a scatter plot with an OLS trendline from sampled points.
+
+    Args:
+        data: Output of ``scatter_data``.
+        x_column: Name of the x column.
+        y_column: Name of the y column.
+        title: Figure title.
+
+    Returns:
+        The figure serialized as Plotly JSON.
+    """
+    import plotly.graph_objects as go
+    import plotly.io as pio
+
+    fig = go.Figure(go.Scattergl(
+        x=data["x"],
+        y=data["y"],
+        mode="markers",
+        marker=dict(size=4, opacity=0.6),
+        name="sample" if data["sampled"] else "data",
+        showlegend=False
+    ))
+
+    fit = data["trendline"]
+    if fit is not None and data["x"]:
+        x_range = [min(data["x"]), max(data["x"])]
+        fig.add_trace(go.Scatter(
+            x=x_range,
+            y=[fit["slope"] * value + fit["intercept"] for value in x_range],
+            mode="lines",
+            name=f"OLS (R²={fit['r2']:.3f})"
+        ))
+
+    if data["sampled"]:
+        title = f"{title} ({len(data['x'])} of {data['total_points']} points)"
+    fig.update_layout(title=title, xaxis_title=x_column, yaxis_title=y_column)
+    return pio.to_json(fig)
+
+def heatmap_figure(columns: List[str], matrix: List[List[Optional[float]]], title: str) -> str:
+    """Build a correlation heatmap from a compact matrix.
+
+    Args:
+        columns: Column names of the matrix.
+        matrix: Rows of correlation values (None where undefined).
+        title: Figure title.
+
+    Returns:
+        The figure serialized as Plotly JSON.
+    """
+    import plotly.graph_objects as go
+    import plotly.io as pio
+
+    fig = go.Figure(go.Heatmap(
+        z=matrix,
+        x=columns,
+        y=columns,
+        zmin=-1,
+        zmax=1,
+        colorscale="RdBu_r",
+        colorbar=dict(title="Correlation")
+    ))
+    fig.update_layout(title=title, yaxis=dict(autorange="reversed"))
+    return pio.to_json(fig)
@@ -0,0 +1,298 @@
+import os
+import json
+import shutil
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Any, Optional
+
+from runtime.serialization import dumps_json
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Directory the serialized reports are stored in
+EDA_CACHE_DIR = os.environ.get("EDA_CACHE_DIR", "./cache/eda")
+# Upper bound on the disk space used by cached reports (default 512 MiB)
+EDA_CACHE_MAX_BYTES = int(os.environ.get("EDA_CACHE_MAX_BYTES", 512 * 1024 ** 2))
+# Number of serialized reports also kept in memory
+EDA_CACHE_MEMORY_ENTRIES = int(os.environ.get("EDA_CACHE_MEMORY_ENTRIES", 16))
+
+def serialize_report(report: Dict[str, Any]) -> bytes:
+    """Serialize an EDA report to JSON bytes.
+
+    Args:
+        report: EDA report as produced by AutomatedEDA.
+
+    Returns:
+        UTF-8 encoded JSON document.
+    """
+    return dumps_json(report)
+
+class EDAReportCache:
+    """Disk-backed cache of serialized EDA reports.
+
+    Reports are content addressed: the key is derived from the dataset's
+    content hash, the selected columns, the target column and the EDA
+    version, so a changed dataset or a new report format never hits a stale
+    entry. Entries are stored per dataset as ``<dir>/<dataset_id>/<key>.json``
+    and evicted least recently used first (by file mtime, which is refreshed
+    on every hit) once the directory grows beyond its size budget. The most
+    recently used reports are also kept in memory as raw JSON bytes, so a
+    hit can be returned without parsing or re-serializing the report.
+    Figures drawn on demand are stored the same way under their own keys.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str = EDA_CACHE_DIR,
+        max_bytes: int = EDA_CACHE_MAX_BYTES,
+        memory_entries: int = EDA_CACHE_MEMORY_ENTRIES
+    ):
+        """Initialize the EDAReportCache.
+
+        Args:
+            cache_dir: Directory to store the reports in.
+            max_bytes: Maximum total size of the stored reports.
+            memory_entries: Number of reports also kept in memory.
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.memory_entries = memory_entries
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def make_key(
+        self,
+        content_hash: str,
+        columns: Optional[List[str]] = None,
+        target_column: Optional[str] = None
+    ) -> str:
+        """Build the cache key of a report.
+
+        Args:
+            content_hash: Content hash of the dataset file.
+            columns: Selected columns (all columns if None).
+            target_column: Target column (if any).
+
+        Returns:
+            Hex digest identifying the report.
+        """
+        from .automated_eda import EDA_VERSION
+
+        payload = json.dumps({
+            "content_hash": content_hash,
+            "columns": list(columns) if columns else None,
+            "target_column": target_column,
+            "eda_version": EDA_VERSION,
+        }, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def make_plot_key(
+        self,
+        content_hash: str,
+        kind: str,
+        column: Optional[str] = None,
+        target_column: Optional[str] = None
+    ) -> str:
+        """Build the cache key of a figure.
+
+        Args:
+            content_hash: Content hash of the dataset file.
+            kind: Kind of figure.
+            column: Column the figure is drawn for.
+            target_column: Target column (if any).
+
+        Returns:
+            Hex digest identifying the figure.
+        """
+        from .automated_eda import EDA_VERSION
+
+        payload = json.dumps({
+            "content_hash": content_hash,
+            "plot": kind,
+            "column": column,
+            "target_column": target_column,
+            "eda_version": EDA_VERSION,
+        }, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, dataset_id: str, key: str) -> str:
+        """Path of the file a report is stored in."""
+        return os.path.join(self.cache_dir, dataset_id, f"{key}.json")
+
+    def get(self, dataset_id: str, key: str) -> Optional[bytes]:
+        """Get a serialized report.
+
+        Args:
+            dataset_id: ID of the dataset the report belongs to.
+            key: Key built with ``make_key``.
+
+        Returns:
+            The report as JSON bytes, or None if it is not cached.
+        """
+        try:
+            path = self._path(dataset_id, key)
+            memory_key = f"{dataset_id}/{key}"
+
+            with self._lock:
+                body = self._memory.get(memory_key)
+                if body is not None:
+                    self._memory.move_to_end(memory_key)
+
+            if body is None:
+                try:
+                    with open(path, "rb") as f:
+                        body = f.read()
+                except FileNotFoundError:
+                    with self._lock:
+                        self._misses += 1
+                    return None
+                self._remember(memory_key, body)
+
+            # Refresh the mtime, which orders entries for eviction
+            try:
+                os.utime(path)
+            except FileNotFoundError:
+                pass
+
+            with self._lock:
+                self._hits += 1
+            return body
+        except Exception as e:
+            logger.error(f"Error reading cached EDA report: {str(e)}")
+            raise
+
+    def put(self, dataset_id: str, key: str, report: Dict[str, Any]) -> bytes:
+        """Store a report.
+
+        Args:
+            dataset_id: ID of the dataset the report belongs to.
+            key: Key built with ``make_key``.
+            report: EDA report to store.
+
+        Returns:
+            The report as JSON bytes.
+        """
+        return self.put_body(dataset_id, key, serialize_report(report))
+
+    def put_body(self, dataset_id: str, key: str, body: bytes) -> bytes:
+        """Store an already serialized document, such as a figure.
+
+        Args:
+            dataset_id: ID of the dataset the document belongs to.
+            key: Key built with ``make_key`` or ``make_plot_key``.
+            body: JSON bytes to store.
+
+        Returns:
+            The stored bytes.
+        """
+        try:
+            path = self._path(dataset_id, key)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+            # Write to a temporary file first so readers never see a partial report
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(body)
+            os.replace(tmp_path, path)
+
+            self._remember(f"{dataset_id}/{key}", body)
+            self._evict()
+            return body
+        except Exception as e:
+            logger.error(f"Error storing EDA report: {str(e)}")
+            raise
+
+    def _remember(self, memory_key: str, body: bytes) -> None:
+        """Keep a serialized report in the in-memory LRU."""
+        with self._lock:
+            self._memory[memory_key] = body
+            self._memory.move_to_end(memory_key)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+
+    def _list_entries(self) -> List[Dict[str, Any]]:
+        """List the stored reports with their size and last use."""
+        entries = []
+        if not os.path.isdir(self.cache_dir):
+            return entries
+        for dataset_id in os.listdir(self.cache_dir):
+            dataset_dir = os.path.join(self.cache_dir, dataset_id)
+            if not os.path.isdir(dataset_dir):
+                continue
+            for name in os.listdir(dataset_dir):
+                if not name.endswith(".json"):
+                    continue
+                path = os.path.join(dataset_dir, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append({
+                    "memory_key": f"{dataset_id}/{name[:-len('.json')]}",
+                    "path": path,
+                    "size": stat.st_size,
+                    "mtime": stat.st_mtime,
+                })
+        return entries
+
+    def _evict(self) -> None:
+        """Remove least recently used reports until the cache fits its budget."""
+        entries = self._list_entries()
+        total = sum(entry["size"] for entry in entries)
+        if total <= self.max_bytes:
+            return
+
+        for entry in sorted(entries, key=lambda entry: entry["mtime"]):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(entry["path"])
+            except FileNotFoundError:
+                pass
+            total -= entry["size"]
+            with self._lock:
+                self._memory.pop(entry["memory_key"], None)
+                self._evictions += 1
+
+    def invalidate_dataset(self, dataset_id: str) -> None:
+        """Remove every cached report of a dataset.
+
+        Args:
+            dataset_id: ID of the dataset.
+        """
+        try:
+            with self._lock:
+                for memory_key in [k for k in self._memory if k.startswith(f"{dataset_id}/")]:
+                    del self._memory[memory_key]
+            shutil.rmtree(os.path.join(self.cache_dir, dataset_id), ignore_errors=True)
+        except Exception as e:
+            logger.error(f"Error invalidating EDA reports: {str(e)}")
+            raise
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics.
+
+        Returns:
+            Dictionary with hit/miss/eviction counters and disk usage.
+        """
+        entries = self._list_entries()
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "entries": len(entries),
+                "memory_entries": len(self._memory),
+                "current_bytes": sum(entry["size"] for entry in entries),
+                "max_bytes": self.max_bytes,
+            }
+
+# Create a singleton instance
+eda_report_cache = EDAReportCache()
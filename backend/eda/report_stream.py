@@ -0,0 +1,185 @@
+import os
+import time
+import asyncio
+import logging
+from typing import Dict, List, Any, AsyncIterator, Awaitable, Callable, Optional
+
+from .report_cache import serialize_report
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Seconds the events of a finished report stream are kept for resuming clients
+EDA_STREAM_RETENTION = float(os.environ.get("EDA_STREAM_RETENTION", 300))
+
+# Event types that end a stream
+FINAL_EVENTS = {"complete", "error"}
+
+class EDAReportStream:
+    """Ordered, replayable log of the events of one report.
+
+    Events are numbered from 0 by ``seq``. Any number of clients can follow
+    the log; a client that reconnects passes the last ``seq`` it received
+    and continues from there. Each section event carries the ``path`` of its
+    data in the report, so replaying an event is harmless.
+    """
+
+    def __init__(self, report_id: str):
+        """Initialize an empty EDAReportStream.
+
+        Args:
+            report_id: ID of the report (its EDA cache key).
+        """
+        self.report_id = report_id
+        self.events: List[Dict[str, Any]] = []
+        self.finished_at: Optional[float] = None
+        self._changed = asyncio.Condition()
+
+    @property
+    def done(self) -> bool:
+        """Whether the stream has ended."""
+        return self.finished_at is not None
+
+    @property
+    def failed(self) -> bool:
+        """Whether the stream ended with an error."""
+        return self.done and self.events[-1]["event"] == "error"
+
+    async def publish(self, event: str, data: Any = None, path: Optional[List[str]] = None) -> None:
+        """Append an event to the log and wake up the followers.
+
+        Args:
+            event: Event type ('metadata', 'section', 'complete' or 'error').
+            data: Event payload.
+            path: Location of ``data`` in the report, for section events.
+        """
+        async with self._changed:
+            record = {"report_id": self.report_id, "seq": len(self.events), "event": event}
+            if path is not None:
+                record["path"] = path
+            record["data"] = data
+            self.events.append(record)
+            if event in FINAL_EVENTS:
+                self.finished_at = time.monotonic()
+            self._changed.notify_all()
+
+    async def follow(self, after: int = -1) -> AsyncIterator[Dict[str, Any]]:
+        """Iterate over the events after ``after``, waiting for new ones until the stream ends.
+
+        Args:
+            after: Last ``seq`` already received (-1 for all events).
+
+        Yields:
+            Events in order.
+        """
+        position = max(after + 1, 0)
+        while True:
+            async with self._changed:
+                while position >= len(self.events) and not self.done:
+                    await self._changed.wait()
+                pending = self.events[position:]
+            for record in pending:
+                yield record
+            position += len(pending)
+            if self.done and position >= len(self.events):
+                return
+
+class EDAStreamManager:
+    """Registry of report streams being produced or recently finished."""
+
+    def __init__(self, retention: float = EDA_STREAM_RETENTION):
+        """Initialize the EDAStreamManager.
+
+        Args:
+            retention: Seconds a finished stream stays available for resuming.
+        """
+        self.retention = retention
+        self._streams: Dict[str, EDAReportStream] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    def get(self, report_id: str) -> Optional[EDAReportStream]:
+        """Get a live or recently finished stream.
+
+        Args:
+            report_id: ID of the report.
+
+        Returns:
+            The stream, or None if it is unknown or has expired.
+        """
+        self._expire()
+        return self._streams.get(report_id)
+
+    def start(self, report_id: str, producer: Callable[[EDAReportStream], Awaitable[None]]) -> EDAReportStream:
+        """Start producing a stream in the background.
+
+        The producer keeps running when clients disconnect, so they can
+        resume later.
+
+        Args:
+            report_id: ID of the report.
+            producer: Coroutine function publishing the events of the stream.
+
+        Returns:
+            The new stream.
+        """
+        stream = EDAReportStream(report_id)
+        self._streams[report_id] = stream
+
+        async def run() -> None:
+            try:
+                await producer(stream)
+                if not stream.done:
+                    await stream.publish("complete")
+            except Exception as e:
+                logger.error(f"Error streaming EDA report {report_id}: {str(e)}")
+                await stream.publish("error", {"detail": str(e)})
+            finally:
+                self._tasks.pop(report_id, None)
+
+        self._tasks[report_id] = asyncio.create_task(run())
+        return stream
+
+    def replay(self, report_id: str, metadata: Dict[str, Any], report: Dict[str, Any]) -> EDAReportStream:
+        """Create a finished stream from a stored report.
+
+        Args:
+            report_id: ID of the report.
+            metadata: Payload of the leading metadata event.
+            report: The complete report.
+
+        Returns:
+            A stream with one event per report section.
+        """
+        stream = EDAReportStream(report_id)
+        stream.events.append({"report_id": report_id, "seq": 0, "event": "metadata", "data": metadata})
+        for section, data in report.items():
+            stream.events.append({
+                "report_id": report_id, "seq": len(stream.events), "event": "section",
+                "path": [section], "data": data
+            })
+        stream.events.append({"report_id": report_id, "seq": len(stream.events), "event": "complete", "data": None})
+        stream.finished_at = time.monotonic()
+        return stream
+
+    def _expire(self) -> None:
+        """Forget finished streams older than the retention period."""
+        now = time.monotonic()
+        for report_id in [
+            report_id for report_id, stream in self._streams.items()
+            if stream.done and now - stream.finished_at > self.retention
+        ]:
+            del self._streams[report_id]
+
+def encode_ndjson(record: Dict[str, Any]) -> bytes:
+    """Encode an event as a line of newline-delimited JSON."""
+    return serialize_report(record) + b"\n"
+
+def encode_sse(record: Dict[str, Any]) -> bytes:
+    """Encode an event as a Server-Sent Event; its id is the event's ``seq``."""
+    return b"id: %d\nevent: %s\ndata: %s\n\n" % (
+        record["seq"], record["event"].encode("utf-8"), serialize_report(record)
+    )
+
+# Create a singleton instance
+eda_stream_manager = EDAStreamManager()
@@ -1,7 +1,7 @@
 import logging
 import json
 from typing import Dict, List, Any, Optional, Tuple, Union
-from ..ai.gemini_client import gemini_client
+from ai.gemini_client import gemini_client
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
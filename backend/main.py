@@ -1,27 +1,20 @@
-from fastapi import FastAPI, HTTPException, Depends, File, UploadFile, Form, BackgroundTasks, Query
+from fastapi import FastAPI, HTTPException, Depends, File, UploadFile, Form, Query, Header, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from pydantic import BaseModel
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Callable, Optional, Tuple, Union
 import pandas as pd
-import numpy as np
 import os
 import json
+import asyncio
+import threading
 import uuid
 import shutil
+import hashlib
 from datetime import datetime, timedelta
 import logging
 
-# ML libraries
-from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import StandardScaler, OneHotEncoder
-from sklearn.compose import ColumnTransformer
-from sklearn.pipeline import Pipeline
-from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor
-from sklearn.linear_model import LogisticRegression, LinearRegression
-from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score, r2_score, mean_squared_error
-
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -46,6 +39,12 @@ app.add_middleware(
 UPLOAD_DIR = os.environ.get("UPLOAD_DIR", "./uploads")
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 
+# Size of the blocks an upload is streamed to disk in (default 1 MiB)
+UPLOAD_CHUNK_SIZE = int(os.environ.get("UPLOAD_CHUNK_SIZE", 1024 * 1024))
+
+# Datasets with more rows are profiled with mergeable sketches, out of core
+STREAMING_PROFILE_MIN_ROWS = int(os.environ.get("STREAMING_PROFILE_MIN_ROWS", 1_000_000))
+
 # Import services
 from services.database_service import db_service
 from services.auth_service import auth_service
@@ -72,6 +71,7 @@ class DatasetInfo(BaseModel):
     row_count: int
     column_count: int
     columns: Dict[str, str]  # column_name: data_type
+    columnar_path: Optional[str] = None  # Parquet copy used for column/row-range reads
     created_at: datetime
 
 class ModelInfo(BaseModel):
@@ -90,8 +90,11 @@ class ModelInfo(BaseModel):
 class JobInfo(BaseModel):
     id: str
     type: str
-    status: str
+    status: str  # "pending", "running", "completed", "failed", "cancelled", "timed_out"
     params: Dict[str, Any]
+    priority: int = 0
+    timeout: Optional[float] = None
+    progress: Optional[Dict[str, Any]] = None  # {"fraction": float, "message": str}
     result: Optional[Dict[str, Any]] = None
     created_at: datetime
     updated_at: Optional[datetime] = None
@@ -107,6 +110,46 @@ class TrainingRequest(BaseModel):
     feature_columns: List[str]
     hyperparameters: Optional[Dict[str, Any]] = None
     test_size: Optional[float] = 0.2
+    sparse_output: Union[bool, str] = "auto"  # Sparse feature matrix: True, False or "auto"
+    encoding_method: str = "auto"  # Categorical encoding: "auto" (cardinality-aware) or "onehot"
+    force: bool = False  # Train even if an identical run is in the training registry
+    streaming: Optional[bool] = None  # Out-of-core partial_fit training; above STREAMING_TRAIN_MIN_ROWS if None
+    epochs: Optional[int] = None  # Passes over the data when streaming
+    priority: int = 0  # Higher runs first
+    timeout_seconds: Optional[float] = None  # Scheduler default if None
+
+class LeaderboardRequest(BaseModel):
+    dataset_id: str
+    target_column: str
+    feature_columns: List[str]
+    candidates: Union[List[str], str] = "all"  # Model types, or "all" registered for the task
+    metric: Optional[str] = None  # Ranking metric; accuracy or r2 if None
+    hyperparameters: Optional[Dict[str, Dict[str, Any]]] = None  # Overrides by model type
+    test_size: Optional[float] = 0.2
+    sparse_output: Union[bool, str] = "auto"
+    encoding_method: str = "auto"
+    time_budget_seconds: Optional[float] = None  # LEADERBOARD_TIME_BUDGET if None
+    max_workers: Optional[int] = None  # LEADERBOARD_WORKERS if None, at most LEADERBOARD_WORKERS
+
+class SearchRequest(BaseModel):
+    dataset_id: str
+    target_column: str
+    feature_columns: List[str]
+    model_types: Union[List[str], str] = "all"  # Model types searched, or "all" registered for the task
+    metric: Optional[str] = None  # Validation metric compared; accuracy or r2 if None
+    strategy: str = "hyperband"  # "hyperband" or "halving"
+    sampler: str = "sobol"  # "sobol" (quasi-random) or "random"
+    resource: str = "auto"  # Budget of ensemble trials: "samples", "n_estimators" or "auto"
+    n_candidates: Optional[int] = None  # Configurations of the halving bracket
+    eta: Optional[int] = None  # SEARCH_ETA if None
+    max_trials: Optional[int] = None
+    search_spaces: Optional[Dict[str, Dict[str, Dict[str, Any]]]] = None  # Overrides by model type
+    random_state: int = 42
+    test_size: Optional[float] = 0.2
+    sparse_output: Union[bool, str] = "auto"
+    encoding_method: str = "auto"
+    time_budget_seconds: Optional[float] = None  # SEARCH_TIME_BUDGET if None
+    max_workers: Optional[int] = None  # SEARCH_WORKERS if None, at most SEARCH_WORKERS
 
 class PredictionRequest(BaseModel):
     model_id: str
@@ -115,9 +158,30 @@ class PredictionRequest(BaseModel):
 class EDARequest(BaseModel):
     dataset_id: str
     columns: Optional[List[str]] = None
+    target_column: Optional[str] = None
 
-# Import sample dataset manager
+# Import sample dataset manager, the shared dataset loader and the executor layer
 from data_processing.sample_datasets import sample_dataset_manager
+from data_processing.dataset_loader import dataset_loader
+from runtime.executor import task_executor
+from runtime.scheduler import job_scheduler
+from runtime import tasks
+from runtime.serialization import response_encoder, ARROW
+from eda.report_cache import eda_report_cache
+from ml.preprocessing_cache import preprocessing_cache
+from eda.report_stream import eda_stream_manager, encode_ndjson, encode_sse
+
+# EDA reports and figures being computed, so concurrent identical requests share one computation
+eda_in_flight: Dict[str, asyncio.Future] = {}
+
+@app.on_event("startup")
+async def start_scheduler():
+    job_scheduler.start()
+
+@app.on_event("shutdown")
+async def shutdown_executors():
+    job_scheduler.shutdown()
+    task_executor.shutdown(wait=False)
 
 # Routes
 @app.get("/")
@@ -135,21 +199,25 @@ async def upload_dataset(
         # Generate unique ID for dataset
         dataset_id = str(uuid.uuid4())
 
-        # Save file
-        file_extension = os.path.splitext(file.filename)[1]
+        # Reject unsupported formats before writing anything to disk
+        file_extension = os.path.splitext(file.filename)[1].lower()
+        if file_extension not in [".csv", ".xls", ".xlsx"]:
+            raise HTTPException(status_code=400, detail="Unsupported file format")
         file_path = os.path.join(UPLOAD_DIR, f"{dataset_id}{file_extension}")
 
+        # Stream the upload to disk in fixed-size chunks, hashing it on the way
+        hasher = hashlib.sha256()
         with open(file_path, "wb") as f:
-            content = await file.read()
-            f.write(content)
-
-        # Read dataset for metadata
-        if file_extension.lower() == ".csv":
-            df = pd.read_csv(file_path)
-        elif file_extension.lower() in [".xls", ".xlsx"]:
-            df = pd.read_excel(file_path)
-        else:
-            raise HTTPException(status_code=400, detail="Unsupported file format")
+            while True:
+                chunk = await file.read(UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                await task_executor.run_io(write_upload_chunk, f, hasher, chunk)
+        content_hash = hasher.hexdigest()
+        dataset_loader.remember_content_hash(file_path, content_hash)
+
+        # Infer metadata and write the columnar copy in one chunked pass
+        metadata = await task_executor.run_cpu(tasks.ingest_dataset_task, file_path)
 
         # Create dataset info
         dataset_info = {
@@ -157,10 +225,12 @@ async def upload_dataset(
             "name": name,
             "description": description,
             "file_path": file_path,
-            "file_type": file_extension.lower()[1:],  # Remove the dot
-            "row_count": len(df),
-            "column_count": len(df.columns),
-            "columns": {col: str(df[col].dtype) for col in df.columns},
+            "file_type": file_extension[1:],  # Remove the dot
+            "row_count": metadata["row_count"],
+            "column_count": metadata["column_count"],
+            "columns": metadata["columns"],
+            "columnar_path": metadata["columnar_path"],
+            "content_hash": content_hash,
             "created_at": datetime.now(),
         }
 
@@ -183,10 +253,85 @@ async def get_dataset(dataset_id: str):
 
     return dataset
 
+@app.get("/datasets/{dataset_id}/profile")
+async def get_dataset_profile(dataset_id: str, streaming: Optional[bool] = None):
+    """Get the profile of a dataset.
+
+    With streaming=true the dataset is read in chunks and summarized with
+    mergeable sketches, so it never has to fit in memory; the result carries
+    error bounds. By default streaming is used above STREAMING_PROFILE_MIN_ROWS rows.
+    """
+    dataset_info = db_service.get_dataset(dataset_id)
+    if not dataset_info:
+        raise HTTPException(status_code=404, detail="Dataset not found")
+
+    if streaming is None:
+        streaming = dataset_info["row_count"] > STREAMING_PROFILE_MIN_ROWS
+
+    try:
+        return await build_dataset_profile(dataset_info, streaming)
+    except Exception as e:
+        logger.error(f"Error generating dataset profile: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error generating dataset profile: {str(e)}")
+
+@app.get("/datasets/{dataset_id}/correlations")
+async def get_dataset_correlations(
+    dataset_id: str,
+    method: str = "pearson",
+    threshold: Optional[float] = None,
+    top_k: Optional[int] = 100,
+    include_matrix: bool = False
+):
+    """Get the strongest correlated column pairs of a dataset.
+
+    The full matrix is only returned with include_matrix=true.
+    """
+    if method not in ("pearson", "spearman"):
+        raise HTTPException(status_code=400, detail="method must be 'pearson' or 'spearman'")
+
+    dataset_info = db_service.get_dataset(dataset_id)
+    if not dataset_info:
+        raise HTTPException(status_code=404, detail="Dataset not found")
+
+    try:
+        return await task_executor.run_cpu(
+            tasks.correlation_task, dataset_info, method, threshold, top_k, include_matrix
+        )
+    except Exception as e:
+        logger.error(f"Error computing correlations: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error computing correlations: {str(e)}")
+
 @app.get("/datasets")
 async def list_datasets():
     return db_service.list_datasets()
 
+@app.get("/datasets/cache/stats")
+async def get_dataset_cache_stats():
+    """Get hit/miss/eviction counters of the parsed dataset caches of the API process and of each CPU worker"""
+    from data_processing.dataset_loader import DATASET_CACHE_WORKER_MAX_BYTES
+    stats = dataset_loader.get_stats()
+    workers = [
+        {"pid": pid, **worker["dataset_cache"]}
+        for pid, worker in sorted(task_executor.get_worker_stats().items())
+    ]
+    return {
+        **stats,
+        "workers": workers,
+        # Most memory all the parsed dataset caches together can hold
+        "total_max_bytes": stats["max_bytes"] + task_executor.cpu_workers * DATASET_CACHE_WORKER_MAX_BYTES,
+        "total_current_bytes": stats["current_bytes"] + sum(worker["current_bytes"] for worker in workers),
+    }
+
+@app.get("/system/executors")
+async def get_executor_stats():
+    """Get queue depth and latency metrics of the worker pools"""
+    return task_executor.get_stats()
+
+@app.get("/system/scheduler")
+async def get_scheduler_stats():
+    """Get worker occupancy of the job scheduler"""
+    return job_scheduler.get_stats()
+
 # Sample dataset routes
 @app.get("/datasets/samples")
 async def list_sample_datasets():
@@ -209,11 +354,17 @@ async def get_sample_dataset_info(dataset_id: str):
         raise HTTPException(status_code=500, detail=f"Error getting sample dataset info: {str(e)}")
 
 @app.get("/datasets/samples/{dataset_id}/preview")
-async def preview_sample_dataset(dataset_id: str, rows: int = Query(10, ge=1, le=100)):
-    """Preview a sample dataset"""
+async def preview_sample_dataset(http_request: Request, dataset_id: str, rows: int = Query(10, ge=1, le=100)):
+    """Preview a sample dataset, as JSON records, MessagePack or an Arrow table"""
+    media_type, encoding = negotiate_response(http_request, tabular=True)
     try:
-        df = sample_dataset_manager.get_dataset(dataset_id)
-        return df.head(rows).to_dict(orient="records")
+        df = await task_executor.run_io(sample_dataset_manager.get_dataset, dataset_id)
+        preview = df.head(rows)
+        if media_type == ARROW:
+            return await encoded_response(
+                media_type, encoding, table=preview, table_metadata={"dataset_id": dataset_id}
+            )
+        return await encoded_response(media_type, encoding, preview.to_dict(orient="records"))
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
@@ -226,7 +377,7 @@ async def import_sample_dataset(dataset_id: str, project_id: Optional[str] = Non
     try:
         # Get the sample dataset
         sample_info = sample_dataset_manager.get_dataset_info(dataset_id)
-        df = sample_dataset_manager.get_dataset(dataset_id)
+        df = await task_executor.run_io(sample_dataset_manager.get_dataset, dataset_id)
 
         # Generate unique ID for the imported dataset
         imported_dataset_id = str(uuid.uuid4())
@@ -239,8 +390,10 @@ async def import_sample_dataset(dataset_id: str, project_id: Optional[str] = Non
         file_extension = ".csv"  # Default to CSV for simplicity
         file_path = os.path.join(imported_dir, f"{imported_dataset_id}{file_extension}")
 
-        # Save as CSV
-        df.to_csv(file_path, index=False)
+        # Save as CSV, plus a columnar copy for projected reads
+        await task_executor.run_io(df.to_csv, file_path, index=False)
+        from data_processing.data_processor import data_processor
+        columnar_path = await task_executor.run_io(data_processor.write_columnar, df, file_path)
 
         # Create dataset info
         dataset_info = {
@@ -252,6 +405,7 @@ async def import_sample_dataset(dataset_id: str, project_id: Optional[str] = Non
             "row_count": len(df),
             "column_count": len(df.columns),
             "columns": {col: str(df[col].dtype) for col in df.columns},
+            "columnar_path": columnar_path,
             "created_at": datetime.now(),
         }
 
@@ -278,85 +432,170 @@ async def import_sample_dataset(dataset_id: str, project_id: Optional[str] = Non
 
 # ML routes
 @app.post("/ml/train")
-async def train_model(request: TrainingRequest, background_tasks: BackgroundTasks):
+async def train_model(request: TrainingRequest):
+    if request.sparse_output not in (True, False, "auto"):
+        raise HTTPException(status_code=400, detail="sparse_output must be true, false or 'auto'")
+    if request.encoding_method not in ("auto", "onehot"):
+        raise HTTPException(status_code=400, detail="encoding_method must be 'auto' or 'onehot'")
+    if request.epochs is not None and request.epochs < 1:
+        raise HTTPException(status_code=400, detail="epochs must be at least 1")
+    from ml.streaming_trainer import streaming_trainer, STREAMING_TRAIN_MIN_ROWS
     try:
         # Get dataset from database
         dataset_info = db_service.get_dataset(request.dataset_id)
         if not dataset_info:
             raise HTTPException(status_code=404, detail="Dataset not found")
 
-        # Load dataset
-        if dataset_info["file_type"] == "csv":
-            df = pd.read_csv(dataset_info["file_path"])
-        elif dataset_info["file_type"] in ["xls", "xlsx"]:
-            df = pd.read_excel(dataset_info["file_path"])
-        else:
-            raise HTTPException(status_code=400, detail="Unsupported file format")
-
         # Validate columns
         for col in [request.target_column] + request.feature_columns:
-            if col not in df.columns:
+            if col not in dataset_info["columns"]:
                 raise HTTPException(status_code=400, detail=f"Column '{col}' not found in dataset")
 
-        # Determine task type
-        if pd.api.types.is_numeric_dtype(df[request.target_column]):
-            task_type = "regression"
-        else:
-            task_type = "classification"
-
-        # Create job
-        job_id = str(uuid.uuid4())
-        job_info = {
-            "id": job_id,
-            "type": "model_training",
-            "status": "pending",
-            "params": {
+        # Determine task type from the stored schema, without loading any data
+        task_type = infer_task_type(dataset_info, request.target_column)
+
+        # Large datasets are streamed when the model can learn incrementally
+        streaming = request.streaming
+        if streaming is None:
+            streaming = (
+                dataset_info["row_count"] > STREAMING_TRAIN_MIN_ROWS
+                and streaming_trainer.supports(request.model_type, task_type)
+            )
+        elif streaming and not streaming_trainer.supports(request.model_type, task_type):
+            raise HTTPException(
+                status_code=400,
+                detail=f"Model type '{request.model_type}' cannot be trained out of core; "
+                       f"use one of {list(streaming_trainer.get_models(task_type))}"
+            )
+
+        # Queue the job; the worker process loads the dataset by id
+        job_info = job_scheduler.submit(
+            "model_streaming_training" if streaming else "model_training",
+            params={
                 "dataset_id": request.dataset_id,
                 "model_type": request.model_type,
+                "task_type": task_type,
                 "target_column": request.target_column,
                 "feature_columns": request.feature_columns,
                 "hyperparameters": request.hyperparameters,
-                "test_size": request.test_size
+                "test_size": request.test_size,
+                "sparse_output": request.sparse_output,
+                "encoding_method": request.encoding_method,
+                "force": request.force,
+                "epochs": request.epochs
             },
-            "created_at": datetime.now()
-        }
-
-        # Save job to database
-        db_service.save_job(job_info)
-
-        # Train model in background
-        background_tasks.add_task(
-            train_model_task,
-            job_id=job_id,
-            df=df,
-            target_column=request.target_column,
-            feature_columns=request.feature_columns,
-            model_type=request.model_type,
-            task_type=task_type,
-            hyperparameters=request.hyperparameters,
-            test_size=request.test_size
+            priority=request.priority,
+            timeout=request.timeout_seconds
         )
 
-        return {"job_id": job_id, "message": "Model training started"}
+        return {"job_id": job_info["id"], "streaming": streaming, "message": "Model training queued"}
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error starting model training: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error starting model training: {str(e)}")
 
+@app.post("/ml/leaderboard")
+async def train_leaderboard(
+    request: LeaderboardRequest,
+    format: Optional[str] = None,
+    accept: Optional[str] = Header(None)
+):
+    """Train candidate models concurrently and stream their ranking as NDJSON or Server-Sent Events.
+
+    The dataset is loaded and preprocessed once; the candidates share the
+    feature matrix and train in parallel worker processes. A 'prepared'
+    event comes first, then a 'candidate' event with the current ranking
+    each time a candidate finishes, and a 'complete' event with the final
+    leaderboard. Candidates still running when the time budget is spent are
+    stopped. The best model is stored like a trained model.
+    """
+    from ml.leaderboard import model_leaderboard
+
+    dataset_info, task_type = validate_model_selection(request, format)
+    try:
+        candidates = model_leaderboard.resolve_candidates(task_type, request.candidates)
+        metric = model_leaderboard.resolve_metric(task_type, request.metric)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    events = produce_model_selection(
+        dataset_info, request, task_type, "leaderboard",
+        {"metric": metric, "candidates": candidates},
+        model_leaderboard.run, candidates, metric,
+        hyperparameters=request.hyperparameters
+    )
+    return model_selection_response(events, format, accept)
+
+@app.post("/ml/search")
+async def search_hyperparameters(
+    request: SearchRequest,
+    format: Optional[str] = None,
+    accept: Optional[str] = Header(None)
+):
+    """Search hyperparameters with successive halving or Hyperband, streaming trials as NDJSON or Server-Sent Events.
+
+    Configurations are sampled from the search spaces of the model types
+    and trained in parallel on a growing share of the training rows (or of
+    the ensemble size); each rung keeps the best 1/eta. A 'prepared' event
+    comes first, then 'trial' and 'rung' events, and a 'complete' event with
+    the best configuration, whose pipeline is stored like a trained model.
+    """
+    from ml.leaderboard import model_leaderboard
+    from ml.search import hyperparameter_search, SEARCH_STRATEGIES, SEARCH_SAMPLERS, SEARCH_RESOURCES
+
+    if request.strategy not in SEARCH_STRATEGIES:
+        raise HTTPException(status_code=400, detail=f"strategy must be one of {list(SEARCH_STRATEGIES)}")
+    if request.sampler not in SEARCH_SAMPLERS:
+        raise HTTPException(status_code=400, detail=f"sampler must be one of {list(SEARCH_SAMPLERS)}")
+    if request.resource not in SEARCH_RESOURCES:
+        raise HTTPException(status_code=400, detail=f"resource must be one of {list(SEARCH_RESOURCES)}")
+    if request.eta is not None and request.eta < 2:
+        raise HTTPException(status_code=400, detail="eta must be at least 2")
+    if request.n_candidates is not None and request.n_candidates < 1:
+        raise HTTPException(status_code=400, detail="n_candidates must be at least 1")
+    if request.max_trials is not None and request.max_trials < 1:
+        raise HTTPException(status_code=400, detail="max_trials must be at least 1")
+
+    dataset_info, task_type = validate_model_selection(request, format)
+    try:
+        model_types = model_leaderboard.resolve_candidates(task_type, request.model_types)
+        metric = model_leaderboard.resolve_metric(task_type, request.metric)
+        hyperparameter_search.resolve_spaces(model_types, request.search_spaces)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    events = produce_model_selection(
+        dataset_info, request, task_type, "search",
+        {"metric": metric, "model_types": model_types, "strategy": request.strategy},
+        hyperparameter_search.run, model_types, metric,
+        strategy=request.strategy,
+        sampler=request.sampler,
+        resource=request.resource,
+        n_candidates=request.n_candidates,
+        eta=request.eta,
+        max_trials=request.max_trials,
+        search_spaces=request.search_spaces,
+        random_state=request.random_state
+    )
+    return model_selection_response(events, format, accept)
+
 @app.post("/ml/predict")
-async def predict(request: PredictionRequest):
+async def predict(request: PredictionRequest, http_request: Request):
+    media_type, encoding = negotiate_response(http_request, tabular=True)
     try:
         # Get model from database
         model_info = db_service.get_model(request.model_id)
         if not model_info:
             raise HTTPException(status_code=404, detail="Model not found")
 
-        # Load model
-        from ml.model_predictor import model_predictor
-
-        # Make predictions
-        result = model_predictor.predict(request.model_id, request.data)
+        # Make predictions in a worker process
+        result = await task_executor.run_cpu(tasks.predict_task, request.model_id, request.data)
 
-        return result
+        if media_type == ARROW:
+            table, metadata = prediction_table(result)
+            return await encoded_response(media_type, encoding, table=table, table_metadata=metadata)
+        return await encoded_response(media_type, encoding, result)
     except Exception as e:
         logger.error(f"Error making predictions: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error making predictions: {str(e)}")
@@ -373,36 +612,187 @@ async def get_model(model_id: str):
 async def list_models():
     return db_service.list_models()
 
+@app.get("/ml/registry/stats")
+async def get_training_registry_stats():
+    """Get the number of recorded training runs and the disk space of deduplicated model files"""
+    from ml.model_trainer import model_trainer
+    from ml.training_registry import training_registry
+    return await task_executor.run_io(training_registry.get_stats, model_trainer.models_dir)
+
+@app.get("/ml/preprocessing-cache/stats")
+async def get_preprocessing_cache_stats():
+    """Get disk usage of the preprocessing cache (counters are those of the API process)"""
+    return await task_executor.run_io(preprocessing_cache.get_stats)
+
+@app.delete("/ml/preprocessing-cache")
+async def clear_preprocessing_cache():
+    """Drop every cached preprocessor and feature matrix"""
+    await task_executor.run_io(preprocessing_cache.clear)
+    return {"message": "Preprocessing cache cleared"}
+
+# Job routes
+@app.get("/jobs/{job_id}")
+async def get_job_progress(job_id: str):
+    """Get the status and progress of a scheduled job"""
+    progress = job_scheduler.get_progress(job_id)
+    if not progress:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    return progress
+
+@app.post("/jobs/{job_id}/cancel")
+async def cancel_job(job_id: str):
+    """Cancel a pending or running job"""
+    if not job_scheduler.cancel(job_id):
+        raise HTTPException(status_code=409, detail="Job not found or already finished")
+
+    return {"job_id": job_id, "message": "Job cancellation requested"}
+
 # EDA routes
 @app.post("/eda/analyze")
-async def analyze_dataset(request: EDARequest):
+async def analyze_dataset(request: EDARequest, http_request: Request):
+    media_type, encoding = negotiate_response(http_request)
     try:
         # Get dataset from database
         dataset_info = db_service.get_dataset(request.dataset_id)
         if not dataset_info:
             raise HTTPException(status_code=404, detail="Dataset not found")
 
-        # Load dataset
-        if dataset_info["file_type"] == "csv":
-            df = pd.read_csv(dataset_info["file_path"])
-        elif dataset_info["file_type"] in ["xls", "xlsx"]:
-            df = pd.read_excel(dataset_info["file_path"])
-        else:
-            raise HTTPException(status_code=400, detail="Unsupported file format")
-
-        # Filter columns if specified
-        if request.columns:
-            df = df[request.columns]
+        # Reports are keyed by the dataset content, so a changed file never hits
+        content_hash = await task_executor.run_io(dataset_loader.content_hash, dataset_info)
+        key = eda_report_cache.make_key(content_hash, request.columns or None, request.target_column)
 
-        # Generate EDA report
-        from eda.automated_eda import automated_eda
-        report = automated_eda.generate_eda_report(df)
+        body = await task_executor.run_io(eda_report_cache.get, request.dataset_id, key)
+        if body is not None:
+            return await encoded_response(media_type, encoding, json_body=body, headers={"X-EDA-Cache": "HIT"})
 
-        return report
+        body = await compute_eda_report(dataset_info, key, request.columns or None, request.target_column)
+        return await encoded_response(media_type, encoding, json_body=body, headers={"X-EDA-Cache": "MISS"})
     except Exception as e:
         logger.error(f"Error generating EDA report: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error generating EDA report: {str(e)}")
 
+@app.get("/eda/{dataset_id}/stream")
+async def stream_eda_report(
+    dataset_id: str,
+    columns: Optional[List[str]] = Query(None),
+    target_column: Optional[str] = None,
+    report_id: Optional[str] = None,
+    after: int = Query(-1, ge=-1),
+    format: Optional[str] = None,
+    accept: Optional[str] = Header(None),
+    last_event_id: Optional[str] = Header(None)
+):
+    """Stream an EDA report section by section as NDJSON or Server-Sent Events.
+
+    The first event carries the dataset metadata; analysis sections and
+    figures follow as they are computed. Every event has a ``report_id`` and
+    a ``seq``: a client that disconnects reconnects with both (``after`` or
+    the ``Last-Event-ID`` header) and receives the remaining events.
+    """
+    if format not in (None, "ndjson", "sse"):
+        raise HTTPException(status_code=400, detail="format must be 'ndjson' or 'sse'")
+
+    dataset_info = db_service.get_dataset(dataset_id)
+    if not dataset_info:
+        raise HTTPException(status_code=404, detail="Dataset not found")
+
+    use_sse = format == "sse" or (format is None and "text/event-stream" in (accept or ""))
+    if last_event_id is not None and last_event_id.isdigit():
+        after = int(last_event_id)
+
+    try:
+        if report_id is None:
+            content_hash = await task_executor.run_io(dataset_loader.content_hash, dataset_info)
+            report_id = eda_report_cache.make_key(content_hash, columns or None, target_column)
+            resumable = False
+        else:
+            resumable = True
+
+        stream = eda_stream_manager.get(report_id)
+        if stream is not None and stream.failed and not resumable:
+            # A new request retries a failed report instead of replaying the error
+            stream = None
+        if stream is None:
+            body = await task_executor.run_io(eda_report_cache.get, dataset_id, report_id)
+            if body is not None:
+                # A replay numbers its events differently from the live stream;
+                # they are path-addressed, so resending all of them is safe
+                stream = eda_stream_manager.replay(report_id, eda_stream_metadata(dataset_info), json.loads(body))
+                after = -1
+            elif resumable:
+                raise HTTPException(status_code=404, detail="EDA report not found")
+            else:
+                stream = eda_stream_manager.start(
+                    report_id,
+                    lambda stream: produce_eda_stream(stream, dataset_info, columns or None, target_column)
+                )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error streaming EDA report: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error streaming EDA report: {str(e)}")
+
+    encode = encode_sse if use_sse else encode_ndjson
+
+    async def body_iterator():
+        async for record in stream.follow(after):
+            yield encode(record)
+
+    return StreamingResponse(
+        body_iterator(),
+        media_type="text/event-stream" if use_sse else "application/x-ndjson",
+        headers={"X-EDA-Report-Id": report_id, "Cache-Control": "no-cache"}
+    )
+
+@app.get("/eda/{dataset_id}/plots/{kind}")
+@app.get("/eda/{dataset_id}/plots/{kind}/{column}")
+async def get_eda_plot(
+    dataset_id: str,
+    kind: str,
+    column: Optional[str] = None,
+    target_column: Optional[str] = None
+):
+    """Get one figure of an EDA report as Plotly JSON.
+
+    Reports only describe their figures (kind, column and target column);
+    each figure is drawn on its first request and cached.
+    """
+    dataset_info = db_service.get_dataset(dataset_id)
+    if not dataset_info:
+        raise HTTPException(status_code=404, detail="Dataset not found")
+
+    for col in (column, target_column):
+        if col is not None and col not in dataset_info["columns"]:
+            raise HTTPException(status_code=400, detail=f"Column '{col}' not found in dataset")
+
+    try:
+        content_hash = await task_executor.run_io(dataset_loader.content_hash, dataset_info)
+        key = eda_report_cache.make_plot_key(content_hash, kind, column, target_column)
+
+        body = await task_executor.run_io(eda_report_cache.get, dataset_id, key)
+        if body is not None:
+            return Response(content=body, media_type="application/json", headers={"X-EDA-Cache": "HIT"})
+
+        body = await compute_eda_plot(dataset_info, key, kind, column, target_column)
+        return Response(content=body, media_type="application/json", headers={"X-EDA-Cache": "MISS"})
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error generating EDA plot: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error generating EDA plot: {str(e)}")
+
+@app.get("/eda/cache/stats")
+async def get_eda_cache_stats():
+    """Get hit/miss counters and disk usage of the EDA report cache"""
+    return await task_executor.run_io(eda_report_cache.get_stats)
+
+@app.delete("/eda/cache/{dataset_id}")
+async def invalidate_eda_cache(dataset_id: str):
+    """Drop the cached EDA reports of a dataset"""
+    await task_executor.run_io(eda_report_cache.invalidate_dataset, dataset_id)
+    return {"dataset_id": dataset_id, "message": "EDA cache invalidated"}
+
 # AI suggestion routes
 @app.post("/ai/suggestions/data-insights")
 async def generate_data_insights(dataset_id: str = Form(...)):
@@ -412,13 +802,8 @@ async def generate_data_insights(dataset_id: str = Form(...)):
         if not dataset_info:
             raise HTTPException(status_code=404, detail="Dataset not found")
 
-        # Load dataset
-        if dataset_info["file_type"] == "csv":
-            df = pd.read_csv(dataset_info["file_path"])
-        elif dataset_info["file_type"] in ["xls", "xlsx"]:
-            df = pd.read_excel(dataset_info["file_path"])
-        else:
-            raise HTTPException(status_code=400, detail="Unsupported file format")
+        # Only the first rows are needed for the preview
+        df = await task_executor.run_io(dataset_loader.load, dataset_info, row_range=(0, 10))
 
         # Generate data preview
         data_preview = df.head(10).to_string()
@@ -452,17 +837,10 @@ async def generate_feature_engineering_suggestions(
         if not dataset_info:
             raise HTTPException(status_code=404, detail="Dataset not found")
 
-        # Load dataset
-        if dataset_info["file_type"] == "csv":
-            df = pd.read_csv(dataset_info["file_path"])
-        elif dataset_info["file_type"] in ["xls", "xlsx"]:
-            df = pd.read_excel(dataset_info["file_path"])
-        else:
-            raise HTTPException(status_code=400, detail="Unsupported file format")
-
-        # Generate dataset profile
-        from data_processing.data_processor import data_processor
-        dataset_profile = data_processor.get_dataset_profile(df)
+        # Generate dataset profile (sketch-based for very large datasets)
+        dataset_profile = await build_dataset_profile(
+            dataset_info, streaming=dataset_info["row_count"] > STREAMING_PROFILE_MIN_ROWS
+        )
 
         # Generate suggestions
         from ai.gemini_client import gemini_client
@@ -539,79 +917,380 @@ async def generate_tutorial(
         raise HTTPException(status_code=500, detail=f"Error generating tutorial: {str(e)}")
 
 # Helper functions
-async def train_model_task(
-    job_id: str,
-    df: pd.DataFrame,
-    target_column: str,
-    feature_columns: List[str],
-    model_type: str,
+def write_upload_chunk(f, hasher, chunk: bytes) -> None:
+    """Write a chunk of an upload to disk and add it to the content hash."""
+    f.write(chunk)
+    hasher.update(chunk)
+
+def negotiate_response(http_request: Request, tabular: bool = False) -> Tuple[str, Optional[str]]:
+    """Pick the format and content encoding of a response from the request headers.
+
+    Raises a 406 error when none of the available formats is acceptable.
+    """
+    media_type = response_encoder.negotiate(http_request.headers.get("accept"), tabular=tabular)
+    if media_type is None:
+        raise HTTPException(
+            status_code=406,
+            detail=f"Acceptable formats: {', '.join(response_encoder.formats(tabular))}"
+        )
+    return media_type, response_encoder.negotiate_encoding(http_request.headers.get("accept-encoding"))
+
+async def encoded_response(
+    media_type: str,
+    encoding: Optional[str],
+    payload: Any = None,
+    table: Optional[pd.DataFrame] = None,
+    table_metadata: Optional[Dict[str, Any]] = None,
+    json_body: Optional[bytes] = None,
+    headers: Optional[Dict[str, str]] = None
+) -> Response:
+    """Serialize and compress a response off the event loop."""
+    body, encoded_headers = await task_executor.run_io(
+        response_encoder.encode, payload, media_type, encoding, table, table_metadata, json_body
+    )
+    return Response(content=body, media_type=media_type, headers={**encoded_headers, **(headers or {})})
+
+def prediction_table(result: Dict[str, Any]) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    """Split a prediction result into a table (one row per input) and its metadata."""
+    table = pd.DataFrame({"prediction": result["predictions"]})
+    if result["probabilities"] is not None:
+        probabilities = pd.DataFrame(result["probabilities"])
+        table[[f"probability_{i}" for i in probabilities.columns]] = probabilities.to_numpy()
+    metadata = {key: value for key, value in result.items() if key not in ("predictions", "probabilities")}
+    return table, metadata
+
+async def compute_eda_report(
+    dataset_info: Dict[str, Any],
+    key: str,
+    columns: Optional[List[str]] = None,
+    target_column: Optional[str] = None
+) -> bytes:
+    """Generate an EDA report in a worker process and store it in the cache.
+
+    Concurrent requests for the same report wait for a single computation.
+    The worker loads the requested columns itself instead of receiving a
+    pickled frame.
+    """
+    async def compute() -> bytes:
+        report = await task_executor.run_cpu(
+            tasks.eda_report_task, dataset_info, columns=columns, target_column=target_column
+        )
+        return await task_executor.run_io(eda_report_cache.put, dataset_info["id"], key, report)
+
+    return await compute_once(key, compute)
+
+async def compute_eda_plot(
+    dataset_info: Dict[str, Any],
+    key: str,
+    kind: str,
+    column: Optional[str] = None,
+    target_column: Optional[str] = None
+) -> bytes:
+    """Draw an EDA figure in a worker process and store it in the cache."""
+    async def compute() -> bytes:
+        body = await task_executor.run_cpu(tasks.eda_plot_task, dataset_info, kind, column, target_column)
+        return await task_executor.run_io(eda_report_cache.put_body, dataset_info["id"], key, body)
+
+    return await compute_once(key, compute)
+
+async def compute_once(key: str, compute) -> bytes:
+    """Run ``compute`` unless a computation of ``key`` is already in flight, then share its result."""
+    in_flight = eda_in_flight.get(key)
+    if in_flight is not None:
+        return await asyncio.shield(in_flight)
+
+    future = asyncio.get_running_loop().create_future()
+    eda_in_flight[key] = future
+    try:
+        body = await compute()
+        future.set_result(body)
+        return body
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+    except Exception as e:
+        future.set_exception(e)
+        # Waiters re-raise it; mark it retrieved so it is not logged as unhandled
+        future.exception()
+        raise
+    finally:
+        del eda_in_flight[key]
+
+def eda_stream_metadata(dataset_info: Dict[str, Any]) -> Dict[str, Any]:
+    """Dataset metadata sent as the first event of an EDA report stream."""
+    return {
+        "dataset_id": dataset_info["id"],
+        "name": dataset_info.get("name"),
+        "row_count": dataset_info.get("row_count"),
+        "column_count": dataset_info.get("column_count"),
+        "columns": dataset_info.get("columns"),
+    }
+
+async def produce_eda_stream(
+    stream,
+    dataset_info: Dict[str, Any],
+    columns: Optional[List[str]] = None,
+    target_column: Optional[str] = None
+) -> None:
+    """Generate an EDA report in a worker process and publish its events.
+
+    The metadata event is published from the database record before the
+    dataset is even loaded. The worker sends the report events through a
+    manager queue as sections complete and stores the finished report in
+    the EDA report cache.
+    """
+    await stream.publish("metadata", eda_stream_metadata(dataset_info))
+
+    loop = asyncio.get_running_loop()
+    events = await task_executor.run_io(task_executor.create_queue)
+    relayed = asyncio.Queue()
+    relay = asyncio.ensure_future(task_executor.run_thread(relay_events, events, loop, relayed))
+    relay.add_done_callback(lambda _: relayed.put_nowait(None))
+    worker = asyncio.ensure_future(task_executor.run_cpu(
+        tasks.eda_stream_task, dataset_info, stream.report_id, events,
+        columns=columns, target_column=target_column
+    ))
+
+    async def end_relay() -> None:
+        # Every event of the worker is queued once it returns (or dies)
+        await asyncio.wait([worker])
+        await task_executor.run_io(events.put, None)
+
+    ending = asyncio.ensure_future(end_relay())
+    while True:
+        event = await relayed.get()
+        if event is None:
+            break
+        await stream.publish("section", event["data"], path=event["path"])
+    await ending
+    await relay
+
+    # Raises the worker's exception, published as an error event
+    worker.result()
+    await stream.publish("complete")
+
+def relay_events(source, loop: asyncio.AbstractEventLoop, target: asyncio.Queue) -> None:
+    """Forward the events of a worker queue to an asyncio queue, up to the end marker (None).
+
+    Blocks on the worker queue, so it runs on a thread of its own.
+    """
+    while True:
+        event = source.get()
+        if event is None:
+            return
+        loop.call_soon_threadsafe(target.put_nowait, event)
+
+async def build_dataset_profile(dataset_info: Dict[str, Any], streaming: bool = False) -> Dict[str, Any]:
+    """Profile a dataset in worker processes.
+
+    The streaming profile is built from row-group-aligned partitions of the
+    columnar copy in parallel, and the partial sketches are merged here.
+    """
+    if not streaming:
+        return await task_executor.run_cpu(tasks.dataset_profile_task, dataset_info)
+
+    from data_processing.data_processor import data_processor
+    from data_processing.streaming_profiler import merge_profiles
+
+    source_path = dataset_loader.source_path(dataset_info)
+    if source_path.endswith(".parquet"):
+        partitions = data_processor.get_row_partitions(source_path, task_executor.cpu_workers)
+    else:
+        partitions = [None]
+
+    partials = await asyncio.gather(*[
+        task_executor.run_cpu(tasks.streaming_profile_task, dataset_info, row_range)
+        for row_range in partitions
+    ])
+    return await task_executor.run_io(merge_profiles, partials)
+
+def infer_task_type(dataset_info: Dict[str, Any], target_column: str) -> str:
+    """Determine the task type from the stored dtype of the target column."""
+    try:
+        target_dtype = pd.api.types.pandas_dtype(dataset_info["columns"][target_column])
+        is_numeric_target = pd.api.types.is_numeric_dtype(target_dtype)
+    except TypeError:
+        is_numeric_target = False
+    return "regression" if is_numeric_target else "classification"
+
+def validate_model_selection(request: Union[LeaderboardRequest, SearchRequest], format: Optional[str]) -> Tuple[Dict[str, Any], str]:
+    """Validate the options shared by leaderboard and search requests.
+
+    Returns:
+        The dataset record and the task type.
+    """
+    if format not in (None, "ndjson", "sse"):
+        raise HTTPException(status_code=400, detail="format must be 'ndjson' or 'sse'")
+    if request.sparse_output not in (True, False, "auto"):
+        raise HTTPException(status_code=400, detail="sparse_output must be true, false or 'auto'")
+    if request.encoding_method not in ("auto", "onehot"):
+        raise HTTPException(status_code=400, detail="encoding_method must be 'auto' or 'onehot'")
+    if request.time_budget_seconds is not None and request.time_budget_seconds <= 0:
+        raise HTTPException(status_code=400, detail="time_budget_seconds must be positive")
+    if request.max_workers is not None and request.max_workers < 1:
+        raise HTTPException(status_code=400, detail="max_workers must be at least 1")
+
+    dataset_info = db_service.get_dataset(request.dataset_id)
+    if not dataset_info:
+        raise HTTPException(status_code=404, detail="Dataset not found")
+    for col in [request.target_column] + request.feature_columns:
+        if col not in dataset_info["columns"]:
+            raise HTTPException(status_code=400, detail=f"Column '{col}' not found in dataset")
+
+    return dataset_info, infer_task_type(dataset_info, request.target_column)
+
+def model_selection_response(events, format: Optional[str], accept: Optional[str]) -> StreamingResponse:
+    """Stream the events of a leaderboard or search as NDJSON or Server-Sent Events, numbered by ``seq``."""
+    use_sse = format == "sse" or (format is None and "text/event-stream" in (accept or ""))
+    encode = encode_sse if use_sse else encode_ndjson
+
+    async def body_iterator():
+        seq = 0
+        async for event in events:
+            yield encode({"seq": seq, **event})
+            seq += 1
+
+    return StreamingResponse(
+        body_iterator(),
+        media_type="text/event-stream" if use_sse else "application/x-ndjson",
+        headers={"Cache-Control": "no-cache"}
+    )
+
+async def produce_model_selection(
+    dataset_info: Dict[str, Any],
+    request: Union[LeaderboardRequest, SearchRequest],
     task_type: str,
-    hyperparameters: Optional[Dict[str, Any]] = None,
-    test_size: float = 0.2
+    source: str,
+    summary: Dict[str, Any],
+    run: Callable,
+    *args,
+    **kwargs
 ):
+    """Run a leaderboard or a search and yield its events.
+
+    The data is prepared once in a CPU worker; ``run(prepared, task_type,
+    *args, ...)`` then drives the trial processes from a thread of its own,
+    and its events are relayed as they arrive. If the client disconnects, the trials
+    still running are stopped. The best model gets a model record.
+    """
+    from ml.leaderboard import model_leaderboard
+
+    stop = threading.Event()
+    loop = asyncio.get_running_loop()
+    events = asyncio.Queue()
+    prepared = None
+    runner = None
     try:
-        # Get job from database
-        job_info = db_service.get_job(job_id)
-        if not job_info:
-            logger.error(f"Job not found: {job_id}")
-            return
-
-        # Update job status
-        job_info["status"] = "running"
-        job_info["updated_at"] = datetime.now()
-        db_service.save_job(job_info)
-
-        # Train model
-        from ml.model_trainer import model_trainer
-        result = model_trainer.train_model(
-            df=df,
-            target_column=target_column,
-            feature_columns=feature_columns,
-            model_type=model_type,
-            task_type=task_type,
-            hyperparameters=hyperparameters,
-            test_size=test_size
-        )
-
-        # Create model info
-        model_id = result["model_id"]
-        model_info = {
-            "id": model_id,
-            "name": f"{model_type} for {target_column}",
-            "dataset_id": job_info["params"]["dataset_id"],
-            "model_type": model_type,
-            "target_column": target_column,
-            "feature_columns": feature_columns,
-            "hyperparameters": hyperparameters,
-            "metrics": result["metrics"],
-            "status": "trained",
-            "created_at": datetime.now()
-        }
-
-        # Store model info in database
-        db_service.save_model(model_info)
-
-        # Update job status
-        job_info["status"] = "completed"
-        job_info["result"] = {
+        prepared = await task_executor.run_cpu(tasks.leaderboard_prepare_task, dataset_info, {
+            "target_column": request.target_column,
+            "feature_columns": request.feature_columns,
+            "task_type": task_type,
+            "test_size": request.test_size,
+            "sparse_output": request.sparse_output,
+            "encoding_method": request.encoding_method
+        })
+        yield {"event": "prepared", "data": {
+            "dataset_id": dataset_info["id"],
+            "task_type": task_type,
+            **summary,
+            **{key: value for key, value in prepared.items() if key not in ("work_dir", "matrix_path", "started_at")}
+        }}
+
+        def on_event(event: Dict[str, Any]) -> None:
+            try:
+                loop.call_soon_threadsafe(events.put_nowait, event)
+            except RuntimeError:
+                # The event loop was closed meanwhile
+                pass
+
+        runner = asyncio.ensure_future(task_executor.run_thread(
+            run, prepared, task_type, *args,
+            time_budget=request.time_budget_seconds,
+            max_workers=request.max_workers,
+            on_event=on_event,
+            stop_event=stop,
+            **kwargs
+        ))
+        # Queued after every event the run sent, which marks the end
+        runner.add_done_callback(lambda _: events.put_nowait(None))
+
+        while True:
+            event = await events.get()
+            if event is None:
+                break
+            yield event
+
+        result = runner.result()
+        if result["best"] is not None:
+            save_selected_model(dataset_info, request, result["best"], source)
+        yield {"event": "complete", "data": result}
+    except Exception as e:
+        logger.error(f"Error running {source}: {str(e)}")
+        yield {"event": "error", "data": {"detail": str(e)}}
+    finally:
+        stop.set()
+        if prepared is not None and runner is None:
+            model_leaderboard.cleanup(prepared)
+
+def save_selected_model(
+    dataset_info: Dict[str, Any],
+    request: Union[LeaderboardRequest, SearchRequest],
+    best: Dict[str, Any],
+    source: str
+) -> None:
+    """Store the model record of the best model of a leaderboard or search."""
+    model_info = {
+        "id": best["model_id"],
+        "name": f"{best['model_type']} for {request.target_column} ({source})",
+        "dataset_id": dataset_info["id"],
+        "model_type": best["model_type"],
+        "target_column": request.target_column,
+        "feature_columns": request.feature_columns,
+        "hyperparameters": best["hyperparameters"],
+        "metrics": best["metrics"],
+        "status": "trained",
+        "created_at": datetime.now()
+    }
+    db_service.save_model(model_info)
+    logger.info(f"Best model of {source} stored: {best['model_id']}")
+
+def save_trained_model(job_info: Dict[str, Any], result: Dict[str, Any]) -> Dict[str, Any]:
+    """Store the model record of a finished training job.
+
+    Runs in the API process when the scheduler reports the job completed.
+    """
+    params = job_info["params"]
+    model_id = result["model_id"]
+    if result.get("reused") and db_service.get_model(model_id):
+        logger.info(f"Identical model already trained: {model_id}")
+        return {
             "model_id": model_id,
-            "metrics": result["metrics"]
+            "metrics": result["metrics"],
+            "reused": True
         }
-        job_info["updated_at"] = datetime.now()
-        db_service.save_job(job_info)
 
-        logger.info(f"Model training completed: {model_id}")
-    except Exception as e:
-        logger.error(f"Error in model training task: {str(e)}")
-
-        try:
-            # Get job from database
-            job_info = db_service.get_job(job_id)
-            if job_info:
-                # Update job status
-                job_info["status"] = "failed"
-                job_info["result"] = {"error": str(e)}
-                job_info["updated_at"] = datetime.now()
-                db_service.save_job(job_info)
-        except Exception as inner_e:
-            logger.error(f"Error updating job status: {str(inner_e)}")
+    model_info = {
+        "id": model_id,
+        "name": f"{params['model_type']} for {params['target_column']}",
+        "dataset_id": params["dataset_id"],
+        "model_type": params["model_type"],
+        "target_column": params["target_column"],
+        "feature_columns": params["feature_columns"],
+        "hyperparameters": params["hyperparameters"],
+        "metrics": result["metrics"],
+        "status": "trained",
+        "created_at": datetime.now()
+    }
+
+    # Store model info in database
+    db_service.save_model(model_info)
+    logger.info(f"Model training completed: {model_id}")
+
+    return {
+        "model_id": model_id,
+        "metrics": result["metrics"],
+        "reused": result.get("reused", False)
+    }
+
+job_scheduler.register("model_training", tasks.training_job, on_complete=save_trained_model)
+job_scheduler.register("model_streaming_training", tasks.streaming_training_job, on_complete=save_trained_model)
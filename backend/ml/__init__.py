@@ -1,4 +1,9 @@
 from .model_trainer import model_trainer
 from .model_predictor import model_predictor
+from .leaderboard import model_leaderboard
+from .search import hyperparameter_search
+from .preprocessing_cache import preprocessing_cache
+from .training_registry import training_registry
+from .streaming_trainer import streaming_trainer
 
-__all__ = ["model_trainer", "model_predictor"]
+__all__ = ["model_trainer", "model_predictor", "model_leaderboard", "hyperparameter_search", "preprocessing_cache", "training_registry", "streaming_trainer"]
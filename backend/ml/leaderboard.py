@@ -0,0 +1,346 @@
+import os
+import time
+import shutil
+import logging
+import tempfile
+import threading
+from typing import Dict, List, Any, Callable, Optional, Union
+
+import numpy as np
+import pandas as pd
+import joblib
+
+from .trial_pool import TrialPool
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Candidates trained at the same time, each in its own process
+LEADERBOARD_WORKERS = int(os.environ.get("LEADERBOARD_WORKERS", os.cpu_count() or 1))
+# Default wall-clock budget of a leaderboard in seconds, preprocessing included
+LEADERBOARD_TIME_BUDGET = float(os.environ.get("LEADERBOARD_TIME_BUDGET", 600))
+LEADERBOARD_START_METHOD = os.environ.get("LEADERBOARD_START_METHOD", "spawn")
+# Where the shared feature matrices are written (system temporary directory if empty)
+LEADERBOARD_WORK_DIR = os.environ.get("LEADERBOARD_WORK_DIR") or None
+
+# Ranking metric used when none is given, and metrics where lower is better
+DEFAULT_METRICS = {"classification": "accuracy", "regression": "r2"}
+TASK_METRICS = {
+    "classification": ("accuracy", "precision", "recall", "f1"),
+    "regression": ("r2", "mse", "mae", "rmse"),
+}
+LOWER_IS_BETTER = {"mse", "mae", "rmse"}
+
+def _train_candidate(
+    matrix_path: str,
+    model_type: str,
+    task_type: str,
+    hyperparameters: Optional[Dict[str, Any]],
+    binary: bool,
+    model_path: str
+) -> Dict[str, Any]:
+    """Train one candidate; runs in a trial process.
+
+    Memory-maps the shared feature matrix, fits and evaluates one model and
+    saves it, with the shared preprocessor, as a complete pipeline.
+    """
+    from sklearn.pipeline import Pipeline
+    from ml.model_trainer import model_trainer
+
+    shared = joblib.load(matrix_path, mmap_mode="r")
+    model, model_params = model_trainer.create_model(model_type, task_type, hyperparameters)
+
+    started_at = time.time()
+    model.fit(shared["X_train"], shared["y_train"])
+    fit_seconds = time.time() - started_at
+    y_pred = model.predict(shared["X_test"])
+    metrics = model_trainer.compute_metrics(task_type, shared["y_test"], y_pred, binary)
+
+    pipeline = Pipeline([("preprocessor", shared["preprocessor"]), ("model", model)])
+    joblib.dump(pipeline, model_path)
+    return {
+        "metrics": metrics,
+        "hyperparameters": model_params,
+        "fit_seconds": fit_seconds,
+        "model_path": model_path,
+    }
+
+class ModelLeaderboard:
+    """Trains the candidate models of a dataset concurrently and ranks them.
+
+    The data is split and preprocessed once; the fitted preprocessor and the
+    train/test feature matrices are written to one uncompressed joblib file
+    that candidate processes memory-map, so they share the matrices (dense
+    arrays or the arrays of a CSR matrix) through the page cache instead of
+    each holding a copy. Each candidate runs in its own process, so the ones
+    still running when the time budget is spent can be terminated.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = LEADERBOARD_WORKERS,
+        time_budget: float = LEADERBOARD_TIME_BUDGET,
+        start_method: str = LEADERBOARD_START_METHOD,
+        work_dir: Optional[str] = LEADERBOARD_WORK_DIR
+    ):
+        """Initialize the ModelLeaderboard.
+
+        Args:
+            max_workers: Maximum number of concurrently trained candidates.
+            time_budget: Default wall-clock budget of a leaderboard in seconds.
+            start_method: multiprocessing start method for candidate processes.
+            work_dir: Parent directory of the shared feature matrices.
+        """
+        self.max_workers = max_workers
+        self.time_budget = time_budget
+        self.start_method = start_method
+        self.work_dir = work_dir
+
+    def resolve_candidates(self, task_type: str, candidates: Union[str, List[str]] = "all") -> List[str]:
+        """Validate a candidate list against the model registry.
+
+        Args:
+            task_type: Type of task ('classification' or 'regression').
+            candidates: Model types, or 'all' for every registered model.
+
+        Returns:
+            The model types, without duplicates.
+        """
+        from ml.model_trainer import model_trainer
+
+        available = list(model_trainer.get_models(task_type))
+        if candidates == "all":
+            return available
+        if isinstance(candidates, str) or not candidates:
+            raise ValueError("candidates must be 'all' or a non-empty list of model types")
+        unknown = [model_type for model_type in candidates if model_type not in available]
+        if unknown:
+            raise ValueError(f"Invalid model types: {unknown}. Available models: {available}")
+        return list(dict.fromkeys(candidates))
+
+    def resolve_metric(self, task_type: str, metric: Optional[str] = None) -> str:
+        """Validate the ranking metric of a task (its default if None)."""
+        if metric is None:
+            return DEFAULT_METRICS[task_type]
+        if metric not in TASK_METRICS[task_type]:
+            raise ValueError(f"Invalid metric for {task_type}: {metric}. Must be one of {list(TASK_METRICS[task_type])}")
+        return metric
+
+    def prepare(
+        self,
+        df: pd.DataFrame,
+        target_column: str,
+        feature_columns: List[str],
+        task_type: str,
+        test_size: float = 0.2,
+        random_state: int = 42,
+        sparse_output: Union[bool, str] = "auto",
+        encoding_method: str = "auto",
+        dataset_fingerprint: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Split and preprocess a dataset once and write the shared feature matrices.
+
+        Args:
+            df: Input DataFrame.
+            target_column: Name of the target column.
+            feature_columns: List of feature columns.
+            task_type: Type of task ('classification' or 'regression').
+            test_size: Proportion of data to use for testing.
+            random_state: Random state of the split and the encoders.
+            sparse_output: Sparse (True), dense (False) or density-based ('auto')
+                feature matrix.
+            encoding_method: 'auto' (cardinality-aware) or 'onehot'.
+            dataset_fingerprint: Content hash of the dataset, keying the fitted
+                preprocessing in the preprocessing cache; computed from the
+                frame if not given.
+
+        Returns:
+            Description of the prepared data: the path of the shared file and
+            its work directory, the feature matrix estimate, the encodings,
+            row counts and the class names of an encoded target.
+        """
+        from sklearn.model_selection import train_test_split
+        from ml.model_trainer import model_trainer
+        from ml.preprocessing_cache import preprocessing_cache, frame_fingerprint
+
+        started_at = time.time()
+        work_dir = tempfile.mkdtemp(prefix="leaderboard-", dir=self.work_dir)
+        try:
+            X = df[feature_columns]
+            y, class_names = model_trainer.prepare_target(df[target_column], task_type)
+            X_train, X_test, y_train, y_test = train_test_split(
+                X, y, test_size=test_size, random_state=random_state
+            )
+
+            preprocessor, feature_matrix, encodings = model_trainer.build_preprocessor(
+                X_train, y_train, task_type, sparse_output, encoding_method, random_state
+            )
+
+            # The same split as model training, so both share the cache entry
+            if dataset_fingerprint is None:
+                dataset_fingerprint = frame_fingerprint(df[feature_columns + [target_column]])
+            config = model_trainer.preprocessing_config(
+                sparse_output, encoding_method, random_state, feature_matrix, encodings
+            )
+            split = {"kind": "holdout", "test_size": test_size, "random_state": random_state}
+            key = preprocessing_cache.make_key(dataset_fingerprint, feature_columns, target_column, split, config)
+            shared, cached = model_trainer.preprocess_split(
+                preprocessor, feature_matrix, X_train, y_train, X_test, y_test, key
+            )
+            X_train, y_train, X_test = shared["X_train"], shared["y_train"], shared["X_test"]
+
+            # Uncompressed, so that workers can memory-map the arrays; a hard
+            # link to the cache entry, which eviction then cannot pull away
+            matrix_path = preprocessing_cache.materialize(key, shared, os.path.join(work_dir, "shared.joblib"))
+
+            prepared = {
+                "work_dir": work_dir,
+                "matrix_path": matrix_path,
+                "started_at": started_at,
+                "preprocess_seconds": time.time() - started_at,
+                "train_rows": int(X_train.shape[0]),
+                "test_rows": int(X_test.shape[0]),
+                "feature_matrix": feature_matrix,
+                "encodings": encodings,
+                "cached": cached,
+                "binary": bool(len(np.unique(y_train)) == 2),
+                "class_names": class_names.tolist() if class_names is not None else None,
+            }
+            logger.info(
+                f"Leaderboard data {'loaded from cache' if cached else 'prepared'} in {prepared['preprocess_seconds']:.2f}s: "
+                f"{feature_matrix['format']} {X_train.shape[0]} x {X_train.shape[1]}"
+            )
+            return prepared
+        except Exception as e:
+            shutil.rmtree(work_dir, ignore_errors=True)
+            logger.error(f"Error preparing leaderboard data: {str(e)}")
+            raise
+
+    @staticmethod
+    def rank(entries: List[Dict[str, Any]], metric: str) -> List[Dict[str, Any]]:
+        """Rank the completed candidates by a metric, best first.
+
+        Args:
+            entries: Candidate entries.
+            metric: Ranking metric.
+
+        Returns:
+            ``{"rank", "model_type", "score"}`` for each completed candidate.
+        """
+        completed = [entry for entry in entries if entry["status"] == "completed"]
+        sign = 1 if metric in LOWER_IS_BETTER else -1
+        completed.sort(key=lambda entry: (sign * entry["score"], entry["finished_at"]))
+        return [
+            {"rank": rank, "model_type": entry["model_type"], "score": entry["score"]}
+            for rank, entry in enumerate(completed, start=1)
+        ]
+
+    def run(
+        self,
+        prepared: Dict[str, Any],
+        task_type: str,
+        candidates: List[str],
+        metric: str,
+        time_budget: Optional[float] = None,
+        max_workers: Optional[int] = None,
+        hyperparameters: Optional[Dict[str, Dict[str, Any]]] = None,
+        on_event: Optional[Callable[[Dict[str, Any]], None]] = None,
+        stop_event: Optional[threading.Event] = None
+    ) -> Dict[str, Any]:
+        """Train the candidates on the prepared data and rank them as they finish.
+
+        Blocks until every candidate has finished, the budget is spent or
+        ``stop_event`` is set. Candidates still running then are terminated
+        ('timed_out' or 'cancelled'); those not started are 'skipped'. The
+        best candidate's pipeline is moved to the models directory and the
+        prepared data is removed.
+
+        Args:
+            prepared: Result of ``prepare``.
+            task_type: Type of task ('classification' or 'regression').
+            candidates: Model types (see ``resolve_candidates``).
+            metric: Ranking metric (see ``resolve_metric``).
+            time_budget: Wall-clock budget in seconds, counted from the start
+                of ``prepare`` (default budget if None).
+            max_workers: Concurrent candidates (default if None, at most the default).
+            hyperparameters: Hyperparameters by model type, overriding the defaults.
+            on_event: Called with ``{"event": "candidate", "data": entry,
+                "leaderboard": ranking}`` each time a candidate finishes.
+            stop_event: Set to stop early, e.g. when the client disconnects.
+
+        Returns:
+            Dictionary with the metric, the ranking, all candidate entries,
+            the best entry (with its ``model_id``), the elapsed time and
+            whether the budget ran out.
+        """
+        from ml.model_trainer import model_trainer
+        from ml.training_registry import training_registry
+
+        budget = self.time_budget if time_budget is None else time_budget
+        hyperparameters = hyperparameters or {}
+        # Requests may lower the number of workers, never raise it
+        pool = TrialPool(min(max_workers or self.max_workers, self.max_workers, len(candidates)), self.start_method)
+        entries = {model_type: {"model_type": model_type, "status": "pending"} for model_type in candidates}
+
+        def on_finish(model_type: str, status: str, payload: Any) -> None:
+            entry = entries[model_type]
+            entry.update(status=status, finished_at=time.time() - prepared["started_at"])
+            if status == "completed":
+                entry.update(payload, score=payload["metrics"][metric])
+            else:
+                entry["error"] = payload
+            if on_event is not None:
+                on_event({"event": "candidate", "data": entry, "leaderboard": self.rank(list(entries.values()), metric)})
+
+        try:
+            budget_exhausted = pool.run(
+                [
+                    (model_type, _train_candidate, (
+                        prepared["matrix_path"], model_type, task_type, hyperparameters.get(model_type),
+                        prepared["binary"], os.path.join(prepared["work_dir"], f"{model_type}.joblib")
+                    ))
+                    for model_type in candidates
+                ],
+                on_finish,
+                deadline=prepared["started_at"] + budget,
+                stop_event=stop_event
+            )
+
+            ranking = self.rank(list(entries.values()), metric)
+            best = None
+            if ranking:
+                best = entries[ranking[0]["model_type"]]
+                best["model_id"] = training_registry.new_model_id(best["model_type"], task_type)
+                model_path = os.path.join(model_trainer.models_dir, f"{best['model_id']}.joblib")
+                shutil.move(best["model_path"], model_path)
+                best["model_path"] = model_path
+            for entry in entries.values():
+                if entry is not best:
+                    entry.pop("model_path", None)
+
+            elapsed = time.time() - prepared["started_at"]
+            logger.info(
+                f"Leaderboard finished in {elapsed:.2f}s: {len(ranking)} of {len(candidates)} candidates completed"
+            )
+            return {
+                "metric": metric,
+                "leaderboard": ranking,
+                "candidates": list(entries.values()),
+                "best": best,
+                "elapsed_seconds": elapsed,
+                "budget_exhausted": budget_exhausted,
+            }
+        except Exception as e:
+            logger.error(f"Error running leaderboard: {str(e)}")
+            raise
+        finally:
+            self.cleanup(prepared)
+
+    @staticmethod
+    def cleanup(prepared: Dict[str, Any]) -> None:
+        """Remove the shared feature matrices and candidate models of a leaderboard."""
+        shutil.rmtree(prepared["work_dir"], ignore_errors=True)
+
+# Create a singleton instance
+model_leaderboard = ModelLeaderboard()
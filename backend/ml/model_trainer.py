@@ -3,25 +3,11 @@ import numpy as np
 import os
 import json
 import logging
+import importlib
 import joblib
-from typing import Dict, List, Any, Optional, Tuple, Union
-from sklearn.model_selection import train_test_split, cross_val_score, GridSearchCV
-from sklearn.preprocessing import StandardScaler, LabelEncoder
-from sklearn.pipeline import Pipeline
-from sklearn.compose import ColumnTransformer
-from sklearn.impute import SimpleImputer
-from sklearn.metrics import (
-    accuracy_score, precision_score, recall_score, f1_score,
-    r2_score, mean_squared_error, mean_absolute_error
-)
+from typing import Dict, List, Any, Callable, Optional, Tuple, Union
 
-# ML models
-from sklearn.linear_model import LogisticRegression, LinearRegression, Ridge, Lasso
-from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor, GradientBoostingClassifier, GradientBoostingRegressor
-from sklearn.svm import SVC, SVR
-from sklearn.neighbors import KNeighborsClassifier, KNeighborsRegressor
-from sklearn.tree import DecisionTreeClassifier, DecisionTreeRegressor
-from sklearn.neural_network import MLPClassifier, MLPRegressor
+from data_processing.transform_graph import estimate_output_size, use_sparse, sparse_frame_to_csr
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -39,27 +25,27 @@ class ModelTrainer:
         self.models_dir = models_dir
         os.makedirs(models_dir, exist_ok=True)
         
-        # Define available models
+        # Define available models, as import paths resolved when a model is trained
         self.classification_models = {
-            "logistic_regression": LogisticRegression,
-            "random_forest": RandomForestClassifier,
-            "gradient_boosting": GradientBoostingClassifier,
-            "svm": SVC,
-            "knn": KNeighborsClassifier,
-            "decision_tree": DecisionTreeClassifier,
-            "mlp": MLPClassifier
+            "logistic_regression": "sklearn.linear_model.LogisticRegression",
+            "random_forest": "sklearn.ensemble.RandomForestClassifier",
+            "gradient_boosting": "sklearn.ensemble.GradientBoostingClassifier",
+            "svm": "sklearn.svm.SVC",
+            "knn": "sklearn.neighbors.KNeighborsClassifier",
+            "decision_tree": "sklearn.tree.DecisionTreeClassifier",
+            "mlp": "sklearn.neural_network.MLPClassifier"
         }
         
         self.regression_models = {
-            "linear_regression": LinearRegression,
-            "ridge": Ridge,
-            "lasso": Lasso,
-            "random_forest": RandomForestRegressor,
-            "gradient_boosting": GradientBoostingRegressor,
-            "svm": SVR,
-            "knn": KNeighborsRegressor,
-            "decision_tree": DecisionTreeRegressor,
-            "mlp": MLPRegressor
+            "linear_regression": "sklearn.linear_model.LinearRegression",
+            "ridge": "sklearn.linear_model.Ridge",
+            "lasso": "sklearn.linear_model.Lasso",
+            "random_forest": "sklearn.ensemble.RandomForestRegressor",
+            "gradient_boosting": "sklearn.ensemble.GradientBoostingRegressor",
+            "svm": "sklearn.svm.SVR",
+            "knn": "sklearn.neighbors.KNeighborsRegressor",
+            "decision_tree": "sklearn.tree.DecisionTreeRegressor",
+            "mlp": "sklearn.neural_network.MLPRegressor"
         }
         
         # Default hyperparameters for each model
@@ -76,6 +62,326 @@ class ModelTrainer:
             "lasso": {"alpha": 1.0}
         }
     
+    @staticmethod
+    def _load_model_class(import_path: str) -> type:
+        """Import a model class from its dotted import path."""
+        module_name, class_name = import_path.rsplit(".", 1)
+        return getattr(importlib.import_module(module_name), class_name)
+    
+    def get_models(self, task_type: str) -> Dict[str, str]:
+        """Get the registry of models available for a task.
+        
+        Args:
+            task_type: Type of task ('classification' or 'regression').
+            
+        Returns:
+            Dictionary mapping model types to the import paths of their classes.
+        """
+        if task_type not in ['classification', 'regression']:
+            raise ValueError(f"Invalid task type: {task_type}. Must be 'classification' or 'regression'.")
+        return self.classification_models if task_type == 'classification' else self.regression_models
+    
+    def create_model(
+        self,
+        model_type: str,
+        task_type: str,
+        hyperparameters: Optional[Dict[str, Any]] = None
+    ) -> Tuple[Any, Dict[str, Any]]:
+        """Create an unfitted model with its default and overriding hyperparameters.
+        
+        Args:
+            model_type: Type of model (e.g., 'random_forest').
+            task_type: Type of task ('classification' or 'regression').
+            hyperparameters: Hyperparameters overriding the defaults.
+            
+        Returns:
+            The model and the hyperparameters it was created with.
+        """
+        model_dict = self.get_models(task_type)
+        if model_type not in model_dict:
+            raise ValueError(f"Invalid model type: {model_type}. Available models: {list(model_dict.keys())}")
+        
+        model_class = self._load_model_class(model_dict[model_type])
+        model_params = dict(self.default_hyperparameters.get(model_type, {}))
+        if hyperparameters:
+            model_params.update(hyperparameters)
+        return model_class(**model_params), model_params
+    
+    def prepare_target(self, y: pd.Series, task_type: str) -> Tuple[Any, Optional[np.ndarray]]:
+        """Label encode a categorical classification target.
+        
+        Args:
+            y: Target values.
+            task_type: Type of task ('classification' or 'regression').
+            
+        Returns:
+            The (encoded) target and the class names, or None if it was not encoded.
+        """
+        from sklearn.preprocessing import LabelEncoder
+        
+        if task_type == 'classification' and not pd.api.types.is_numeric_dtype(y):
+            label_encoder = LabelEncoder()
+            return label_encoder.fit_transform(y), label_encoder.classes_
+        return y, None
+    
+    def build_preprocessor(
+        self,
+        X_train: pd.DataFrame,
+        y_train: Any,
+        task_type: str,
+        sparse_output: Union[bool, str] = "auto",
+        encoding_method: str = "auto",
+        random_state: int = 42
+    ) -> Tuple[Any, Dict[str, Any], Dict[str, Dict[str, Any]]]:
+        """Build the (unfitted) preprocessing step of a training pipeline.
+        
+        Args:
+            X_train: Training features, used to profile the categorical columns.
+            y_train: Training target.
+            task_type: Type of task ('classification' or 'regression').
+            sparse_output: Sparse (True), dense (False) or density-based ('auto')
+                feature matrix.
+            encoding_method: 'auto' (cardinality-aware) or 'onehot'.
+            random_state: Random state of the cross-fitted target encoder.
+            
+        Returns:
+            The ColumnTransformer, the size estimate of the feature matrix it
+            builds (with its 'format') and the encoding of each categorical feature.
+        """
+        from sklearn.preprocessing import StandardScaler, OneHotEncoder, FunctionTransformer
+        from sklearn.pipeline import Pipeline
+        from sklearn.compose import ColumnTransformer
+        from sklearn.impute import SimpleImputer
+        from data_processing.encoders import (
+            column_stats, choose_encoding, encoded_width, ENCODING_HASH_FEATURES,
+            RareLevelBucketer, CrossFitTargetEncoder, FrequencyEncoder, HashingEncoder
+        )
+        
+        if encoding_method not in ('auto', 'onehot'):
+            raise ValueError(f"Invalid encoding method: {encoding_method}. Must be 'auto' or 'onehot'.")
+        
+        # Handle categorical features; sparse columns are already preprocessed
+        feature_columns = list(X_train.columns)
+        sparse_features = [col for col in feature_columns if isinstance(X_train[col].dtype, pd.SparseDtype)]
+        categorical_features = [col for col in feature_columns if not pd.api.types.is_numeric_dtype(X_train[col])]
+        numeric_features = [
+            col for col in feature_columns
+            if pd.api.types.is_numeric_dtype(X_train[col]) and col not in sparse_features
+        ]
+        
+        # Pick the encoding of each categorical feature from its profile;
+        # multiclass targets cannot be target encoded
+        target_encodable = task_type == 'regression' or len(np.unique(y_train)) == 2
+        encodings = {}
+        for col in categorical_features:
+            stats = column_stats(X_train[col])
+            method = choose_encoding(stats, target_encodable) if encoding_method == 'auto' else 'onehot'
+            encodings[col] = {"method": method, **stats}
+        encoded_groups = {
+            method: [col for col in categorical_features if encodings[col]["method"] == method]
+            for method in ('onehot', 'rare', 'target', 'frequency', 'hashing')
+        }
+        
+        # Estimate the size of the feature matrix before building it: one
+        # nonzero per row for each numeric and each encoded column
+        rows = len(X_train)
+        encoded_columns = sum(
+            encoded_width(encoding["method"], encoding["unique_count"]) for encoding in encodings.values()
+        )
+        if encoded_groups['hashing']:
+            encoded_columns += ENCODING_HASH_FEATURES
+        sparse_nonzeros = (
+            int(round(X_train[sparse_features].sparse.density * rows * len(sparse_features)))
+            if sparse_features else 0
+        )
+        feature_matrix = estimate_output_size(
+            rows,
+            len(numeric_features) + len(sparse_features) + encoded_columns,
+            rows * (len(numeric_features) + len(categorical_features)) + sparse_nonzeros
+        )
+        sparse = use_sparse(feature_matrix, sparse_output)
+        feature_matrix["format"] = "sparse" if sparse else "dense"
+        
+        # Create preprocessing pipeline
+        categorical_encoders = {
+            'cat': ('onehot', OneHotEncoder(handle_unknown='ignore')),
+            'rare': ('rare', Pipeline([
+                ('bucketer', RareLevelBucketer()),
+                ('onehot', OneHotEncoder(handle_unknown='ignore'))
+            ])),
+            'target': ('target', CrossFitTargetEncoder(
+                target_type='continuous' if task_type == 'regression' else 'classification',
+                random_state=random_state
+            )),
+            'frequency': ('frequency', FrequencyEncoder()),
+            'hashing': ('hashing', HashingEncoder())
+        }
+        transformers = [
+            ('num', Pipeline([
+                ('imputer', SimpleImputer(strategy='median')),
+                ('scaler', StandardScaler())
+            ]), numeric_features)
+        ]
+        for name, (method, encoder) in categorical_encoders.items():
+            if encoded_groups[method]:
+                imputer = SimpleImputer(strategy='most_frequent')
+                if method == 'hashing':
+                    # Hashes are salted with the column names, which a bare array would lose
+                    imputer.set_output(transform='pandas')
+                transformers.append((name, Pipeline([
+                    ('imputer', imputer),
+                    ('encoder', encoder)
+                ]), encoded_groups[method]))
+        transformers.append((
+            'sparse',
+            FunctionTransformer(sparse_frame_to_csr, accept_sparse=True, feature_names_out='one-to-one'),
+            sparse_features
+        ))
+        preprocessor = ColumnTransformer(
+            transformers=transformers,
+            remainder='drop',
+            sparse_threshold=1.0 if sparse else 0.0,
+            verbose_feature_names_out=False
+        )
+        return preprocessor, feature_matrix, encodings
+    
+    @staticmethod
+    def preprocessing_config(
+        sparse_output: Union[bool, str],
+        encoding_method: str,
+        random_state: int,
+        feature_matrix: Dict[str, Any],
+        encodings: Dict[str, Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Describe a preprocessor built by ``build_preprocessor``, for its cache key.
+        
+        Args:
+            sparse_output: Requested feature matrix format.
+            encoding_method: Requested encoding method.
+            random_state: Random state of the encoders.
+            feature_matrix: Feature matrix estimate, with the resolved 'format'.
+            encodings: Resolved encoding of each categorical feature.
+        
+        Returns:
+            JSON-serializable preprocessing configuration.
+        """
+        return {
+            "sparse_output": sparse_output,
+            "encoding_method": encoding_method,
+            "random_state": random_state,
+            "format": feature_matrix["format"],
+            "encodings": {col: encoding["method"] for col, encoding in encodings.items()},
+        }
+    
+    def preprocess_split(
+        self,
+        preprocessor: Any,
+        feature_matrix: Dict[str, Any],
+        X_train: pd.DataFrame,
+        y_train: Any,
+        X_test: pd.DataFrame,
+        y_test: Any,
+        cache_key: Optional[str] = None
+    ) -> Tuple[Dict[str, Any], bool]:
+        """Fit a preprocessor on the training rows of a split and transform both sides.
+        
+        With a cache key the result is shared through the preprocessing
+        cache, so the estimators trained on the same split (cross-validation
+        folds, leaderboard candidates, search trials) fit it only once.
+        
+        Args:
+            preprocessor: Unfitted preprocessor from ``build_preprocessor``.
+            feature_matrix: Its feature matrix estimate, with the 'format'.
+            X_train: Training features.
+            y_train: Training target.
+            X_test: Test (or held-out fold) features.
+            y_test: Test target.
+            cache_key: Key from ``preprocessing_cache.make_key``, or None to
+                bypass the cache.
+        
+        Returns:
+            ``{"preprocessor", "X_train", "y_train", "X_test", "y_test"}``
+            with the fitted preprocessor and the transformed matrices, and
+            whether it came from the cache.
+        """
+        from ml.preprocessing_cache import preprocessing_cache
+        
+        def build() -> Dict[str, Any]:
+            Xt_train = preprocessor.fit_transform(X_train, y_train)
+            Xt_test = preprocessor.transform(X_test)
+            if feature_matrix["format"] == "dense":
+                Xt_train = np.ascontiguousarray(Xt_train, dtype=np.float64)
+                Xt_test = np.ascontiguousarray(Xt_test, dtype=np.float64)
+            return {
+                "preprocessor": preprocessor,
+                "X_train": Xt_train,
+                "y_train": np.ascontiguousarray(y_train),
+                "X_test": Xt_test,
+                "y_test": np.ascontiguousarray(y_test),
+            }
+        
+        if cache_key is None:
+            return build(), False
+        return preprocessing_cache.get_or_build(cache_key, build)
+    
+    @staticmethod
+    def compute_metrics(task_type: str, y_test: Any, y_pred: Any, binary: bool) -> Dict[str, float]:
+        """Compute the test metrics of a model.
+        
+        Args:
+            task_type: Type of task ('classification' or 'regression').
+            y_test: True target values.
+            y_pred: Predicted target values.
+            binary: Whether a classification target has two classes.
+            
+        Returns:
+            accuracy, precision, recall and f1 for classification; r2, mse,
+            mae and rmse for regression.
+        """
+        from sklearn.metrics import (
+            accuracy_score, precision_score, recall_score, f1_score,
+            r2_score, mean_squared_error, mean_absolute_error
+        )
+        
+        metrics = {}
+        if task_type == 'classification':
+            metrics['accuracy'] = float(accuracy_score(y_test, y_pred))
+            
+            # For binary classification
+            average = 'binary' if binary else 'weighted'
+            metrics['precision'] = float(precision_score(y_test, y_pred, average=average))
+            metrics['recall'] = float(recall_score(y_test, y_pred, average=average))
+            metrics['f1'] = float(f1_score(y_test, y_pred, average=average))
+        else:
+            metrics['r2'] = float(r2_score(y_test, y_pred))
+            metrics['mse'] = float(mean_squared_error(y_test, y_pred))
+            metrics['mae'] = float(mean_absolute_error(y_test, y_pred))
+            metrics['rmse'] = float(np.sqrt(metrics['mse']))
+        return metrics
+    
+    @staticmethod
+    def get_feature_importance(preprocessor: Any, model: Any) -> Optional[Dict[str, float]]:
+        """Match the feature importances of a fitted model with feature names.
+        
+        Args:
+            preprocessor: Fitted preprocessing step of the pipeline.
+            model: Fitted model.
+            
+        Returns:
+            Importance by feature name, or None if the model has none.
+        """
+        if not hasattr(model, 'feature_importances_'):
+            return None
+        
+        # Feature names from the preprocessor: original names for
+        # numeric, target and frequency encoded features, '<column>_<level>'
+        # for one-hot encoded ones and 'hashed_<i>' for the hashed block
+        feature_names = list(preprocessor.get_feature_names_out())
+        importance = model.feature_importances_
+        if len(importance) != len(feature_names):
+            return None
+        return {name: float(imp) for name, imp in zip(feature_names, importance)}
+    
     def train_model(
         self,
         df: pd.DataFrame,
@@ -87,7 +393,12 @@ class ModelTrainer:
         test_size: float = 0.2,
         random_state: int = 42,
         perform_cv: bool = False,
-        cv_folds: int = 5
+        cv_folds: int = 5,
+        sparse_output: Union[bool, str] = "auto",
+        encoding_method: str = "auto",
+        progress_callback: Optional[Callable[[float, str], None]] = None,
+        dataset_fingerprint: Optional[str] = None,
+        force: bool = False
     ) -> Dict[str, Any]:
         """Train a machine learning model.
         
@@ -102,35 +413,60 @@ class ModelTrainer:
             random_state: Random state for reproducibility.
             perform_cv: Whether to perform cross-validation.
             cv_folds: Number of cross-validation folds.
+            sparse_output: Feed the model a sparse (CSR) feature matrix (True),
+                a dense one (False), or a sparse one when the estimated density
+                of the one-hot encoded features is low ('auto'). Columns of
+                ``pd.SparseDtype``, as built by ``preprocess_data``, are passed
+                through without being densified.
+            encoding_method: 'auto' to encode each categorical feature as
+                picked from its cardinality profile (one-hot, rare-level
+                bucketing, cross-fitted target, frequency or hashing), or
+                'onehot' to one-hot encode all of them.
+            progress_callback: Optional function called with (fraction, message)
+                as training advances.
+            dataset_fingerprint: Content hash of the dataset, keying the fitted
+                preprocessing in the preprocessing cache and the run in the
+                training registry; computed from the frame if not given.
+            force: Train even if an identical run is in the training registry.
             
         Returns:
-            Dictionary containing model information and metrics.
+            Dictionary containing model information and metrics; 'reused' is
+            True when the model of an identical earlier run is returned.
         """
+        from sklearn.base import clone
+        from sklearn.metrics import get_scorer
+        from sklearn.model_selection import train_test_split, check_cv
+        from sklearn.pipeline import Pipeline
+        from ml.preprocessing_cache import preprocessing_cache, frame_fingerprint
+        from ml.training_registry import training_registry
+        
+        def report_progress(fraction: float, message: str) -> None:
+            if progress_callback is not None:
+                progress_callback(fraction, message)
+        
         try:
             # Validate inputs
-            if task_type not in ['classification', 'regression']:
-                raise ValueError(f"Invalid task type: {task_type}. Must be 'classification' or 'regression'.")
-            
-            model_dict = self.classification_models if task_type == 'classification' else self.regression_models
+            model, model_params = self.create_model(model_type, task_type, hyperparameters)
             
-            if model_type not in model_dict:
-                raise ValueError(f"Invalid model type: {model_type}. Available models: {list(model_dict.keys())}")
+            # Return the model of an identical earlier run unless forced
+            if dataset_fingerprint is None:
+                dataset_fingerprint = frame_fingerprint(df[feature_columns + [target_column]])
+            registry_key = training_registry.make_key(
+                dataset_fingerprint, target_column, feature_columns, model_type, task_type, model_params,
+                test_size, random_state, perform_cv, cv_folds, sparse_output, encoding_method
+            )
+            if not force:
+                previous = training_registry.lookup(self.models_dir, registry_key)
+                if previous is not None:
+                    report_progress(1.0, f"Reusing identical model {previous['model_id']}")
+                    return {**previous, 'reused': True}
             
             # Prepare data
+            report_progress(0.1, "Preparing data")
             X = df[feature_columns].copy()
-            y = df[target_column].copy()
-            
-            # Handle categorical features
-            categorical_features = [col for col in feature_columns if not pd.api.types.is_numeric_dtype(df[col])]
-            numeric_features = [col for col in feature_columns if pd.api.types.is_numeric_dtype(df[col])]
             
             # For classification, encode the target if it's categorical
-            if task_type == 'classification' and not pd.api.types.is_numeric_dtype(y):
-                label_encoder = LabelEncoder()
-                y = label_encoder.fit_transform(y)
-                class_names = label_encoder.classes_
-            else:
-                class_names = None
+            y, class_names = self.prepare_target(df[target_column].copy(), task_type)
             
             # Split data
             X_train, X_test, y_train, y_test = train_test_split(
@@ -138,98 +474,72 @@ class ModelTrainer:
             )
             
             # Create preprocessing pipeline
-            preprocessor = ColumnTransformer(
-                transformers=[
-                    ('num', Pipeline([
-                        ('imputer', SimpleImputer(strategy='median')),
-                        ('scaler', StandardScaler())
-                    ]), numeric_features),
-                    ('cat', Pipeline([
-                        ('imputer', SimpleImputer(strategy='most_frequent')),
-                        ('onehot', OneHotEncoder(handle_unknown='ignore'))
-                    ]), categorical_features)
-                ],
-                remainder='drop'
+            preprocessor, feature_matrix, encodings = self.build_preprocessor(
+                X_train, y_train, task_type, sparse_output, encoding_method, random_state
+            )
+            report_progress(
+                0.15,
+                f"Building {feature_matrix['format']} feature matrix: {feature_matrix['rows']} x {feature_matrix['columns']}, "
+                f"about {feature_matrix[feature_matrix['format'] + '_bytes'] / 2 ** 20:.1f} MiB"
             )
             
-            # Get model class and hyperparameters
-            model_class = model_dict[model_type]
-            model_params = self.default_hyperparameters.get(model_type, {})
-            
-            # Override with user-provided hyperparameters
-            if hyperparameters:
-                model_params.update(hyperparameters)
+            # Fit the preprocessor and transform the split, or reuse them
+            # from an earlier run on the same data and configuration
+            config = self.preprocessing_config(sparse_output, encoding_method, random_state, feature_matrix, encodings)
+            split = {"kind": "holdout", "test_size": test_size, "random_state": random_state}
+            prepared, cached = self.preprocess_split(
+                preprocessor, feature_matrix, X_train, y_train, X_test, y_test,
+                preprocessing_cache.make_key(dataset_fingerprint, feature_columns, target_column, split, config)
+            )
             
-            # Create pipeline
+            # Train model
+            report_progress(0.2, "Fitting model" + (" on cached features" if cached else ""))
+            model.fit(prepared["X_train"], prepared["y_train"])
             pipeline = Pipeline([
-                ('preprocessor', preprocessor),
-                ('model', model_class(**model_params))
+                ('preprocessor', prepared["preprocessor"]),
+                ('model', model)
             ])
-            
-            # Train model
-            pipeline.fit(X_train, y_train)
+            report_progress(0.7, "Evaluating model")
             
             # Make predictions
-            y_pred = pipeline.predict(X_test)
+            y_pred = model.predict(prepared["X_test"])
             
             # Calculate metrics
-            metrics = {}
-            if task_type == 'classification':
-                metrics['accuracy'] = float(accuracy_score(y_test, y_pred))
-                
-                # For binary classification
-                if len(np.unique(y)) == 2:
-                    metrics['precision'] = float(precision_score(y_test, y_pred, average='binary'))
-                    metrics['recall'] = float(recall_score(y_test, y_pred, average='binary'))
-                    metrics['f1'] = float(f1_score(y_test, y_pred, average='binary'))
-                else:
-                    metrics['precision'] = float(precision_score(y_test, y_pred, average='weighted'))
-                    metrics['recall'] = float(recall_score(y_test, y_pred, average='weighted'))
-                    metrics['f1'] = float(f1_score(y_test, y_pred, average='weighted'))
-            else:
-                metrics['r2'] = float(r2_score(y_test, y_pred))
-                metrics['mse'] = float(mean_squared_error(y_test, y_pred))
-                metrics['mae'] = float(mean_absolute_error(y_test, y_pred))
-                metrics['rmse'] = float(np.sqrt(metrics['mse']))
-            
-            # Perform cross-validation if requested
+            metrics = self.compute_metrics(task_type, prepared["y_test"], y_pred, binary=len(np.unique(y)) == 2)
+            
+            # Perform cross-validation if requested, on the same folds as
+            # cross_val_score; each fold's features come from the cache
             if perform_cv:
-                if task_type == 'classification':
-                    cv_scores = cross_val_score(pipeline, X, y, cv=cv_folds, scoring='accuracy')
-                else:
-                    cv_scores = cross_val_score(pipeline, X, y, cv=cv_folds, scoring='r2')
+                report_progress(0.75, "Cross-validating")
+                folds = check_cv(cv_folds, y, classifier=task_type == 'classification')
+                scorer = get_scorer('accuracy' if task_type == 'classification' else 'r2')
+                y_values = np.asarray(y)
+                cv_scores = []
+                for fold, (train_index, test_index) in enumerate(folds.split(X, y_values)):
+                    fold_split = {"kind": "kfold", "folds": str(folds), "fold": fold}
+                    fold_data, _ = self.preprocess_split(
+                        clone(preprocessor), feature_matrix,
+                        X.iloc[train_index], y_values[train_index], X.iloc[test_index], y_values[test_index],
+                        preprocessing_cache.make_key(dataset_fingerprint, feature_columns, target_column, fold_split, config)
+                    )
+                    fold_model = clone(model).fit(fold_data["X_train"], fold_data["y_train"])
+                    cv_scores.append(scorer(fold_model, fold_data["X_test"], fold_data["y_test"]))
+                cv_scores = np.array(cv_scores)
                 
                 metrics['cv_mean_score'] = float(cv_scores.mean())
                 metrics['cv_std_score'] = float(cv_scores.std())
             
             # Generate a unique model ID
-            model_id = f"{model_type}_{task_type}_{pd.Timestamp.now().strftime('%Y%m%d%H%M%S')}"
+            model_id = training_registry.new_model_id(model_type, task_type)
             
             # Save model
+            report_progress(0.95, "Saving model")
             model_path = os.path.join(self.models_dir, f"{model_id}.joblib")
             joblib.dump(pipeline, model_path)
+            artifact_sha256 = training_registry.store_artifact(self.models_dir, model_path)
             
             # Prepare feature importance if available
-            feature_importance = None
-            model = pipeline.named_steps['model']
-            
-            if hasattr(model, 'feature_importances_'):
-                # Get feature names from preprocessor
-                feature_names = []
-                for name, trans, cols in preprocessor.transformers_:
-                    if name == 'cat':
-                        # For categorical features, get the one-hot encoded feature names
-                        encoder = trans.named_steps['onehot']
-                        for i, col in enumerate(cols):
-                            feature_names.extend([f"{col}_{cat}" for cat in encoder.categories_[i]])
-                    else:
-                        # For numeric features, use the original column names
-                        feature_names.extend(cols)
-                
-                # Match feature importances with feature names
-                importance = model.feature_importances_
-                if len(importance) == len(feature_names):
-                    feature_importance = {name: float(imp) for name, imp in zip(feature_names, importance)}
+            feature_importance = self.get_feature_importance(prepared["preprocessor"], pipeline.named_steps['model'])
             
             # Prepare result
             result = {
@@ -241,11 +551,15 @@ class ModelTrainer:
                 'hyperparameters': model_params,
                 'metrics': metrics,
                 'feature_importance': feature_importance,
+                'feature_matrix': feature_matrix,
+                'encodings': encodings,
                 'model_path': model_path,
+                'artifact_sha256': artifact_sha256,
                 'class_names': class_names.tolist() if class_names is not None else None
             }
+            training_registry.register(self.models_dir, registry_key, result)
             
-            return result
+            return {**result, 'reused': False}
         except Exception as e:
             logger.error(f"Error training model: {str(e)}")
             raise
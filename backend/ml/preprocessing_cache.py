@@ -0,0 +1,317 @@
+import os
+import json
+import shutil
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Any, Callable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import joblib
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Directory the fitted preprocessors and transformed matrices are stored in
+# (empty to keep them in memory only)
+PREPROCESSING_CACHE_DIR = os.environ.get("PREPROCESSING_CACHE_DIR", "./cache/preprocessing")
+# Upper bound on the disk space used by cached matrices (default 4 GiB)
+PREPROCESSING_CACHE_MAX_BYTES = int(os.environ.get("PREPROCESSING_CACHE_MAX_BYTES", 4 * 1024 ** 3))
+# Number of entries also kept in memory (memory-mapped when read from disk)
+PREPROCESSING_CACHE_MEMORY_ENTRIES = int(os.environ.get("PREPROCESSING_CACHE_MEMORY_ENTRIES", 8))
+
+# Bumped when the preprocessing changes, so stale entries are never hit
+PREPROCESSING_CACHE_VERSION = 2
+
+def frame_fingerprint(df: pd.DataFrame) -> str:
+    """Fingerprint the content of a DataFrame: column names, dtypes and values.
+
+    Args:
+        df: DataFrame to fingerprint.
+
+    Returns:
+        Hex digest.
+    """
+    hasher = hashlib.sha256()
+    hasher.update(json.dumps([[str(col), str(dtype)] for col, dtype in df.dtypes.items()]).encode("utf-8"))
+    hasher.update(np.ascontiguousarray(pd.util.hash_pandas_object(df, index=False).to_numpy()).tobytes())
+    return hasher.hexdigest()
+
+class PreprocessingCache:
+    """Cache of fitted preprocessors and the matrices they produce.
+
+    An entry holds the preprocessor fitted on the training rows of one
+    split, with the transformed training and test (or held-out fold)
+    matrices and targets. Entries are content addressed: the key is derived
+    from the dataset fingerprint, the feature and target columns, the split
+    (hold-out or k-fold, with its seed and fold) and the preprocessing
+    configuration, so every estimator trained on the same split reuses the
+    same entry: cross-validation folds, leaderboard candidates and search
+    trials alike.
+
+    Entries are stored as uncompressed joblib files, ``<dir>/<key>.joblib``,
+    and read back memory-mapped, so processes reading the same entry share
+    its pages. They are evicted least recently used first (by file mtime,
+    refreshed on every hit) once the directory grows beyond its size
+    budget. The most recently used entries are also kept in memory.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = PREPROCESSING_CACHE_DIR,
+        max_bytes: int = PREPROCESSING_CACHE_MAX_BYTES,
+        memory_entries: int = PREPROCESSING_CACHE_MEMORY_ENTRIES
+    ):
+        """Initialize the PreprocessingCache.
+
+        Args:
+            cache_dir: Directory to store the entries in (None or empty for
+                memory only).
+            max_bytes: Maximum total size of the stored entries.
+            memory_entries: Number of entries also kept in memory.
+        """
+        self.cache_dir = cache_dir or None
+        self.max_bytes = max_bytes
+        self.memory_entries = memory_entries
+        self._memory: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def make_key(
+        self,
+        fingerprint: str,
+        feature_columns: List[str],
+        target_column: str,
+        split: Dict[str, Any],
+        config: Dict[str, Any]
+    ) -> str:
+        """Build the cache key of a fitted preprocessor and its matrices.
+
+        Args:
+            fingerprint: Content hash of the dataset (or of the frame).
+            feature_columns: Feature columns, in order.
+            target_column: Target column.
+            split: Split specification, e.g. ``{"kind": "holdout",
+                "test_size": 0.2, "random_state": 42}`` or ``{"kind": "kfold",
+                "folds": 5, "fold": 0, ...}``.
+            config: Preprocessing configuration, including what was resolved
+                from the data (e.g. the encoding of each column).
+
+        Returns:
+            Hex digest identifying the entry.
+        """
+        import sklearn
+
+        payload = json.dumps({
+            "fingerprint": fingerprint,
+            "feature_columns": list(feature_columns),
+            "target_column": target_column,
+            "split": split,
+            "config": config,
+            "version": PREPROCESSING_CACHE_VERSION,
+            "sklearn_version": sklearn.__version__,
+        }, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def path(self, key: str) -> Optional[str]:
+        """Path of the file an entry is stored in (None without a cache directory)."""
+        if self.cache_dir is None:
+            return None
+        return os.path.join(self.cache_dir, f"{key}.joblib")
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Get an entry.
+
+        Args:
+            key: Key built with ``make_key``.
+
+        Returns:
+            The entry, with memory-mapped arrays when read from disk, or
+            None if it is not cached.
+        """
+        try:
+            with self._lock:
+                entry = self._memory.get(key)
+                if entry is not None:
+                    self._memory.move_to_end(key)
+
+            path = self.path(key)
+            if entry is None:
+                try:
+                    if path is None:
+                        raise FileNotFoundError(key)
+                    entry = joblib.load(path, mmap_mode="r")
+                except FileNotFoundError:
+                    with self._lock:
+                        self._misses += 1
+                    return None
+                self._remember(key, entry)
+
+            # Refresh the mtime, which orders entries for eviction
+            if path is not None:
+                try:
+                    os.utime(path)
+                except FileNotFoundError:
+                    pass
+
+            with self._lock:
+                self._hits += 1
+            return entry
+        except Exception as e:
+            logger.error(f"Error reading cached preprocessing: {str(e)}")
+            raise
+
+    def put(self, key: str, entry: Dict[str, Any]) -> Dict[str, Any]:
+        """Store an entry.
+
+        Args:
+            key: Key built with ``make_key``.
+            entry: Fitted preprocessor, matrices and metadata to store.
+
+        Returns:
+            The stored entry, read back memory-mapped when it went to disk.
+        """
+        try:
+            path = self.path(key)
+            if path is not None:
+                os.makedirs(self.cache_dir, exist_ok=True)
+
+                # Write to a temporary file first so readers never see a partial entry
+                tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                joblib.dump(entry, tmp_path)
+                os.replace(tmp_path, path)
+                entry = joblib.load(path, mmap_mode="r")
+
+            self._remember(key, entry)
+            self._evict()
+            return entry
+        except Exception as e:
+            logger.error(f"Error storing preprocessing: {str(e)}")
+            raise
+
+    def get_or_build(self, key: str, build: Callable[[], Dict[str, Any]]) -> Tuple[Dict[str, Any], bool]:
+        """Get an entry, building and storing it on a miss.
+
+        Args:
+            key: Key built with ``make_key``.
+            build: Function fitting the preprocessor and returning the entry.
+
+        Returns:
+            The entry and whether it was a hit.
+        """
+        entry = self.get(key)
+        if entry is not None:
+            return entry, True
+        return self.put(key, build()), False
+
+    def materialize(self, key: str, entry: Dict[str, Any], destination: str) -> str:
+        """Make an entry available as a file, e.g. for worker processes to memory-map.
+
+        Hard-links the stored file, so the copy survives eviction without
+        taking more space; entries only held in memory are written out.
+
+        Args:
+            key: Key of the entry.
+            entry: The entry.
+            destination: Path of the file.
+
+        Returns:
+            ``destination``.
+        """
+        path = self.path(key)
+        if path is not None and os.path.exists(path):
+            try:
+                os.link(path, destination)
+                return destination
+            except OSError:
+                # Another file system, or no hard links: fall back to a copy
+                shutil.copyfile(path, destination)
+                return destination
+        joblib.dump(entry, destination)
+        return destination
+
+    def _remember(self, key: str, entry: Dict[str, Any]) -> None:
+        """Keep an entry in the in-memory LRU."""
+        with self._lock:
+            self._memory[key] = entry
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+
+    def _list_entries(self) -> List[Dict[str, Any]]:
+        """List the stored entries with their size and last use."""
+        entries = []
+        if self.cache_dir is None or not os.path.isdir(self.cache_dir):
+            return entries
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".joblib"):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append({
+                "key": name[:-len(".joblib")],
+                "path": path,
+                "size": stat.st_size,
+                "mtime": stat.st_mtime,
+            })
+        return entries
+
+    def _evict(self) -> None:
+        """Remove least recently used entries until the cache fits its budget."""
+        entries = self._list_entries()
+        total = sum(entry["size"] for entry in entries)
+        if total <= self.max_bytes:
+            return
+
+        for entry in sorted(entries, key=lambda entry: entry["mtime"]):
+            if total <= self.max_bytes:
+                break
+            # Memory-mapped readers keep their pages after the file is removed
+            try:
+                os.remove(entry["path"])
+            except FileNotFoundError:
+                pass
+            total -= entry["size"]
+            with self._lock:
+                self._memory.pop(entry["key"], None)
+                self._evictions += 1
+
+    def clear(self) -> None:
+        """Remove every cached entry."""
+        try:
+            with self._lock:
+                self._memory.clear()
+            if self.cache_dir is not None:
+                shutil.rmtree(self.cache_dir, ignore_errors=True)
+        except Exception as e:
+            logger.error(f"Error clearing preprocessing cache: {str(e)}")
+            raise
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics of this process.
+
+        Returns:
+            Dictionary with hit/miss/eviction counters and disk usage.
+        """
+        entries = self._list_entries()
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "entries": len(entries),
+                "memory_entries": len(self._memory),
+                "current_bytes": sum(entry["size"] for entry in entries),
+                "max_bytes": self.max_bytes,
+            }
+
+# Create a singleton instance
+preprocessing_cache = PreprocessingCache()
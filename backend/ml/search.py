@@ -0,0 +1,528 @@
+import os
+import math
+import json
+import time
+import shutil
+import logging
+import itertools
+import threading
+from typing import Dict, List, Any, Callable, Optional, Tuple
+
+import numpy as np
+import joblib
+
+from .trial_pool import TrialPool
+from .leaderboard import model_leaderboard, LOWER_IS_BETTER
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Trials run at the same time, each in its own process
+SEARCH_WORKERS = int(os.environ.get("SEARCH_WORKERS", os.cpu_count() or 1))
+# Default wall-clock budget of a search in seconds, preprocessing included
+SEARCH_TIME_BUDGET = float(os.environ.get("SEARCH_TIME_BUDGET", 1800))
+# Successive halving keeps 1/eta of the configurations of a rung and gives them eta times the resource
+SEARCH_ETA = int(os.environ.get("SEARCH_ETA", 3))
+# Most rungs of a bracket; bounds how small the first rungs get on large tables
+SEARCH_MAX_RUNGS = int(os.environ.get("SEARCH_MAX_RUNGS", 4))
+# Smallest training sample and smallest/largest ensemble of a trial
+SEARCH_MIN_SAMPLES = int(os.environ.get("SEARCH_MIN_SAMPLES", 1000))
+SEARCH_MIN_ESTIMATORS = int(os.environ.get("SEARCH_MIN_ESTIMATORS", 10))
+SEARCH_MAX_ESTIMATORS = int(os.environ.get("SEARCH_MAX_ESTIMATORS", 500))
+# With resource='auto', ensembles are budgeted by sample size from this many
+# training rows on, and by number of estimators below it
+SEARCH_SUBSAMPLE_MIN_ROWS = int(os.environ.get("SEARCH_SUBSAMPLE_MIN_ROWS", 100_000))
+# Share of the training rows held out to compare configurations
+SEARCH_VALIDATION_SIZE = float(os.environ.get("SEARCH_VALIDATION_SIZE", 0.2))
+
+SEARCH_STRATEGIES = ("hyperband", "halving")
+SEARCH_SAMPLERS = ("sobol", "random")
+SEARCH_RESOURCES = ("auto", "samples", "n_estimators")
+
+# Models whose size can serve as the budget of a trial
+ENSEMBLE_MODELS = ("random_forest", "gradient_boosting")
+
+# Search space of each model type: parameter name -> distribution, one of
+# {"type": "float"|"int", "low", "high", "log"} or {"type": "choice", "values"}.
+# Models in both registries share their space.
+SEARCH_SPACES = {
+    "logistic_regression": {
+        "C": {"type": "float", "low": 1e-3, "high": 1e3, "log": True},
+    },
+    "linear_regression": {},
+    "ridge": {
+        "alpha": {"type": "float", "low": 1e-4, "high": 1e3, "log": True},
+    },
+    "lasso": {
+        "alpha": {"type": "float", "low": 1e-5, "high": 10.0, "log": True},
+    },
+    "random_forest": {
+        "n_estimators": {"type": "int", "low": 50, "high": 500, "log": True},
+        "max_depth": {"type": "choice", "values": [None, 8, 16, 32]},
+        "min_samples_leaf": {"type": "int", "low": 1, "high": 50, "log": True},
+        "max_features": {"type": "choice", "values": ["sqrt", "log2", 0.5, 1.0]},
+    },
+    "gradient_boosting": {
+        "n_estimators": {"type": "int", "low": 50, "high": 500, "log": True},
+        "learning_rate": {"type": "float", "low": 0.01, "high": 0.3, "log": True},
+        "max_depth": {"type": "int", "low": 2, "high": 8},
+        "subsample": {"type": "float", "low": 0.5, "high": 1.0},
+        "min_samples_leaf": {"type": "int", "low": 1, "high": 100, "log": True},
+    },
+    "svm": {
+        "C": {"type": "float", "low": 1e-2, "high": 1e3, "log": True},
+        "gamma": {"type": "choice", "values": ["scale", "auto"]},
+        "kernel": {"type": "choice", "values": ["rbf", "linear"]},
+    },
+    "knn": {
+        "n_neighbors": {"type": "int", "low": 1, "high": 100, "log": True},
+        "weights": {"type": "choice", "values": ["uniform", "distance"]},
+    },
+    "decision_tree": {
+        "max_depth": {"type": "int", "low": 2, "high": 32, "log": True},
+        "min_samples_leaf": {"type": "int", "low": 1, "high": 100, "log": True},
+    },
+    "mlp": {
+        "hidden_layer_sizes": {"type": "choice", "values": [(50,), (100,), (100, 50), (200, 100)]},
+        "alpha": {"type": "float", "low": 1e-6, "high": 1e-1, "log": True},
+        "learning_rate_init": {"type": "float", "low": 1e-4, "high": 1e-1, "log": True},
+    },
+}
+
+def validate_space(space: Dict[str, Dict[str, Any]]) -> None:
+    """Check the distributions of a search space, raising ValueError on the first invalid one."""
+    for name, spec in space.items():
+        kind = spec.get("type") if isinstance(spec, dict) else None
+        if kind in ("float", "int"):
+            low, high = spec.get("low"), spec.get("high")
+            if not isinstance(low, (int, float)) or not isinstance(high, (int, float)) or low > high:
+                raise ValueError(f"Parameter '{name}' needs numeric 'low' <= 'high'")
+            if spec.get("log") and low <= 0:
+                raise ValueError(f"Parameter '{name}' needs a positive 'low' on a log scale")
+        elif kind == "choice":
+            if not isinstance(spec.get("values"), (list, tuple)) or not spec["values"]:
+                raise ValueError(f"Parameter '{name}' needs a non-empty list of 'values'")
+        else:
+            raise ValueError(f"Parameter '{name}' must have type 'float', 'int' or 'choice'")
+
+def _scale(spec: Dict[str, Any], u: float) -> Any:
+    """Map a point of [0, 1) to a value of a distribution."""
+    if spec["type"] == "choice":
+        values = spec["values"]
+        return values[min(int(u * len(values)), len(values) - 1)]
+
+    low, high = spec["low"], spec["high"]
+    if spec["type"] == "int":
+        # Integers own equal shares of the unit interval (of its log on a log scale)
+        high = high + 1
+    if spec.get("log"):
+        value = math.exp(math.log(low) + u * (math.log(high) - math.log(low)))
+    else:
+        value = low + u * (high - low)
+    if spec["type"] == "int":
+        return int(min(math.floor(value), spec["high"]))
+    return float(value)
+
+def sample_configurations(
+    space: Dict[str, Dict[str, Any]],
+    n: int,
+    sampler: str = "sobol",
+    seed: int = 0
+) -> List[Dict[str, Any]]:
+    """Draw configurations from a search space.
+
+    The Sobol sampler spreads the configurations more evenly over the space
+    than independent random draws, which matters with few configurations.
+
+    Args:
+        space: Search space (see ``SEARCH_SPACES``).
+        n: Number of configurations.
+        sampler: 'sobol' (scrambled Sobol sequence) or 'random'.
+        seed: Random seed.
+
+    Returns:
+        Up to ``n`` distinct configurations (fewer if the space is smaller).
+    """
+    names = sorted(space)
+    if not names or n <= 0:
+        return [{}] if n > 0 else []
+    if sampler == "sobol":
+        from scipy.stats import qmc
+        points = qmc.Sobol(d=len(names), scramble=True, seed=seed).random_base2(max(0, math.ceil(math.log2(n))))[:n]
+    else:
+        points = np.random.default_rng(seed).random((n, len(names)))
+
+    configurations = {}
+    for point in points:
+        configuration = {name: _scale(space[name], u) for name, u in zip(names, point)}
+        configurations.setdefault(json.dumps(configuration, sort_keys=True, default=str), configuration)
+    return list(configurations.values())
+
+def hyperband_brackets(
+    strategy: str,
+    min_fraction: float,
+    eta: int = SEARCH_ETA,
+    n_candidates: Optional[int] = None,
+    max_rungs: int = SEARCH_MAX_RUNGS
+) -> List[List[Tuple[int, float]]]:
+    """Plan the rungs of successive halving or Hyperband.
+
+    Resources are fractions of the full budget of a trial (all training
+    rows, or the largest ensemble), so models budgeted differently can share
+    a bracket.
+
+    Args:
+        strategy: 'halving' (one bracket, from the smallest resource) or
+            'hyperband' (brackets trading configurations for resource).
+        min_fraction: Smallest resource worth training with.
+        eta: Reduction factor between rungs.
+        n_candidates: Configurations of the halving bracket, or of the
+            single rung when there is no resource to share (enough for one
+            survivor, or as many as the largest bracket, if None).
+        max_rungs: Most rungs of a bracket.
+
+    Returns:
+        For each bracket, ``(configurations, resource fraction)`` of each rung.
+    """
+    s_max = max(0, min(max_rungs - 1, int(math.floor(math.log(1 / min_fraction, eta) + 1e-9))))
+    if s_max == 0:
+        # Too little resource to train on a share of it: every configuration
+        # gets the full resource, as many as the largest bracket would start
+        return [[(n_candidates or eta ** max(0, max_rungs - 1), 1.0)]]
+    if strategy == "halving":
+        n = n_candidates or eta ** s_max
+        return [[(max(1, n // eta ** i), eta ** (i - s_max)) for i in range(s_max + 1)]]
+
+    brackets = []
+    for s in range(s_max, -1, -1):
+        n = int(math.ceil((s_max + 1) / (s + 1) * eta ** s))
+        brackets.append([(max(1, n // eta ** i), eta ** (i - s)) for i in range(s + 1)])
+    return brackets
+
+def _evaluate_trial(
+    matrix_path: str,
+    model_type: str,
+    task_type: str,
+    hyperparameters: Dict[str, Any],
+    resource: str,
+    fraction: float,
+    validation_rows: int,
+    binary: bool,
+    random_state: int,
+    model_path: str
+) -> Dict[str, Any]:
+    """Train and score one configuration on a share of its resource; runs in a trial process.
+
+    The last ``validation_rows`` training rows score the configuration; the
+    test rows give the metrics reported for the model. The pipeline, with
+    the shared preprocessor, is saved so the best one can be kept.
+    """
+    from sklearn.pipeline import Pipeline
+    from ml.model_trainer import model_trainer
+
+    shared = joblib.load(matrix_path, mmap_mode="r")
+    X_train, y_train = shared["X_train"], shared["y_train"]
+    fit_rows = X_train.shape[0] - validation_rows
+
+    params = dict(hyperparameters)
+    if resource == "n_estimators":
+        rows = fit_rows
+        params["n_estimators"] = max(SEARCH_MIN_ESTIMATORS, int(round(fraction * SEARCH_MAX_ESTIMATORS)))
+    else:
+        # Rows are in random order after the split, so a prefix is a random sample
+        rows = min(fit_rows, max(SEARCH_MIN_SAMPLES, int(round(fraction * fit_rows))))
+    model, model_params = model_trainer.create_model(model_type, task_type, params)
+    if "random_state" in model.get_params():
+        model.set_params(random_state=random_state)
+
+    started_at = time.time()
+    model.fit(X_train[:rows], y_train[:rows])
+    fit_seconds = time.time() - started_at
+    validation_metrics = model_trainer.compute_metrics(
+        task_type, y_train[fit_rows:], model.predict(X_train[fit_rows:]), binary
+    )
+    metrics = model_trainer.compute_metrics(task_type, shared["y_test"], model.predict(shared["X_test"]), binary)
+
+    joblib.dump(Pipeline([("preprocessor", shared["preprocessor"]), ("model", model)]), model_path)
+    return {
+        "validation_metrics": validation_metrics,
+        "metrics": metrics,
+        "hyperparameters": model_params,
+        "rows": int(rows),
+        "fit_seconds": fit_seconds,
+        "model_path": model_path,
+    }
+
+class HyperparameterSearch:
+    """Budgeted hyperparameter search over the model registry.
+
+    Configurations are drawn from per-model search spaces and compared with
+    successive halving: each rung trains its configurations in parallel on
+    a share of the resource (training rows, or ensemble size), and only the
+    best 1/eta are trained again with eta times more. Hyperband runs several
+    such brackets, from many configurations on little data to few on all of
+    it. Trials share the memory-mapped feature matrices of the leaderboard
+    and are terminated when the time budget runs out.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = SEARCH_WORKERS,
+        time_budget: float = SEARCH_TIME_BUDGET,
+        eta: int = SEARCH_ETA
+    ):
+        """Initialize the HyperparameterSearch.
+
+        Args:
+            max_workers: Maximum number of concurrently running trials.
+            time_budget: Default wall-clock budget of a search in seconds.
+            eta: Default reduction factor between rungs.
+        """
+        self.max_workers = max_workers
+        self.time_budget = time_budget
+        self.eta = eta
+
+    def resolve_spaces(
+        self,
+        model_types: List[str],
+        search_spaces: Optional[Dict[str, Dict[str, Dict[str, Any]]]] = None
+    ) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """Get the search space of each model type, with overrides.
+
+        Args:
+            model_types: Model types searched.
+            search_spaces: Distributions by model type, replacing or adding
+                to those of ``SEARCH_SPACES``.
+
+        Returns:
+            Search space by model type.
+        """
+        search_spaces = search_spaces or {}
+        unknown = [model_type for model_type in search_spaces if model_type not in model_types]
+        if unknown:
+            raise ValueError(f"Search spaces given for model types not searched: {unknown}")
+        spaces = {}
+        for model_type in model_types:
+            space = dict(SEARCH_SPACES.get(model_type, {}))
+            space.update(search_spaces.get(model_type, {}))
+            validate_space(space)
+            spaces[model_type] = space
+        return spaces
+
+    @staticmethod
+    def trial_resource(model_type: str, resource: str, fit_rows: int) -> str:
+        """Pick what a trial of a model type is budgeted by: 'samples' or 'n_estimators'."""
+        if model_type not in ENSEMBLE_MODELS or resource == "samples":
+            return "samples"
+        if resource == "n_estimators":
+            return "n_estimators"
+        return "samples" if fit_rows >= SEARCH_SUBSAMPLE_MIN_ROWS else "n_estimators"
+
+    def run(
+        self,
+        prepared: Dict[str, Any],
+        task_type: str,
+        model_types: List[str],
+        metric: str,
+        strategy: str = "hyperband",
+        sampler: str = "sobol",
+        resource: str = "auto",
+        n_candidates: Optional[int] = None,
+        eta: Optional[int] = None,
+        max_rungs: int = SEARCH_MAX_RUNGS,
+        max_trials: Optional[int] = None,
+        search_spaces: Optional[Dict[str, Dict[str, Dict[str, Any]]]] = None,
+        time_budget: Optional[float] = None,
+        max_workers: Optional[int] = None,
+        random_state: int = 42,
+        on_event: Optional[Callable[[Dict[str, Any]], None]] = None,
+        stop_event: Optional[threading.Event] = None
+    ) -> Dict[str, Any]:
+        """Search the configurations of the model types on prepared data.
+
+        Args:
+            prepared: Result of ``ModelLeaderboard.prepare``.
+            task_type: Type of task ('classification' or 'regression').
+            model_types: Model types searched; configurations are split
+                evenly between them.
+            metric: Metric the configurations are compared by, on the
+                validation rows.
+            strategy: 'hyperband' or 'halving'.
+            sampler: 'sobol' or 'random'.
+            resource: Budget of ensemble trials: 'samples', 'n_estimators' or
+                'auto'. Other models are always budgeted by sample size.
+            n_candidates: Configurations of the halving bracket.
+            eta: Reduction factor between rungs (default if None).
+            max_rungs: Most rungs of a bracket (1 trains every configuration
+                on its full resource).
+            max_trials: Most trials run in total (no limit if None).
+            search_spaces: Overrides of the search spaces by model type.
+            time_budget: Wall-clock budget in seconds, counted from the start
+                of the preparation (default budget if None).
+            max_workers: Concurrent trials (default if None, at most the default).
+            random_state: Seed of the sampler and the models.
+            on_event: Called with a 'trial' event when a trial ends and a
+                'rung' event when a rung has been scored.
+            stop_event: Set to stop early, e.g. when the client disconnects.
+
+        Returns:
+            Dictionary with the metric, the plan, all trial entries, the best
+            trial (with its ``model_id``), the elapsed time and whether the
+            budget ran out.
+        """
+        from ml.model_trainer import model_trainer
+        from ml.training_registry import training_registry
+
+        eta = eta or self.eta
+        budget = self.time_budget if time_budget is None else time_budget
+        deadline = prepared["started_at"] + budget
+        spaces = self.resolve_spaces(model_types, search_spaces)
+        # Requests may lower the number of workers, never raise it
+        pool = TrialPool(min(max_workers or self.max_workers, self.max_workers), model_leaderboard.start_method)
+        sign = 1 if metric in LOWER_IS_BETTER else -1
+
+        validation_rows = max(1, int(round(prepared["train_rows"] * SEARCH_VALIDATION_SIZE)))
+        fit_rows = prepared["train_rows"] - validation_rows
+        if fit_rows < 1:
+            raise ValueError("Not enough training rows to hold out validation rows")
+        resources = {model_type: self.trial_resource(model_type, resource, fit_rows) for model_type in model_types}
+        min_fraction = max(
+            SEARCH_MIN_ESTIMATORS / SEARCH_MAX_ESTIMATORS if kind == "n_estimators" else min(1.0, SEARCH_MIN_SAMPLES / fit_rows)
+            for kind in resources.values()
+        )
+        brackets = hyperband_brackets(strategy, min_fraction, eta, n_candidates, max_rungs)
+
+        trials: List[Dict[str, Any]] = []
+        state = {"best": None, "launched": 0, "budget_exhausted": False, "seed": random_state}
+
+        def better(entry: Dict[str, Any], other: Optional[Dict[str, Any]]) -> bool:
+            # Trials trained with more resource win over any trained with less
+            if other is None:
+                return True
+            if entry["fraction"] != other["fraction"]:
+                return entry["fraction"] > other["fraction"]
+            return sign * entry["score"] < sign * other["score"]
+
+        def draw(n: int) -> List[Tuple[str, Dict[str, Any]]]:
+            # Split the configurations evenly between the model types, at least
+            # one each, interleaved so a trial limit does not cut a model type out
+            samples = []
+            for index, model_type in enumerate(model_types):
+                share = max(1, n // len(model_types) + (1 if index < n % len(model_types) else 0))
+                state["seed"] += 1
+                samples.append([
+                    (model_type, configuration)
+                    for configuration in sample_configurations(spaces[model_type], share, sampler, state["seed"])
+                ])
+            return [configuration for group in itertools.zip_longest(*samples) for configuration in group if configuration is not None]
+
+        try:
+            for bracket_index, rungs in enumerate(brackets):
+                if state["budget_exhausted"] or (stop_event is not None and stop_event.is_set()):
+                    break
+                survivors = draw(rungs[0][0])
+                for rung_index, (_, fraction) in enumerate(rungs):
+                    if max_trials is not None:
+                        survivors = survivors[:max(0, max_trials - state["launched"])]
+                    if not survivors or state["budget_exhausted"] or (stop_event is not None and stop_event.is_set()):
+                        break
+
+                    entries = {}
+                    for model_type, configuration in survivors:
+                        key = f"b{bracket_index}r{rung_index}t{len(entries)}"
+                        entries[key] = {
+                            "trial_id": key,
+                            "bracket": bracket_index,
+                            "rung": rung_index,
+                            "model_type": model_type,
+                            "configuration": configuration,
+                            "resource": resources[model_type],
+                            "fraction": fraction,
+                            "status": "pending",
+                        }
+                    state["launched"] += len(entries)
+
+                    def on_finish(key: str, status: str, payload: Any) -> None:
+                        entry = entries[key]
+                        entry.update(status=status, finished_at=time.time() - prepared["started_at"])
+                        if status == "completed":
+                            entry.update(payload, score=payload["validation_metrics"][metric])
+                            if better(entry, state["best"]):
+                                previous, state["best"] = state["best"], entry
+                                if previous is not None:
+                                    os.remove(previous.pop("model_path"))
+                            else:
+                                os.remove(entry.pop("model_path"))
+                        else:
+                            entry["error"] = payload
+                        if on_event is not None:
+                            best = state["best"]
+                            on_event({"event": "trial", "data": entry, "best": None if best is None else {
+                                field: best[field] for field in ("trial_id", "model_type", "hyperparameters", "fraction", "score")
+                            }})
+
+                    state["budget_exhausted"] = pool.run(
+                        [
+                            (key, _evaluate_trial, (
+                                prepared["matrix_path"], entry["model_type"], task_type, entry["configuration"],
+                                entry["resource"], fraction, validation_rows, prepared["binary"], random_state,
+                                os.path.join(prepared["work_dir"], f"{key}.joblib")
+                            ))
+                            for key, entry in entries.items()
+                        ],
+                        on_finish,
+                        deadline=deadline,
+                        stop_event=stop_event
+                    )
+                    trials.extend(entries.values())
+
+                    # Promote the best 1/eta of the configurations to the next rung
+                    completed = sorted(
+                        (entry for entry in entries.values() if entry["status"] == "completed"),
+                        key=lambda entry: sign * entry["score"]
+                    )
+                    keep = rungs[rung_index + 1][0] if rung_index + 1 < len(rungs) and not state["budget_exhausted"] else 0
+                    survivors = [(entry["model_type"], entry["configuration"]) for entry in completed[:keep]]
+                    if on_event is not None:
+                        on_event({"event": "rung", "data": {
+                            "bracket": bracket_index,
+                            "rung": rung_index,
+                            "fraction": fraction,
+                            "trials": len(entries),
+                            "completed": len(completed),
+                            "promoted": [entry["trial_id"] for entry in completed[:keep]],
+                        }})
+
+            best = state["best"]
+            if best is not None:
+                best["model_id"] = training_registry.new_model_id(best["model_type"], task_type)
+                model_path = os.path.join(model_trainer.models_dir, f"{best['model_id']}.joblib")
+                shutil.move(best["model_path"], model_path)
+                best["model_path"] = model_path
+
+            elapsed = time.time() - prepared["started_at"]
+            logger.info(
+                f"Search finished in {elapsed:.2f}s: {len(trials)} trials, best "
+                f"{best['model_type'] + ' ' + metric + '=' + format(best['score'], '.4f') if best else 'none'}"
+            )
+            return {
+                "metric": metric,
+                "strategy": strategy,
+                "eta": eta,
+                "resources": resources,
+                "validation_rows": validation_rows,
+                "brackets": [[{"configurations": n, "fraction": fraction} for n, fraction in rungs] for rungs in brackets],
+                "trials": trials,
+                "best": best,
+                "elapsed_seconds": elapsed,
+                "budget_exhausted": state["budget_exhausted"],
+            }
+        except Exception as e:
+            logger.error(f"Error running hyperparameter search: {str(e)}")
+            raise
+        finally:
+            model_leaderboard.cleanup(prepared)
+
+# Create a singleton instance
+hyperparameter_search = HyperparameterSearch()
@@ -0,0 +1,549 @@
+import os
+import logging
+import importlib
+from typing import Dict, List, Any, Callable, Iterator, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import joblib
+
+from data_processing.streaming_profiler import MomentAccumulator, KLLSketch, MisraGries
+from data_processing.transform_graph import estimate_output_size
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Rows read, transformed and fed to partial_fit at a time
+STREAMING_TRAIN_CHUNK_ROWS = int(os.environ.get("STREAMING_TRAIN_CHUNK_ROWS", 50000))
+# Passes over the training rows
+STREAMING_TRAIN_EPOCHS = int(os.environ.get("STREAMING_TRAIN_EPOCHS", 1))
+# Datasets with more rows are trained out of core when the model supports it
+STREAMING_TRAIN_MIN_ROWS = int(os.environ.get("STREAMING_TRAIN_MIN_ROWS", 5_000_000))
+
+# Training rows kept from the first chunk to lay out the preprocessor
+LAYOUT_SAMPLE_ROWS = 1000
+
+def holdout_mask(start: int, n: int, test_size: float, random_state: int) -> np.ndarray:
+    """Assign rows to the held-out stream.
+
+    Each row is assigned from a hash (splitmix64) of its position in the
+    dataset, so the split is the same on every pass and for any chunk size.
+
+    Args:
+        start: Position of the first row of the chunk.
+        n: Number of rows in the chunk.
+        test_size: Proportion of rows held out.
+        random_state: Seed of the assignment.
+
+    Returns:
+        Boolean mask, True for held-out rows.
+    """
+    with np.errstate(over="ignore"):
+        z = np.arange(start, start + n, dtype=np.uint64)
+        z += np.uint64(random_state % 2 ** 64) * np.uint64(0x9E3779B97F4A7C15)
+        z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        z ^= z >> np.uint64(31)
+    return (z >> np.uint64(11)).astype(np.float64) / 2.0 ** 53 < test_size
+
+class StreamingTrainer:
+    """Out-of-core model trainer for datasets larger than memory.
+
+    Rows are streamed in chunks, and every pass holds one chunk at a time:
+
+    1. A first pass over the training rows fits the preprocessing
+       statistics with mergeable sketches: medians and moments of numeric
+       features, the most frequent levels of categorical features and the
+       classes of the target.
+    2. One pass per epoch transforms the training rows and feeds them to
+       the model's ``partial_fit``.
+    3. A last pass predicts the held-out rows and accumulates the metrics.
+
+    The saved pipeline has the same layout as those of ``ModelTrainer``:
+    a ColumnTransformer (median imputation and scaling of numeric
+    features, one-hot encoding of the most frequent levels of categorical
+    ones) followed by the model.
+    """
+
+    def __init__(self, models_dir: str = "./models"):
+        """Initialize the StreamingTrainer.
+
+        Args:
+            models_dir: Directory to save trained models.
+        """
+        self.models_dir = models_dir
+
+        # Models that learn incrementally (partial_fit), as import paths
+        self.classification_models = {
+            "sgd": "sklearn.linear_model.SGDClassifier",
+            "perceptron": "sklearn.linear_model.Perceptron",
+            "naive_bayes": "sklearn.naive_bayes.GaussianNB",
+            "mlp": "sklearn.neural_network.MLPClassifier"
+        }
+
+        self.regression_models = {
+            "sgd": "sklearn.linear_model.SGDRegressor",
+            "mlp": "sklearn.neural_network.MLPRegressor"
+        }
+
+        # Default hyperparameters for each model; log loss gives SGD
+        # classifiers probabilities
+        self.default_hyperparameters = {
+            "sgd_classification": {"loss": "log_loss", "alpha": 0.0001},
+            "sgd_regression": {"alpha": 0.0001},
+            "mlp": {"hidden_layer_sizes": (100,)}
+        }
+
+    def get_models(self, task_type: str) -> Dict[str, str]:
+        """Get the registry of models that can be trained out of core for a task.
+
+        Args:
+            task_type: Type of task ('classification' or 'regression').
+
+        Returns:
+            Dictionary mapping model types to the import paths of their classes.
+        """
+        if task_type not in ['classification', 'regression']:
+            raise ValueError(f"Invalid task type: {task_type}. Must be 'classification' or 'regression'.")
+        return self.classification_models if task_type == 'classification' else self.regression_models
+
+    def supports(self, model_type: str, task_type: str) -> bool:
+        """Whether a model can be trained out of core."""
+        return task_type in ('classification', 'regression') and model_type in self.get_models(task_type)
+
+    def create_model(
+        self,
+        model_type: str,
+        task_type: str,
+        hyperparameters: Optional[Dict[str, Any]] = None,
+        random_state: int = 42
+    ) -> Tuple[Any, Dict[str, Any]]:
+        """Create an unfitted incremental model.
+
+        Args:
+            model_type: Type of model (e.g., 'sgd').
+            task_type: Type of task ('classification' or 'regression').
+            hyperparameters: Hyperparameters overriding the defaults.
+            random_state: Random state, for models that take one.
+
+        Returns:
+            The model and the hyperparameters it was created with.
+        """
+        model_dict = self.get_models(task_type)
+        if model_type not in model_dict:
+            raise ValueError(
+                f"Model type {model_type} cannot be trained out of core. Available models: {list(model_dict.keys())}"
+            )
+
+        module_name, class_name = model_dict[model_type].rsplit(".", 1)
+        model_class = getattr(importlib.import_module(module_name), class_name)
+        model_params = dict(
+            self.default_hyperparameters.get(f"{model_type}_{task_type}")
+            or self.default_hyperparameters.get(model_type, {})
+        )
+        if "random_state" in model_class().get_params():
+            model_params["random_state"] = random_state
+        if hyperparameters:
+            model_params.update(hyperparameters)
+        return model_class(**model_params), model_params
+
+    @staticmethod
+    def _split_chunks(
+        chunks: Iterator[pd.DataFrame],
+        target_column: str,
+        test_size: float,
+        random_state: int,
+        held_out: bool,
+        on_other: Optional[Callable[[pd.DataFrame], None]] = None
+    ) -> Iterator[pd.DataFrame]:
+        """Keep the training (or held-out) rows of each chunk that have a target.
+
+        ``on_other``, if given, receives the rows of the other stream, so one
+        pass can look at both.
+        """
+        start = 0
+        for chunk in chunks:
+            mask = holdout_mask(start, len(chunk), test_size, random_state)
+            start += len(chunk)
+            if on_other is not None:
+                other = chunk[~mask if held_out else mask]
+                on_other(other[other[target_column].notna()])
+            rows = chunk[mask if held_out else ~mask]
+            rows = rows[rows[target_column].notna()]
+            if len(rows):
+                yield rows
+
+    @staticmethod
+    def _coerce(chunk: pd.DataFrame, numeric_features: List[str]) -> pd.DataFrame:
+        """Parse numeric features as floats; chunks of text files may infer other types."""
+        chunk = chunk.copy()
+        for col in numeric_features:
+            chunk[col] = pd.to_numeric(chunk[col], errors="coerce").astype(np.float64)
+        return chunk
+
+    def fit_preprocessing(
+        self,
+        chunks: Iterator[pd.DataFrame],
+        target_column: str,
+        feature_columns: List[str],
+        task_type: str,
+        dtypes: Optional[Dict[str, Any]] = None,
+        max_levels: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Fit the preprocessing statistics in one pass over the training rows.
+
+        Args:
+            chunks: Training rows, in chunks.
+            target_column: Name of the target column.
+            feature_columns: List of feature columns.
+            task_type: Type of task ('classification' or 'regression').
+            dtypes: Stored dtype of each column; inferred from the first
+                chunk if not given.
+            max_levels: Most frequent levels one-hot encoded per categorical
+                feature (``ENCODING_ONEHOT_MAX_LEVELS`` if None); the others
+                are encoded as all zeros.
+
+        Returns:
+            The fitted ColumnTransformer, the feature lists, the classes of a
+            classification target, the encodings and the number of rows.
+        """
+        from sklearn.preprocessing import StandardScaler, OneHotEncoder
+        from sklearn.pipeline import Pipeline
+        from sklearn.compose import ColumnTransformer
+        from sklearn.impute import SimpleImputer
+        from data_processing.encoders import ENCODING_ONEHOT_MAX_LEVELS
+
+        max_levels = max_levels or ENCODING_ONEHOT_MAX_LEVELS
+        numeric_features = categorical_features = None
+        moments: Dict[str, MomentAccumulator] = {}
+        sketches: Dict[str, KLLSketch] = {}
+        missing: Dict[str, int] = {}
+        levels: Dict[str, MisraGries] = {}
+        classes = set()
+        rows = 0
+        sample = None
+
+        for chunk in chunks:
+            if numeric_features is None:
+                def is_numeric(col: str) -> bool:
+                    if dtypes is not None and col in dtypes:
+                        try:
+                            return pd.api.types.is_numeric_dtype(pd.api.types.pandas_dtype(dtypes[col]))
+                        except TypeError:
+                            return False
+                    return pd.api.types.is_numeric_dtype(chunk[col])
+                numeric_features = [col for col in feature_columns if is_numeric(col)]
+                categorical_features = [col for col in feature_columns if col not in numeric_features]
+                for col in numeric_features:
+                    moments[col] = MomentAccumulator()
+                    sketches[col] = KLLSketch()
+                    missing[col] = 0
+                for col in categorical_features:
+                    levels[col] = MisraGries(capacity=2 * max_levels)
+
+            chunk = self._coerce(chunk, numeric_features)
+            if sample is None:
+                sample = chunk.head(LAYOUT_SAMPLE_ROWS)
+            rows += len(chunk)
+
+            for col in numeric_features:
+                values = chunk[col].to_numpy()
+                present = values[~np.isnan(values)]
+                moments[col].update(present)
+                sketches[col].update(present)
+                missing[col] += len(values) - len(present)
+            for col in categorical_features:
+                levels[col].update(chunk[col].dropna())
+            if task_type == 'classification':
+                classes.update(pd.unique(chunk[target_column]).tolist())
+
+        if sample is None:
+            raise ValueError("No training rows: the dataset is empty or every target is missing")
+
+        # Statistics after median imputation: the missing values join the
+        # moments as a group of values at the median
+        medians, means, variances, counts = [], [], [], []
+        for col in numeric_features:
+            median = sketches[col].quantiles([0.5])[0]
+            median = 0.0 if median is None else median
+            imputed = MomentAccumulator()
+            imputed.merge(moments[col])
+            filled = MomentAccumulator()
+            filled.n, filled.mean, filled.min, filled.max = missing[col], median, median, median
+            imputed.merge(filled)
+            medians.append(median)
+            means.append(imputed.mean)
+            variances.append(imputed.m2 / imputed.n if imputed.n else 0.0)
+            counts.append(imputed.n)
+
+        kept_levels = {}
+        modes = []
+        for col in categorical_features:
+            top = list(levels[col].top(max_levels))
+            try:
+                # Numeric levels must be sorted by value
+                kept_levels[col] = sorted(top)
+            except TypeError:
+                kept_levels[col] = sorted(top, key=str)
+            modes.append(top[0] if top else None)
+
+        # Lay the preprocessor out on a sample, then replace its fitted
+        # statistics with those of the whole stream
+        preprocessor = ColumnTransformer(
+            transformers=[
+                ('num', Pipeline([
+                    ('imputer', SimpleImputer(strategy='median', keep_empty_features=True)),
+                    ('scaler', StandardScaler())
+                ]), numeric_features),
+                ('cat', Pipeline([
+                    ('imputer', SimpleImputer(strategy='most_frequent', keep_empty_features=True)),
+                    ('onehot', OneHotEncoder(
+                        categories=[kept_levels[col] for col in categorical_features],
+                        handle_unknown='ignore', sparse_output=False
+                    ))
+                ]), categorical_features)
+            ],
+            remainder='drop',
+            sparse_threshold=0.0,
+            verbose_feature_names_out=False
+        )
+        preprocessor.fit(sample[feature_columns])
+        if numeric_features:
+            numeric = preprocessor.named_transformers_['num']
+            numeric.named_steps['imputer'].statistics_ = np.array(medians, dtype=np.float64)
+            scaler = numeric.named_steps['scaler']
+            scaler.mean_ = np.array(means, dtype=np.float64)
+            scaler.var_ = np.array(variances, dtype=np.float64)
+            scaler.scale_ = np.where(scaler.var_ > 0, np.sqrt(scaler.var_), 1.0)
+            scaler.n_samples_seen_ = np.array(counts, dtype=np.int64)
+        if categorical_features:
+            imputer = preprocessor.named_transformers_['cat'].named_steps['imputer']
+            imputer.statistics_ = np.array(
+                [mode if mode is not None else fitted for mode, fitted in zip(modes, imputer.statistics_)],
+                dtype=object
+            )
+
+        return {
+            "preprocessor": preprocessor,
+            "numeric_features": numeric_features,
+            "categorical_features": categorical_features,
+            "classes": np.array(sorted(classes)) if task_type == 'classification' else None,
+            "encodings": {
+                col: {"method": "onehot", "levels": len(kept_levels[col]), "max_error": levels[col].max_error()}
+                for col in categorical_features
+            },
+            "rows": rows,
+        }
+
+    @staticmethod
+    def _metrics(task_type: str, confusion: np.ndarray, errors: Dict[str, Any], binary_index: int) -> Dict[str, float]:
+        """Test metrics from the accumulated confusion matrix or errors, as ``ModelTrainer.compute_metrics``."""
+        if task_type == 'regression':
+            n = errors["target"].n
+            mse = errors["squared"] / n
+            return {
+                "r2": float(1.0 - errors["squared"] / errors["target"].m2) if errors["target"].m2 > 0 else 0.0,
+                "mse": float(mse),
+                "mae": float(errors["absolute"] / n),
+                "rmse": float(np.sqrt(mse)),
+            }
+
+        true_positives = np.diag(confusion).astype(np.float64)
+        predicted = confusion.sum(axis=0)
+        support = confusion.sum(axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            precision = np.where(predicted > 0, true_positives / predicted, 0.0)
+            recall = np.where(support > 0, true_positives / support, 0.0)
+            f1 = np.where(precision + recall > 0, 2 * precision * recall / (precision + recall), 0.0)
+
+        # Binary targets report the positive class, others the support-weighted average
+        if len(confusion) == 2:
+            precision, recall, f1 = precision[binary_index], recall[binary_index], f1[binary_index]
+        else:
+            weights = support / support.sum()
+            precision, recall, f1 = (precision * weights).sum(), (recall * weights).sum(), (f1 * weights).sum()
+        return {
+            "accuracy": float(true_positives.sum() / confusion.sum()),
+            "precision": float(precision),
+            "recall": float(recall),
+            "f1": float(f1),
+        }
+
+    def train_model(
+        self,
+        chunks: Callable[[], Iterator[pd.DataFrame]],
+        target_column: str,
+        feature_columns: List[str],
+        model_type: str,
+        task_type: str,
+        hyperparameters: Optional[Dict[str, Any]] = None,
+        test_size: float = 0.2,
+        random_state: int = 42,
+        epochs: int = STREAMING_TRAIN_EPOCHS,
+        dtypes: Optional[Dict[str, Any]] = None,
+        total_rows: Optional[int] = None,
+        progress_callback: Optional[Callable[[float, str], None]] = None
+    ) -> Dict[str, Any]:
+        """Train a model out of core, one chunk of rows at a time.
+
+        Args:
+            chunks: Function returning a fresh iterator over the dataset's
+                rows in chunks (e.g. ``DataProcessor.iter_chunks``); it is
+                called once per pass.
+            target_column: Name of the target column.
+            feature_columns: List of feature columns.
+            model_type: Type of model to train; must support ``partial_fit``.
+            task_type: Type of task ('classification' or 'regression').
+            hyperparameters: Model hyperparameters.
+            test_size: Proportion of rows held out for the metrics.
+            random_state: Random state of the split, the shuffling of each
+                chunk and the model.
+            epochs: Passes over the training rows.
+            dtypes: Stored dtype of each column, used to tell numeric from
+                categorical features.
+            total_rows: Number of rows in the dataset, for progress reporting.
+            progress_callback: Optional function called with (fraction, message)
+                as training advances.
+
+        Returns:
+            Dictionary containing model information and metrics, as
+            ``ModelTrainer.train_model``.
+        """
+        from sklearn.pipeline import Pipeline
+        from ml.training_registry import training_registry
+
+        passes = epochs + 2
+
+        def report_progress(done: int, rows_read: float, message: str) -> None:
+            if progress_callback is not None:
+                fraction = done / passes
+                if total_rows:
+                    fraction += min(rows_read / total_rows, 1.0) / passes
+                progress_callback(0.05 + 0.9 * fraction, message)
+
+        try:
+            if epochs < 1:
+                raise ValueError("epochs must be at least 1")
+            if not 0 < test_size < 1:
+                raise ValueError("test_size must be between 0 and 1")
+            model, model_params = self.create_model(model_type, task_type, hyperparameters, random_state)
+            columns = list(dict.fromkeys([target_column] + feature_columns))
+
+            def stream(held_out: bool, on_other: Optional[Callable] = None) -> Iterator[pd.DataFrame]:
+                return self._split_chunks(
+                    (chunk[columns] for chunk in chunks()), target_column, test_size, random_state,
+                    held_out, on_other
+                )
+
+            held_out_classes = set()
+
+            def collect_classes(rows: pd.DataFrame) -> None:
+                held_out_classes.update(pd.unique(rows[target_column]).tolist())
+
+            # Pass 1: preprocessing statistics and target classes (of both streams)
+            report_progress(0, 0, "Fitting preprocessing statistics")
+            fitted = self.fit_preprocessing(
+                stream(False, collect_classes if task_type == 'classification' else None),
+                target_column, feature_columns, task_type, dtypes
+            )
+            preprocessor = fitted["preprocessor"]
+            classes = fitted["classes"]
+            if classes is not None and not held_out_classes.issubset(classes.tolist()):
+                # Classes only found in held-out rows are never predicted, so they count as misses
+                classes = np.array(sorted(held_out_classes.union(classes.tolist())))
+            class_names = classes if classes is not None and not pd.api.types.is_numeric_dtype(classes) else None
+            if classes is not None and len(classes) < 2:
+                raise ValueError("The target needs at least two classes")
+
+            def prepare(chunk: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+                X = preprocessor.transform(self._coerce(chunk[feature_columns], fitted["numeric_features"]))
+                y = chunk[target_column].to_numpy()
+                if class_names is not None:
+                    y = np.searchsorted(class_names, y)
+                elif task_type == 'regression':
+                    y = y.astype(np.float64)
+                return X, y
+
+            # Training passes
+            fit_classes = np.arange(len(classes)) if class_names is not None else classes
+            rng = np.random.default_rng(random_state)
+            for epoch in range(epochs):
+                seen = 0
+                for chunk in stream(False):
+                    X, y = prepare(chunk)
+                    order = rng.permutation(len(y))
+                    if task_type == 'classification':
+                        model.partial_fit(X[order], y[order], classes=fit_classes)
+                    else:
+                        model.partial_fit(X[order], y[order])
+                    seen += len(chunk)
+                    report_progress(1 + epoch, seen / (1 - test_size), f"Epoch {epoch + 1}/{epochs}: {seen} rows")
+
+            # Evaluation pass over the held-out rows
+            n_classes = len(classes) if classes is not None else 0
+            confusion = np.zeros((n_classes, n_classes), dtype=np.int64)
+            errors = {"squared": 0.0, "absolute": 0.0, "target": MomentAccumulator()}
+            test_rows = 0
+            for chunk in stream(True):
+                X, y = prepare(chunk)
+                y_pred = model.predict(X)
+                if task_type == 'classification':
+                    true_index = y if class_names is not None else np.searchsorted(classes, y)
+                    pred_index = y_pred if class_names is not None else np.searchsorted(classes, y_pred)
+                    np.add.at(confusion, (true_index.astype(np.int64), pred_index.astype(np.int64)), 1)
+                else:
+                    residuals = y - y_pred
+                    errors["squared"] += float(residuals @ residuals)
+                    errors["absolute"] += float(np.abs(residuals).sum())
+                    errors["target"].update(y)
+                test_rows += len(chunk)
+                report_progress(passes - 1, test_rows / test_size, "Evaluating model")
+            if test_rows == 0:
+                raise ValueError("No held-out rows: increase test_size")
+
+            # The positive class of binary metrics is 1 when it is a class
+            binary_index = int(np.searchsorted(classes, 1)) if classes is not None and 1 in classes.tolist() else 1
+            metrics = self._metrics(task_type, confusion, errors, binary_index)
+
+            # Save model
+            model_id = training_registry.new_model_id(model_type, task_type)
+            model_path = os.path.join(self.models_dir, f"{model_id}.joblib")
+            os.makedirs(self.models_dir, exist_ok=True)
+            joblib.dump(Pipeline([('preprocessor', preprocessor), ('model', model)]), model_path)
+            artifact_sha256 = training_registry.store_artifact(self.models_dir, model_path)
+
+            n_features = len(preprocessor.get_feature_names_out())
+            feature_matrix = estimate_output_size(
+                fitted["rows"], n_features, fitted["rows"] * len(feature_columns)
+            )
+            feature_matrix["format"] = "dense"
+
+            return {
+                'model_id': model_id,
+                'model_type': model_type,
+                'task_type': task_type,
+                'target_column': target_column,
+                'feature_columns': feature_columns,
+                'hyperparameters': model_params,
+                'metrics': metrics,
+                'feature_importance': None,
+                'feature_matrix': feature_matrix,
+                'encodings': fitted["encodings"],
+                'model_path': model_path,
+                'artifact_sha256': artifact_sha256,
+                'class_names': class_names.tolist() if class_names is not None else None,
+                'streaming': {
+                    'epochs': epochs,
+                    'train_rows': fitted["rows"],
+                    'test_rows': test_rows,
+                    'passes': passes,
+                },
+                'reused': False
+            }
+        except Exception as e:
+            logger.error(f"Error training model out of core: {str(e)}")
+            raise
+
+# Create a singleton instance
+streaming_trainer = StreamingTrainer()
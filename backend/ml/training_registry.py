@@ -0,0 +1,253 @@
+import os
+import json
+import uuid
+import hashlib
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Union
+
+from runtime.serialization import dumps_json, loads_json
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Bumped when training changes, so older results are never reused
+TRAINING_REGISTRY_VERSION = 2
+# Block size used to hash model artifacts
+ARTIFACT_HASH_BLOCK_SIZE = 1024 * 1024
+
+class TrainingRegistry:
+    """Content-addressed registry of trained models.
+
+    A training run is identified by a key derived from everything that
+    determines its outcome: the dataset content, target and feature
+    columns, model type and hyperparameters, split, cross-validation and
+    preprocessing settings. The result of a run is recorded under its key
+    as ``<models_dir>/registry/<key>.json``, so an identical request can
+    return the existing model id and metrics instead of training again.
+
+    Model files are deduplicated: each distinct artifact is stored once as
+    ``<models_dir>/artifacts/<sha256>.joblib`` and every
+    ``<models_dir>/<model_id>.joblib`` with the same content is a hard link
+    to it.
+    """
+
+    def __init__(self):
+        """Initialize the TrainingRegistry."""
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def make_key(
+        self,
+        dataset_fingerprint: str,
+        target_column: str,
+        feature_columns: List[str],
+        model_type: str,
+        task_type: str,
+        hyperparameters: Dict[str, Any],
+        test_size: float,
+        random_state: int,
+        perform_cv: bool,
+        cv_folds: int,
+        sparse_output: Union[bool, str],
+        encoding_method: str
+    ) -> str:
+        """Build the key of a training run.
+
+        Args:
+            dataset_fingerprint: Content hash of the dataset (or of the frame).
+            target_column: Target column.
+            feature_columns: Feature columns, in order.
+            model_type: Type of model.
+            task_type: Type of task.
+            hyperparameters: Hyperparameters the model is created with,
+                defaults included.
+            test_size: Proportion of data used for testing.
+            random_state: Random state of the split and the encoders.
+            perform_cv: Whether cross-validation is performed.
+            cv_folds: Number of cross-validation folds.
+            sparse_output: Requested feature matrix format.
+            encoding_method: Requested encoding method.
+
+        Returns:
+            Hex digest identifying the run.
+        """
+        import sklearn
+
+        payload = json.dumps({
+            "dataset_fingerprint": dataset_fingerprint,
+            "target_column": target_column,
+            "feature_columns": list(feature_columns),
+            "model_type": model_type,
+            "task_type": task_type,
+            "hyperparameters": hyperparameters,
+            "test_size": test_size,
+            "random_state": random_state,
+            "cv_folds": cv_folds if perform_cv else None,
+            "sparse_output": sparse_output,
+            "encoding_method": encoding_method,
+            "version": TRAINING_REGISTRY_VERSION,
+            "sklearn_version": sklearn.__version__,
+        }, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def new_model_id(model_type: str, task_type: str) -> str:
+        """Create the id of a newly trained model.
+
+        The timestamp keeps ids readable and in training order; the random
+        suffix keeps apart models of the same type trained in the same second
+        by parallel jobs or trial pools.
+
+        Args:
+            model_type: Type of model.
+            task_type: Type of task.
+
+        Returns:
+            The model id, also the name of its file.
+        """
+        return f"{model_type}_{task_type}_{datetime.now().strftime('%Y%m%d%H%M%S')}_{uuid.uuid4().hex[:8]}"
+
+    @staticmethod
+    def _record_path(models_dir: str, key: str) -> str:
+        """Path of the file the result of a run is recorded in."""
+        return os.path.join(models_dir, "registry", f"{key}.json")
+
+    def lookup(self, models_dir: str, key: str) -> Optional[Dict[str, Any]]:
+        """Get the recorded result of a training run.
+
+        Args:
+            models_dir: Directory of the trained models.
+            key: Key built with ``make_key``.
+
+        Returns:
+            The training result, or None if the run was never recorded or its
+            model file no longer exists.
+        """
+        try:
+            try:
+                with open(self._record_path(models_dir, key), "rb") as f:
+                    result = loads_json(f.read())
+            except FileNotFoundError:
+                result = None
+
+            if result is not None:
+                result["model_path"] = os.path.join(models_dir, f"{result['model_id']}.joblib")
+                if not os.path.exists(result["model_path"]):
+                    result = None
+
+            with self._lock:
+                if result is None:
+                    self._misses += 1
+                else:
+                    self._hits += 1
+            return result
+        except Exception as e:
+            logger.error(f"Error looking up training registry: {str(e)}")
+            raise
+
+    def register(self, models_dir: str, key: str, result: Dict[str, Any]) -> None:
+        """Record the result of a training run.
+
+        Args:
+            models_dir: Directory of the trained models.
+            key: Key built with ``make_key``.
+            result: Training result, as returned by ``train_model``.
+        """
+        try:
+            path = self._record_path(models_dir, key)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+            # Write to a temporary file first so readers never see a partial record
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(dumps_json({**result, "registry_key": key}))
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.error(f"Error recording training run: {str(e)}")
+            raise
+
+    def store_artifact(self, models_dir: str, model_path: str) -> str:
+        """Deduplicate a model file against the stored artifacts.
+
+        If an artifact with the same content exists, the model file is
+        replaced by a hard link to it; otherwise the model file becomes the
+        stored artifact. Without hard link support the file is left as is.
+
+        Args:
+            models_dir: Directory of the trained models.
+            model_path: Path of the model file just written.
+
+        Returns:
+            SHA-256 digest of the artifact.
+        """
+        try:
+            hasher = hashlib.sha256()
+            with open(model_path, "rb") as f:
+                for block in iter(lambda: f.read(ARTIFACT_HASH_BLOCK_SIZE), b""):
+                    hasher.update(block)
+            digest = hasher.hexdigest()
+
+            artifacts_dir = os.path.join(models_dir, "artifacts")
+            os.makedirs(artifacts_dir, exist_ok=True)
+            artifact_path = os.path.join(artifacts_dir, f"{digest}.joblib")
+            try:
+                if os.path.exists(artifact_path):
+                    tmp_path = f"{model_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                    os.link(artifact_path, tmp_path)
+                    os.replace(tmp_path, model_path)
+                else:
+                    os.link(model_path, artifact_path)
+            except FileExistsError:
+                # Stored concurrently by an identical run
+                pass
+            except OSError as e:
+                logger.warning(f"Model artifact not deduplicated: {str(e)}")
+            return digest
+        except Exception as e:
+            logger.error(f"Error storing model artifact: {str(e)}")
+            raise
+
+    def get_stats(self, models_dir: str) -> Dict[str, Any]:
+        """Get registry statistics.
+
+        Args:
+            models_dir: Directory of the trained models.
+
+        Returns:
+            Dictionary with hit/miss counters of this process, the number of
+            recorded runs and model files, and the disk space of the stored
+            artifacts against that of the model files they back.
+        """
+        records_dir = os.path.join(models_dir, "registry")
+        artifacts_dir = os.path.join(models_dir, "artifacts")
+        records = (
+            sum(1 for name in os.listdir(records_dir) if name.endswith(".json"))
+            if os.path.isdir(records_dir) else 0
+        )
+        artifacts = []
+        if os.path.isdir(artifacts_dir):
+            for name in os.listdir(artifacts_dir):
+                if name.endswith(".joblib"):
+                    artifacts.append(os.stat(os.path.join(artifacts_dir, name)))
+        models = [
+            os.stat(os.path.join(models_dir, name)) for name in os.listdir(models_dir)
+            if name.endswith(".joblib")
+        ] if os.path.isdir(models_dir) else []
+
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "records": records,
+                "models": len(models),
+                "artifacts": len(artifacts),
+                "model_bytes": sum(stat.st_size for stat in models),
+                "artifact_bytes": sum(stat.st_size for stat in artifacts),
+            }
+
+# Create a singleton instance
+training_registry = TrainingRegistry()
@@ -0,0 +1,143 @@
+import os
+import time
+import queue
+import logging
+import threading
+import multiprocessing
+from typing import Dict, List, Any, Callable, Optional, Tuple
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Seconds between checks for finished, failed or overdue trials
+POLL_INTERVAL = 0.2
+# Trial processes running at once in this process, across all pools
+TRIAL_PROCESSES = int(os.environ.get("TRIAL_PROCESSES", os.cpu_count() or 1))
+
+# Shared by every TrialPool, so concurrent leaderboards and searches do not
+# start more trial processes together than TRIAL_PROCESSES
+_trial_slots = threading.BoundedSemaphore(max(1, TRIAL_PROCESSES))
+
+def _run_trial(target: Callable, key: str, args: Tuple, messages) -> None:
+    """Entry point of a trial worker process.
+
+    Calls the trial function and reports its result, or its error, back
+    through the shared message queue.
+    """
+    try:
+        messages.put(("result", key, target(*args)))
+    except Exception as e:
+        logger.error(f"Error in trial {key}: {str(e)}")
+        messages.put(("error", key, str(e)))
+
+class TrialPool:
+    """Runs model training trials in parallel, one process per trial.
+
+    Unlike a process pool, every trial has its own process, so the trials
+    still running when a deadline passes or a stop is requested can be
+    terminated without waiting for them. A trial starts only when both the
+    pool and the process-wide limit (``TRIAL_PROCESSES``) have room for it.
+    """
+
+    def __init__(self, max_workers: int, start_method: str = "spawn"):
+        """Initialize the TrialPool.
+
+        Args:
+            max_workers: Maximum number of concurrently running trials.
+            start_method: multiprocessing start method for trial processes.
+        """
+        self.max_workers = max(1, max_workers)
+        self._context = multiprocessing.get_context(start_method)
+
+    def run(
+        self,
+        trials: List[Tuple[str, Callable, Tuple]],
+        on_finish: Callable[[str, str, Any], None],
+        deadline: Optional[float] = None,
+        stop_event: Optional[threading.Event] = None
+    ) -> bool:
+        """Run trials until all have finished, the deadline passes or a stop is requested.
+
+        Args:
+            trials: ``(key, target, args)`` for each trial, in start order.
+                ``target`` must be a picklable (module-level) function.
+            on_finish: Called as ``on_finish(key, status, payload)`` when a
+                trial ends. ``status`` is 'completed' (payload: the return
+                value of the target), 'failed' (the error), 'timed_out' or
+                'cancelled' (terminated while running) or 'skipped' (never
+                started).
+            deadline: Wall-clock time (``time.time()``) after which running
+                trials are terminated and the rest skipped.
+            stop_event: Set to stop early in the same way.
+
+        Returns:
+            Whether the deadline was reached.
+        """
+        messages = self._context.Queue()
+        pending = list(trials)
+        running: Dict[str, Any] = {}
+
+        def release(key: str) -> Optional[Any]:
+            process = running.pop(key, None)
+            if process is not None:
+                _trial_slots.release()
+            return process
+
+        def stop(key: str, status: str, message: str) -> None:
+            process = release(key)
+            process.terminate()
+            process.join(timeout=5)
+            if process.is_alive():
+                process.kill()
+            on_finish(key, status, message)
+
+        def drain(timeout: float) -> None:
+            block = timeout > 0
+            while True:
+                try:
+                    kind, key, payload = messages.get(block=block, timeout=timeout if block else None)
+                except queue.Empty:
+                    return
+                block = False
+                process = release(key)
+                if process is None:
+                    continue
+                process.join(timeout=POLL_INTERVAL)
+                on_finish(key, "completed" if kind == "result" else "failed", payload)
+
+        try:
+            while pending or running:
+                cancelled = stop_event is not None and stop_event.is_set()
+                if cancelled or (deadline is not None and time.time() > deadline):
+                    status, message = ("cancelled", "Cancelled") if cancelled else ("timed_out", "Time budget exhausted")
+                    for key in list(running):
+                        stop(key, status, message)
+                    for key, _, _ in pending:
+                        on_finish(key, "skipped", message)
+                    return not cancelled
+
+                while pending and len(running) < self.max_workers and _trial_slots.acquire(blocking=False):
+                    key, target, args = pending.pop(0)
+                    process = self._context.Process(
+                        target=_run_trial, args=(target, key, args, messages), daemon=True
+                    )
+                    try:
+                        process.start()
+                    except BaseException:
+                        _trial_slots.release()
+                        raise
+                    running[key] = process
+
+                drain(POLL_INTERVAL)
+                for key, process in list(running.items()):
+                    if not process.is_alive():
+                        # The worker may have reported just before exiting
+                        drain(POLL_INTERVAL)
+                        if key in running:
+                            release(key)
+                            on_finish(key, "failed", f"Worker exited with code {process.exitcode}")
+            return False
+        finally:
+            for key in list(running):
+                release(key).kill()
@@ -0,0 +1,4 @@
+from .executor import task_executor
+from .serialization import response_encoder
+
+__all__ = ["task_executor", "response_encoder"]
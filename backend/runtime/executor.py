@@ -0,0 +1,324 @@
+import os
+import time
+import asyncio
+import logging
+import threading
+import multiprocessing
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, Executor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Any, Callable, Optional, Tuple
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Pool sizes and process start method
+EXECUTOR_IO_WORKERS = int(os.environ.get("EXECUTOR_IO_WORKERS", min(32, (os.cpu_count() or 1) + 4)))
+EXECUTOR_CPU_WORKERS = int(os.environ.get("EXECUTOR_CPU_WORKERS", os.cpu_count() or 1))
+EXECUTOR_START_METHOD = os.environ.get("EXECUTOR_START_METHOD", "spawn")
+
+# Number of recent calls kept per pool for latency percentiles
+LATENCY_WINDOW = 1000
+
+def _timed_call(fn: Callable, args: Tuple, kwargs: Dict[str, Any]) -> Tuple[float, float, Any]:
+    """Run a function and report when it started and finished.
+
+    Defined at module level so it can be pickled for the process pool.
+    """
+    started_at = time.time()
+    result = fn(*args, **kwargs)
+    return started_at, time.time(), result
+
+def _init_cpu_worker(cpu_workers: int) -> None:
+    """Initialize a process of the CPU pool (see ``runtime.tasks.init_worker``)."""
+    from .tasks import init_worker
+    init_worker(cpu_workers)
+
+def _timed_worker_call(fn: Callable, args: Tuple, kwargs: Dict[str, Any]) -> Tuple[float, float, Any, int, Dict[str, Any]]:
+    """Run a function in a CPU pool process and also report the process ID and its cache statistics."""
+    from .tasks import worker_stats
+    started_at, finished_at, result = _timed_call(fn, args, kwargs)
+    return started_at, finished_at, result, os.getpid(), worker_stats()
+
+class PoolMetrics:
+    """Queue depth and latency counters for one pool."""
+
+    def __init__(self, workers: int):
+        """Initialize the PoolMetrics.
+
+        Args:
+            workers: Number of workers in the pool.
+        """
+        self.workers = workers
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.in_flight = 0
+        self.max_queue_depth = 0
+        self.wait_times = deque(maxlen=LATENCY_WINDOW)
+        self.run_times = deque(maxlen=LATENCY_WINDOW)
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+        self._lock = threading.Lock()
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of submitted calls waiting for a free worker."""
+        return max(0, self.in_flight - self.workers)
+
+    def on_submit(self) -> None:
+        """Record a call handed to the pool."""
+        with self._lock:
+            self.submitted += 1
+            self.in_flight += 1
+            self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+
+    def on_finish(self, submitted_at: float, started_at: Optional[float], finished_at: Optional[float], failed: bool) -> None:
+        """Record a finished call and its queue wait/run times."""
+        with self._lock:
+            self.in_flight -= 1
+            if failed:
+                self.failed += 1
+            else:
+                self.completed += 1
+                self.wait_times.append(max(0.0, started_at - submitted_at))
+                self.run_times.append(finished_at - started_at)
+            self.latencies.append(time.time() - submitted_at)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Get a JSON-serializable view of the counters."""
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "failed": self.failed,
+                "in_flight": self.in_flight,
+                "queue_depth": self.queue_depth,
+                "max_queue_depth": self.max_queue_depth,
+                "queue_wait_seconds": _summarize(self.wait_times),
+                "run_seconds": _summarize(self.run_times),
+                "latency_seconds": _summarize(self.latencies),
+            }
+
+def _summarize(values: deque) -> Dict[str, Optional[float]]:
+    """Mean/p50/p95/max of a window of durations."""
+    if not values:
+        return {"mean": None, "p50": None, "p95": None, "max": None}
+    ordered = sorted(values)
+    return {
+        "mean": sum(ordered) / len(ordered),
+        "p50": ordered[int(0.50 * (len(ordered) - 1))],
+        "p95": ordered[int(0.95 * (len(ordered) - 1))],
+        "max": ordered[-1],
+    }
+
+class TaskExecutor:
+    """Runs blocking work off the asyncio event loop.
+
+    ``run_io`` uses a thread pool and suits file/network access and
+    libraries that release the GIL. ``run_cpu`` uses a process pool for
+    CPU-heavy pandas/sklearn work; its functions and arguments must be
+    picklable, so pass identifiers or paths rather than large objects.
+    ``run_thread`` gives a call that blocks for minutes a thread of its
+    own, so it does not hold one of the I/O pool.
+
+    Each CPU worker keeps its own caches (e.g. of parsed datasets) and
+    thread pools, sized by ``runtime.tasks.init_worker`` when the worker
+    starts. Their latest
+    statistics are reported with every call and exposed by
+    ``get_worker_stats``.
+    """
+
+    def __init__(
+        self,
+        io_workers: int = EXECUTOR_IO_WORKERS,
+        cpu_workers: int = EXECUTOR_CPU_WORKERS,
+        start_method: str = EXECUTOR_START_METHOD
+    ):
+        """Initialize the TaskExecutor. Pools are created on first use.
+
+        Args:
+            io_workers: Number of threads in the I/O pool.
+            cpu_workers: Number of processes in the CPU pool.
+            start_method: multiprocessing start method for the CPU pool.
+        """
+        self.io_workers = io_workers
+        self.cpu_workers = cpu_workers
+        self.start_method = start_method
+        self._pools: Dict[str, Executor] = {}
+        self._manager = None
+        self._metrics = {
+            "io": PoolMetrics(io_workers),
+            "cpu": PoolMetrics(cpu_workers),
+        }
+        self._worker_stats: Dict[int, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def _get_pool(self, kind: str) -> Executor:
+        """Get (creating if needed) the pool of the given kind."""
+        with self._lock:
+            pool = self._pools.get(kind)
+            if pool is None:
+                if kind == "io":
+                    pool = ThreadPoolExecutor(max_workers=self.io_workers, thread_name_prefix="io-worker")
+                else:
+                    pool = ProcessPoolExecutor(
+                        max_workers=self.cpu_workers,
+                        mp_context=multiprocessing.get_context(self.start_method),
+                        initializer=_init_cpu_worker,
+                        initargs=(self.cpu_workers,)
+                    )
+                self._pools[kind] = pool
+            return pool
+
+    async def run_io(self, fn: Callable, *args, **kwargs) -> Any:
+        """Run a blocking I/O-bound function on the thread pool.
+
+        Args:
+            fn: Function to call.
+            *args: Positional arguments for ``fn``.
+            **kwargs: Keyword arguments for ``fn``.
+
+        Returns:
+            The function's return value.
+        """
+        return await self._run("io", fn, args, kwargs)
+
+    async def run_cpu(self, fn: Callable, *args, **kwargs) -> Any:
+        """Run a CPU-bound function on the process pool.
+
+        Args:
+            fn: Picklable (module-level) function to call.
+            *args: Picklable positional arguments for ``fn``.
+            **kwargs: Picklable keyword arguments for ``fn``.
+
+        Returns:
+            The function's return value.
+        """
+        return await self._run("cpu", fn, args, kwargs)
+
+    async def run_thread(self, fn: Callable, *args, **kwargs) -> Any:
+        """Run a long blocking function on a thread of its own.
+
+        For calls that block for minutes (e.g. driving trial processes or
+        waiting on a worker's queue), which would otherwise hold a thread
+        of the shared I/O pool for as long.
+
+        Args:
+            fn: Function to call.
+            *args: Positional arguments for ``fn``.
+            **kwargs: Keyword arguments for ``fn``.
+
+        Returns:
+            The function's return value.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        def settle(result: Any, error: Optional[BaseException]) -> None:
+            if future.done():
+                return
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+        def target() -> None:
+            try:
+                result, error = fn(*args, **kwargs), None
+            except BaseException as e:
+                result, error = None, e
+            try:
+                loop.call_soon_threadsafe(settle, result, error)
+            except RuntimeError:
+                # The event loop was closed meanwhile
+                pass
+
+        threading.Thread(target=target, name=f"task-{getattr(fn, '__name__', 'call')}", daemon=True).start()
+        return await future
+
+    async def _run(self, kind: str, fn: Callable, args: Tuple, kwargs: Dict[str, Any]) -> Any:
+        """Submit a call to a pool and record its metrics."""
+        metrics = self._metrics[kind]
+        pool = self._get_pool(kind)
+        loop = asyncio.get_running_loop()
+
+        submitted_at = time.time()
+        metrics.on_submit()
+        try:
+            if kind == "cpu":
+                started_at, finished_at, result, pid, stats = await loop.run_in_executor(
+                    pool, _timed_worker_call, fn, args, kwargs
+                )
+                with self._lock:
+                    self._worker_stats[pid] = stats
+            else:
+                started_at, finished_at, result = await loop.run_in_executor(pool, _timed_call, fn, args, kwargs)
+        except BrokenProcessPool:
+            metrics.on_finish(submitted_at, None, None, failed=True)
+            # A worker died (e.g. killed by the OOM killer); start a fresh pool next time
+            with self._lock:
+                if self._pools.get(kind) is pool:
+                    del self._pools[kind]
+                    self._worker_stats.clear()
+            logger.error(f"{kind} pool broken, it will be recreated")
+            raise
+        except BaseException:
+            metrics.on_finish(submitted_at, None, None, failed=True)
+            raise
+
+        metrics.on_finish(submitted_at, started_at, finished_at, failed=False)
+        return result
+
+    def create_queue(self):
+        """Create a queue that process-pool workers can send results through.
+
+        Lets a ``run_cpu`` function stream partial results back while it
+        runs; pass the queue as an argument. Queues are served by a manager
+        process started on first use.
+
+        Returns:
+            A picklable queue proxy.
+        """
+        with self._lock:
+            if self._manager is None:
+                self._manager = multiprocessing.get_context(self.start_method).Manager()
+            return self._manager.Queue()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get per-pool queue depth and latency metrics.
+
+        Returns:
+            Dictionary keyed by pool kind ('io', 'cpu').
+        """
+        return {kind: metrics.snapshot() for kind, metrics in self._metrics.items()}
+
+    def get_worker_stats(self) -> Dict[int, Dict[str, Any]]:
+        """Get the cache statistics last reported by each CPU worker.
+
+        Returns:
+            Dictionary keyed by worker process ID; workers that have not
+            finished a call yet are missing.
+        """
+        with self._lock:
+            return {pid: dict(stats) for pid, stats in self._worker_stats.items()}
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Shut down all pools.
+
+        Args:
+            wait: Whether to wait for running calls to finish.
+        """
+        with self._lock:
+            pools = list(self._pools.values())
+            self._pools.clear()
+            self._worker_stats.clear()
+            manager, self._manager = self._manager, None
+        for pool in pools:
+            pool.shutdown(wait=wait)
+        if manager is not None:
+            manager.shutdown()
+
+# Create a singleton instance
+task_executor = TaskExecutor()
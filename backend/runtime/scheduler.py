@@ -0,0 +1,364 @@
+import os
+import heapq
+import queue
+import logging
+import threading
+import itertools
+import multiprocessing
+import uuid
+from datetime import datetime
+from typing import Dict, Any, Callable, Optional, List
+
+from services.database_service import db_service
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Maximum number of jobs running at the same time, each in its own process
+SCHEDULER_WORKERS = int(os.environ.get("SCHEDULER_WORKERS", 2))
+# Default wall-clock limit of a job in seconds
+SCHEDULER_JOB_TIMEOUT = float(os.environ.get("SCHEDULER_JOB_TIMEOUT", 3600))
+SCHEDULER_START_METHOD = os.environ.get("SCHEDULER_START_METHOD", "spawn")
+
+# Seconds between checks for finished, timed out or cancelled jobs
+POLL_INTERVAL = 0.2
+
+# Job states that are final
+FINISHED_STATUSES = {"completed", "failed", "cancelled", "timed_out"}
+
+def _run_job(handler: Callable, job_id: str, params: Dict[str, Any], messages) -> None:
+    """Entry point of a job worker process.
+
+    Runs the handler and reports progress, the result or the error back to
+    the scheduler through the shared message queue.
+    """
+    def progress(fraction: float, message: str = "") -> None:
+        messages.put(("progress", job_id, {"fraction": float(fraction), "message": message}))
+
+    try:
+        result = handler(job_id, params, progress)
+        messages.put(("result", job_id, result))
+    except Exception as e:
+        logger.error(f"Error in job {job_id}: {str(e)}")
+        messages.put(("error", job_id, str(e)))
+
+class JobScheduler:
+    """Priority scheduler that runs jobs in separate worker processes.
+
+    The scheduler owns the lifecycle of job records: it creates them on
+    submission and moves them through ``pending``, ``running`` and one of
+    ``completed``, ``failed``, ``cancelled`` or ``timed_out``. Each running
+    job gets its own process, so a cancelled or timed out job can be
+    terminated without affecting the API process or other jobs.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = SCHEDULER_WORKERS,
+        default_timeout: float = SCHEDULER_JOB_TIMEOUT,
+        start_method: str = SCHEDULER_START_METHOD
+    ):
+        """Initialize the JobScheduler.
+
+        Args:
+            max_workers: Maximum number of concurrently running jobs.
+            default_timeout: Default per-job timeout in seconds.
+            start_method: multiprocessing start method for job processes.
+        """
+        self.max_workers = max_workers
+        self.default_timeout = default_timeout
+        self._context = multiprocessing.get_context(start_method)
+        self._handlers: Dict[str, Dict[str, Optional[Callable]]] = {}
+        self._queue: List = []
+        self._sequence = itertools.count()
+        self._running: Dict[str, Dict[str, Any]] = {}
+        self._cancelled: set = set()
+        self._messages = None
+        self._thread = None
+        self._stopping = False
+        self._condition = threading.Condition()
+
+    def register(self, job_type: str, handler: Callable, on_complete: Optional[Callable] = None) -> None:
+        """Register the handler of a job type.
+
+        Args:
+            job_type: Name of the job type.
+            handler: Module-level function ``handler(job_id, params, progress)``
+                run in the worker process. ``progress(fraction, message)``
+                reports progress; the return value is the job result.
+            on_complete: Optional function ``on_complete(job_info, result)``
+                run in the API process when the job succeeds. Its return
+                value replaces the result stored on the job record.
+        """
+        self._handlers[job_type] = {"handler": handler, "on_complete": on_complete}
+
+    def start(self) -> None:
+        """Start the dispatcher thread."""
+        with self._condition:
+            if self._thread is not None:
+                return
+            self._stopping = False
+            self._messages = self._context.Queue()
+            self._thread = threading.Thread(target=self._dispatch_loop, name="job-scheduler", daemon=True)
+            self._thread.start()
+
+    def shutdown(self) -> None:
+        """Stop the dispatcher and terminate running jobs."""
+        with self._condition:
+            self._stopping = True
+            self._condition.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join()
+        self._thread = None
+
+    def submit(
+        self,
+        job_type: str,
+        params: Dict[str, Any],
+        priority: int = 0,
+        timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """Create a job record and queue the job.
+
+        Args:
+            job_type: Registered job type.
+            params: Job parameters. Must be picklable; pass identifiers
+                (e.g. a dataset id) rather than data.
+            priority: Higher priorities run first; equal priorities run in
+                submission order.
+            timeout: Wall-clock limit in seconds (scheduler default if None).
+
+        Returns:
+            The created job record.
+        """
+        if job_type not in self._handlers:
+            raise ValueError(f"Unknown job type: {job_type}")
+
+        job_info = {
+            "id": str(uuid.uuid4()),
+            "type": job_type,
+            "status": "pending",
+            "params": params,
+            "priority": priority,
+            "timeout": timeout if timeout is not None else self.default_timeout,
+            "progress": {"fraction": 0.0, "message": "Queued"},
+            "created_at": datetime.now()
+        }
+        db_service.save_job(job_info)
+
+        with self._condition:
+            heapq.heappush(self._queue, (-priority, next(self._sequence), job_info["id"]))
+            self._condition.notify_all()
+
+        return job_info
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a pending or running job.
+
+        Args:
+            job_id: ID of the job to cancel.
+
+        Returns:
+            False if the job is unknown or already finished.
+        """
+        job_info = db_service.get_job(job_id)
+        if not job_info or job_info["status"] in FINISHED_STATUSES:
+            return False
+
+        with self._condition:
+            queued = [entry for entry in self._queue if entry[2] == job_id]
+            if queued:
+                self._queue.remove(queued[0])
+                heapq.heapify(self._queue)
+            else:
+                # Running (or about to start); the dispatcher terminates it
+                self._cancelled.add(job_id)
+            self._condition.notify_all()
+
+        if queued:
+            self._update_job(job_id, status="cancelled", progress={"fraction": 0.0, "message": "Cancelled"})
+        return True
+
+    def get_progress(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Get the status and progress of a job.
+
+        Args:
+            job_id: ID of the job.
+
+        Returns:
+            Status, progress and result of the job, or None if unknown.
+        """
+        job_info = db_service.get_job(job_id)
+        if not job_info:
+            return None
+
+        with self._condition:
+            queue_position = None
+            if job_info["status"] == "pending":
+                ordered = [entry[2] for entry in sorted(self._queue)]
+                if job_id in ordered:
+                    queue_position = ordered.index(job_id)
+
+        return {
+            "id": job_id,
+            "type": job_info["type"],
+            "status": job_info["status"],
+            "progress": job_info.get("progress"),
+            "queue_position": queue_position,
+            "result": job_info.get("result"),
+            "created_at": job_info["created_at"],
+            "updated_at": job_info.get("updated_at")
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get scheduler occupancy.
+
+        Returns:
+            Dictionary with worker count and queued/running job counts.
+        """
+        with self._condition:
+            return {
+                "workers": self.max_workers,
+                "running": len(self._running),
+                "queued": len(self._queue),
+            }
+
+    def _update_job(self, job_id: str, **fields) -> Optional[Dict[str, Any]]:
+        """Update fields of a job record."""
+        job_info = db_service.get_job(job_id)
+        if not job_info:
+            logger.error(f"Job not found: {job_id}")
+            return None
+        job_info.update(fields)
+        job_info["updated_at"] = datetime.now()
+        db_service.save_job(job_info)
+        return job_info
+
+    def _dispatch_loop(self) -> None:
+        """Start queued jobs, collect worker messages and enforce limits."""
+        while True:
+            with self._condition:
+                if self._stopping:
+                    break
+                if not self._running and not self._queue:
+                    self._condition.wait()
+                    continue
+
+            self._drain_messages(timeout=POLL_INTERVAL)
+            self._check_running()
+            self._start_queued()
+
+        for job_id in list(self._running):
+            self._stop_job(job_id, "cancelled", "Scheduler shut down")
+
+    def _start_queued(self) -> None:
+        """Start queued jobs while worker slots are free."""
+        while True:
+            with self._condition:
+                if len(self._running) >= self.max_workers or not self._queue:
+                    return
+                _, _, job_id = heapq.heappop(self._queue)
+
+            job_info = db_service.get_job(job_id)
+            if not job_info:
+                continue
+
+            handler = self._handlers[job_info["type"]]["handler"]
+            process = self._context.Process(
+                target=_run_job,
+                args=(handler, job_id, job_info["params"], self._messages),
+                daemon=True
+            )
+            process.start()
+
+            with self._condition:
+                self._running[job_id] = {
+                    "process": process,
+                    "deadline": datetime.now().timestamp() + job_info["timeout"],
+                }
+            self._update_job(job_id, status="running", progress={"fraction": 0.0, "message": "Started"})
+
+    def _drain_messages(self, timeout: float = 0.0) -> None:
+        """Apply all progress/result/error messages sent by workers."""
+        block = timeout > 0
+        while True:
+            try:
+                kind, job_id, payload = self._messages.get(block=block, timeout=timeout if block else None)
+            except queue.Empty:
+                return
+            block = False
+
+            if kind == "progress":
+                if job_id in self._running:
+                    self._update_job(job_id, progress=payload)
+            elif kind == "result":
+                self._finish_job(job_id, payload)
+            else:
+                self._finish_job(job_id, None, error=payload)
+
+    def _finish_job(self, job_id: str, result: Optional[Dict[str, Any]], error: Optional[str] = None) -> None:
+        """Record the outcome of a job whose worker has reported back."""
+        with self._condition:
+            entry = self._running.pop(job_id, None)
+            self._cancelled.discard(job_id)
+        if entry is None:
+            return
+        entry["process"].join(timeout=POLL_INTERVAL)
+
+        if error is None:
+            try:
+                job_info = db_service.get_job(job_id)
+                on_complete = self._handlers[job_info["type"]]["on_complete"]
+                if on_complete is not None:
+                    result = on_complete(job_info, result)
+                self._update_job(job_id, status="completed", result=result,
+                                 progress={"fraction": 1.0, "message": "Completed"})
+                return
+            except Exception as e:
+                logger.error(f"Error completing job {job_id}: {str(e)}")
+                error = str(e)
+
+        self._update_job(job_id, status="failed", result={"error": error})
+
+    def _check_running(self) -> None:
+        """Terminate cancelled or timed out jobs and detect crashed workers."""
+        now = datetime.now().timestamp()
+        with self._condition:
+            running = list(self._running.items())
+            cancelled = set(self._cancelled)
+
+        for job_id, entry in running:
+            if job_id in cancelled:
+                self._stop_job(job_id, "cancelled", "Cancelled")
+            elif now > entry["deadline"]:
+                self._stop_job(job_id, "timed_out", "Timed out")
+            elif not entry["process"].is_alive():
+                # The worker may have reported just before exiting
+                self._drain_messages(timeout=POLL_INTERVAL)
+                if job_id in self._running:
+                    self._finish_job(job_id, None, error=f"Worker exited with code {entry['process'].exitcode}")
+
+    def _stop_job(self, job_id: str, status: str, message: str) -> None:
+        """Terminate the worker of a running job and record the final status."""
+        with self._condition:
+            entry = self._running.pop(job_id, None)
+            self._cancelled.discard(job_id)
+        if entry is None:
+            return
+
+        process = entry["process"]
+        process.terminate()
+        process.join(timeout=5)
+        if process.is_alive():
+            process.kill()
+
+        job_info = db_service.get_job(job_id)
+        fraction = (job_info or {}).get("progress", {}).get("fraction", 0.0)
+        self._update_job(job_id, status=status, result={"error": message},
+                         progress={"fraction": fraction, "message": message})
+        logger.info(f"Job {job_id} {status}")
+
+# Create a singleton instance
+job_scheduler = JobScheduler()
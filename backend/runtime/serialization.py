@@ -0,0 +1,313 @@
+import os
+import json
+import gzip
+import math
+import logging
+import importlib
+from datetime import datetime, date
+from functools import lru_cache
+from typing import Dict, List, Any, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Responses smaller than this are sent uncompressed
+RESPONSE_COMPRESSION_MIN_BYTES = int(os.environ.get("RESPONSE_COMPRESSION_MIN_BYTES", 4096))
+# Compression levels: fast settings, as responses are compressed per request
+RESPONSE_GZIP_LEVEL = int(os.environ.get("RESPONSE_GZIP_LEVEL", 1))
+RESPONSE_ZSTD_LEVEL = int(os.environ.get("RESPONSE_ZSTD_LEVEL", 3))
+
+# Media types
+JSON = "application/json"
+MSGPACK = "application/msgpack"
+ARROW = "application/vnd.apache.arrow.stream"
+
+# Other names clients use for the same media types
+MEDIA_TYPE_ALIASES = {
+    "application/x-msgpack": MSGPACK,
+    "application/vnd.msgpack": MSGPACK,
+}
+
+@lru_cache(maxsize=None)
+def _optional_module(name: str) -> Optional[Any]:
+    """Import an optional dependency, or return None if it is not installed."""
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        return None
+
+def json_default(value: Any) -> Any:
+    """Convert the numpy/pandas values found in analytical payloads to JSON types."""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, (pd.Timestamp, datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (pd.Series, pd.Index)):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def _json_key(key: Any) -> str:
+    """Convert a mapping key to a string, as orjson's ``OPT_NON_STR_KEYS`` does."""
+    if isinstance(key, str):
+        return key
+    if isinstance(key, np.generic):
+        key = key.item()
+    if isinstance(key, (pd.Timestamp, datetime, date)):
+        return key.isoformat()
+    if isinstance(key, bool) or key is None:
+        return json.dumps(key)
+    return str(key)
+
+def _json_compatible(value: Any) -> Any:
+    """Convert a payload to standard JSON types, with NaN and infinities as None."""
+    if isinstance(value, dict):
+        return {_json_key(key): _json_compatible(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_json_compatible(item) for item in value]
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if value is None or isinstance(value, (str, int)):
+        return value
+    return _json_compatible(json_default(value))
+
+def dumps_json(payload: Any) -> bytes:
+    """Serialize a payload to JSON bytes.
+
+    Uses orjson when it is installed, which serializes NumPy arrays and
+    scalars natively; falls back to the standard library. Either way NaN
+    and infinities are written as null and non-string keys as strings.
+
+    Args:
+        payload: Payload to serialize.
+
+    Returns:
+        UTF-8 encoded JSON document.
+    """
+    orjson = _optional_module("orjson")
+    if orjson is not None:
+        return orjson.dumps(
+            payload, default=json_default, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        )
+    return json.dumps(_json_compatible(payload), allow_nan=False).encode("utf-8")
+
+def loads_json(body: bytes) -> Any:
+    """Parse JSON bytes, with orjson when it is installed."""
+    orjson = _optional_module("orjson")
+    if orjson is not None:
+        return orjson.loads(body)
+    return json.loads(body)
+
+def _parse_header(header: Optional[str]) -> List[Tuple[str, float]]:
+    """Parse an Accept or Accept-Encoding header into ``(value, quality)`` pairs."""
+    entries = []
+    for part in (header or "").split(","):
+        value, _, params = part.strip().partition(";")
+        if not value:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, number = param.strip().partition("=")
+            if key == "q":
+                try:
+                    quality = float(number)
+                except ValueError:
+                    quality = 0.0
+        entries.append((value.strip().lower(), quality))
+    return entries
+
+class ResponseEncoder:
+    """Content negotiation and encoding of large analytical responses.
+
+    The response format is picked from the Accept header among JSON,
+    MessagePack and, for tabular payloads, Arrow IPC streams; bodies above a
+    size threshold are compressed with zstd or gzip as allowed by the
+    Accept-Encoding header. orjson, msgpack and zstandard are optional:
+    formats and encodings whose library is not installed are not offered.
+    """
+
+    def __init__(
+        self,
+        compression_min_bytes: int = RESPONSE_COMPRESSION_MIN_BYTES,
+        gzip_level: int = RESPONSE_GZIP_LEVEL,
+        zstd_level: int = RESPONSE_ZSTD_LEVEL
+    ):
+        """Initialize the ResponseEncoder.
+
+        Args:
+            compression_min_bytes: Smallest body that is compressed.
+            gzip_level: gzip compression level.
+            zstd_level: zstd compression level.
+        """
+        self.compression_min_bytes = compression_min_bytes
+        self.gzip_level = gzip_level
+        self.zstd_level = zstd_level
+
+    def formats(self, tabular: bool = False) -> List[str]:
+        """List the available response formats, most preferred first.
+
+        Args:
+            tabular: Whether the payload has a table that Arrow can carry.
+
+        Returns:
+            Media types.
+        """
+        formats = [JSON]
+        if _optional_module("msgpack") is not None:
+            formats.append(MSGPACK)
+        if tabular:
+            formats.append(ARROW)
+        return formats
+
+    def encodings(self) -> List[str]:
+        """List the available content encodings, most preferred first."""
+        encodings = ["gzip"]
+        if _optional_module("zstandard") is not None:
+            encodings.insert(0, "zstd")
+        return encodings
+
+    def negotiate(self, accept: Optional[str], tabular: bool = False) -> Optional[str]:
+        """Pick the response format for an Accept header.
+
+        Args:
+            accept: Accept header (None accepts anything).
+            tabular: Whether the payload has a table that Arrow can carry.
+
+        Returns:
+            The best acceptable media type, or None if none is acceptable.
+        """
+        formats = self.formats(tabular)
+        entries = _parse_header(accept)
+        if not entries:
+            return formats[0]
+
+        def quality(media_type: str) -> float:
+            best = 0.0
+            family = media_type.split("/")[0]
+            for value, q in entries:
+                value = MEDIA_TYPE_ALIASES.get(value, value)
+                if value in (media_type, f"{family}/*", "*/*"):
+                    best = max(best, q)
+            return best
+
+        # Highest quality wins; ties go to the server's preference order
+        scored = [(quality(media_type), -rank, media_type) for rank, media_type in enumerate(formats)]
+        q, _, media_type = max(scored)
+        return media_type if q > 0 else None
+
+    def negotiate_encoding(self, accept_encoding: Optional[str]) -> Optional[str]:
+        """Pick the content encoding for an Accept-Encoding header.
+
+        Args:
+            accept_encoding: Accept-Encoding header.
+
+        Returns:
+            'zstd', 'gzip' or None (identity).
+        """
+        qualities = dict(_parse_header(accept_encoding))
+        scored = [
+            (qualities.get(encoding, qualities.get("*", 0.0)), -rank, encoding)
+            for rank, encoding in enumerate(self.encodings())
+        ]
+        q, _, encoding = max(scored)
+        return encoding if q > 0 else None
+
+    def serialize(
+        self,
+        payload: Any,
+        media_type: str,
+        table: Optional[pd.DataFrame] = None,
+        table_metadata: Optional[Dict[str, Any]] = None
+    ) -> bytes:
+        """Serialize a payload in a format.
+
+        Args:
+            payload: Payload to serialize as JSON or MessagePack.
+            media_type: One of the media types of ``formats``.
+            table: Tabular form of the payload, sent instead of it as Arrow.
+            table_metadata: Rest of the payload, stored as JSON in the Arrow
+                schema metadata under ``payload``.
+
+        Returns:
+            Serialized body.
+        """
+        try:
+            if media_type == JSON:
+                return dumps_json(payload)
+            if media_type == MSGPACK:
+                msgpack = _optional_module("msgpack")
+                return msgpack.packb(payload, default=json_default, use_bin_type=True)
+            if media_type == ARROW:
+                import pyarrow as pa
+
+                arrow_table = pa.Table.from_pandas(table, preserve_index=False)
+                arrow_table = arrow_table.replace_schema_metadata({"payload": dumps_json(table_metadata or {})})
+                sink = pa.BufferOutputStream()
+                with pa.ipc.new_stream(sink, arrow_table.schema) as writer:
+                    writer.write_table(arrow_table)
+                return sink.getvalue().to_pybytes()
+            raise ValueError(f"Unsupported media type: {media_type}")
+        except Exception as e:
+            logger.error(f"Error serializing response: {str(e)}")
+            raise
+
+    def compress(self, body: bytes, encoding: Optional[str]) -> Tuple[bytes, Optional[str]]:
+        """Compress a body if it is large enough.
+
+        Args:
+            body: Serialized body.
+            encoding: Negotiated content encoding (None for identity).
+
+        Returns:
+            The body and the content encoding actually applied.
+        """
+        if encoding is None or len(body) < self.compression_min_bytes:
+            return body, None
+        if encoding == "zstd":
+            zstandard = _optional_module("zstandard")
+            return zstandard.ZstdCompressor(level=self.zstd_level).compress(body), "zstd"
+        return gzip.compress(body, compresslevel=self.gzip_level), "gzip"
+
+    def encode(
+        self,
+        payload: Any,
+        media_type: str,
+        encoding: Optional[str] = None,
+        table: Optional[pd.DataFrame] = None,
+        table_metadata: Optional[Dict[str, Any]] = None,
+        json_body: Optional[bytes] = None
+    ) -> Tuple[bytes, Dict[str, str]]:
+        """Serialize and compress a response body.
+
+        Args:
+            payload: Payload to send (may be None when ``json_body`` is given).
+            media_type: Negotiated media type.
+            encoding: Negotiated content encoding.
+            table: Tabular form of the payload, for Arrow.
+            table_metadata: Rest of the payload, for Arrow.
+            json_body: Payload already serialized as JSON, sent as is for
+                JSON and parsed for the other formats.
+
+        Returns:
+            The body and its response headers (without Content-Type).
+        """
+        if json_body is not None and media_type == JSON:
+            body = json_body
+        else:
+            if json_body is not None:
+                payload = loads_json(json_body)
+            body = self.serialize(payload, media_type, table, table_metadata)
+        body, applied = self.compress(body, encoding)
+
+        headers = {"Vary": "Accept, Accept-Encoding"}
+        if applied is not None:
+            headers["Content-Encoding"] = applied
+        return body, headers
+
+# Create a singleton instance
+response_encoder = ResponseEncoder()
@@ -0,0 +1,213 @@
+"""Module-level task functions dispatched to the CPU process pool.
+
+Tasks receive dataset records and identifiers rather than DataFrames, and
+load data inside the worker process, so that large frames are never
+pickled across the process boundary.
+"""
+from typing import Dict, List, Any, Callable, Optional, Tuple
+
+def init_worker(cpu_workers: int) -> None:
+    """Set up a CPU pool worker process.
+
+    Sizes its dataset cache to the worker budget, and its EDA thread pool
+    to its share of the cores, so that the ``cpu_workers`` processes of the
+    pool do not run more EDA threads together than there are cores.
+    """
+    import os
+    from data_processing.dataset_loader import dataset_loader, DATASET_CACHE_WORKER_MAX_BYTES
+    from eda.automated_eda import automated_eda
+    dataset_loader.max_bytes = DATASET_CACHE_WORKER_MAX_BYTES
+    automated_eda.max_workers = max(1, min(automated_eda.max_workers, (os.cpu_count() or 1) // max(1, cpu_workers)))
+
+def worker_stats() -> Dict[str, Any]:
+    """Get the cache statistics of the worker process this runs in."""
+    from data_processing.dataset_loader import dataset_loader
+    return {"dataset_cache": dataset_loader.get_stats()}
+
+def ingest_dataset_task(file_path: str) -> Dict[str, Any]:
+    """Infer metadata and write the columnar copy of an uploaded file."""
+    from data_processing.data_processor import data_processor
+    return data_processor.ingest_dataset(file_path)
+
+def eda_report_task(
+    dataset_info: Dict[str, Any],
+    columns: Optional[List[str]] = None,
+    target_column: Optional[str] = None
+) -> Dict[str, Any]:
+    """Generate the EDA report of a dataset."""
+    from data_processing.dataset_loader import dataset_loader
+    from eda.automated_eda import automated_eda
+    if columns is not None and target_column and target_column not in columns:
+        columns = list(columns) + [target_column]
+    df = dataset_loader.load(dataset_info, columns=columns)
+    return automated_eda.generate_eda_report(df, target_column)
+
+def eda_stream_task(
+    dataset_info: Dict[str, Any],
+    report_id: str,
+    events,
+    columns: Optional[List[str]] = None,
+    target_column: Optional[str] = None
+) -> None:
+    """Generate the EDA report of a dataset, sending each event as it is produced.
+
+    Events go to the ``events`` queue (see ``TaskExecutor.create_queue``);
+    the finished report is stored in the EDA report cache under ``report_id``.
+    """
+    from data_processing.dataset_loader import dataset_loader
+    from eda.automated_eda import automated_eda
+    from eda.report_cache import eda_report_cache
+    if columns is not None and target_column and target_column not in columns:
+        columns = list(columns) + [target_column]
+    df = dataset_loader.load(dataset_info, columns=columns)
+    report = automated_eda.generate_eda_report(df, target_column, on_event=events.put)
+    eda_report_cache.put(dataset_info["id"], report_id, report)
+
+def eda_plot_task(
+    dataset_info: Dict[str, Any],
+    kind: str,
+    column: Optional[str] = None,
+    target_column: Optional[str] = None
+) -> bytes:
+    """Draw one figure of the EDA report of a dataset, as Plotly JSON bytes.
+
+    Only the columns the figure is drawn from are loaded.
+    """
+    from data_processing.dataset_loader import dataset_loader
+    from eda.automated_eda import automated_eda
+    df = dataset_loader.load(dataset_info, columns=automated_eda.plot_columns(kind, column, target_column))
+    return automated_eda.plot(df, kind, column, target_column).encode("utf-8")
+
+def dataset_profile_task(dataset_info: Dict[str, Any]) -> Dict[str, Any]:
+    """Generate the profile of a dataset."""
+    from data_processing.dataset_loader import dataset_loader
+    from data_processing.data_processor import data_processor
+    df = dataset_loader.load(dataset_info)
+    return data_processor.get_dataset_profile(df)
+
+def correlation_task(
+    dataset_info: Dict[str, Any],
+    method: str = "pearson",
+    threshold: Optional[float] = None,
+    top_k: Optional[int] = None,
+    include_matrix: bool = False
+) -> Dict[str, Any]:
+    """Correlate the numeric columns of a dataset."""
+    import numpy as np
+    from data_processing.dataset_loader import dataset_loader
+    from data_processing.correlation import correlation_engine
+    df = dataset_loader.load(dataset_info)
+    numeric = df.select_dtypes(include=np.number)
+    matrix = correlation_engine.correlation_matrix(numeric, method)
+    columns = list(numeric.columns)
+    return {
+        "method": method,
+        "columns": columns,
+        "pairs": correlation_engine.top_pairs(matrix, columns, threshold=threshold, top_k=top_k),
+        "matrix": correlation_engine.compact_matrix(matrix, columns)["matrix"] if include_matrix else None
+    }
+
+def streaming_profile_task(
+    dataset_info: Dict[str, Any],
+    row_range: Optional[Tuple[int, int]] = None
+):
+    """Build a partial streaming profile over (a row range of) a dataset.
+
+    Returns the mergeable StreamingProfile rather than the rendered profile,
+    so partial results from several workers can be combined.
+    """
+    from data_processing.dataset_loader import dataset_loader
+    from data_processing.data_processor import data_processor
+    from data_processing.streaming_profiler import profile_chunks
+    source_path = dataset_loader.source_path(dataset_info)
+    return profile_chunks(data_processor.iter_chunks(source_path, row_range=row_range))
+
+def predict_task(model_id: str, data: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Make predictions with a trained model."""
+    from ml.model_predictor import model_predictor
+    return model_predictor.predict(model_id, data)
+
+def training_job(job_id: str, params: Dict[str, Any], progress: Callable[[float, str], None]) -> Dict[str, Any]:
+    """Scheduler handler for model training jobs.
+
+    Only the dataset id travels with the job; the worker looks up the
+    dataset record and loads the target and feature columns itself.
+    """
+    from services.database_service import db_service
+    from data_processing.dataset_loader import dataset_loader
+    from ml.model_trainer import model_trainer
+
+    dataset_info = db_service.get_dataset(params["dataset_id"])
+    if not dataset_info:
+        raise ValueError(f"Dataset not found: {params['dataset_id']}")
+
+    progress(0.05, "Loading dataset")
+    columns = list(dict.fromkeys([params["target_column"]] + params["feature_columns"]))
+    df = dataset_loader.load(dataset_info, columns=columns)
+
+    return model_trainer.train_model(
+        df=df,
+        target_column=params["target_column"],
+        feature_columns=params["feature_columns"],
+        model_type=params["model_type"],
+        task_type=params["task_type"],
+        hyperparameters=params.get("hyperparameters"),
+        test_size=params.get("test_size", 0.2),
+        sparse_output=params.get("sparse_output", "auto"),
+        encoding_method=params.get("encoding_method", "auto"),
+        progress_callback=progress,
+        dataset_fingerprint=dataset_loader.content_hash(dataset_info),
+        force=params.get("force", False)
+    )
+
+def streaming_training_job(job_id: str, params: Dict[str, Any], progress: Callable[[float, str], None]) -> Dict[str, Any]:
+    """Scheduler handler for out-of-core model training jobs.
+
+    The dataset is streamed from disk in chunks on every pass, so the
+    worker never holds more than one chunk of it.
+    """
+    from services.database_service import db_service
+    from data_processing.dataset_loader import dataset_loader
+    from data_processing.data_processor import data_processor
+    from ml.streaming_trainer import streaming_trainer, STREAMING_TRAIN_CHUNK_ROWS, STREAMING_TRAIN_EPOCHS
+
+    dataset_info = db_service.get_dataset(params["dataset_id"])
+    if not dataset_info:
+        raise ValueError(f"Dataset not found: {params['dataset_id']}")
+
+    source_path = dataset_loader.source_path(dataset_info)
+    columns = list(dict.fromkeys([params["target_column"]] + params["feature_columns"]))
+    return streaming_trainer.train_model(
+        chunks=lambda: data_processor.iter_chunks(source_path, STREAMING_TRAIN_CHUNK_ROWS, columns=columns),
+        target_column=params["target_column"],
+        feature_columns=params["feature_columns"],
+        model_type=params["model_type"],
+        task_type=params["task_type"],
+        hyperparameters=params.get("hyperparameters"),
+        test_size=params.get("test_size", 0.2),
+        epochs=params.get("epochs") or STREAMING_TRAIN_EPOCHS,
+        dtypes=dataset_info.get("columns"),
+        total_rows=dataset_info.get("row_count"),
+        progress_callback=progress
+    )
+
+def leaderboard_prepare_task(dataset_info: Dict[str, Any], params: Dict[str, Any]) -> Dict[str, Any]:
+    """Split and preprocess a dataset once for the candidates of a leaderboard.
+
+    Returns the description of the shared feature matrices written to disk
+    (see ``ModelLeaderboard.prepare``), not the matrices themselves.
+    """
+    from data_processing.dataset_loader import dataset_loader
+    from ml.leaderboard import model_leaderboard
+    columns = list(dict.fromkeys([params["target_column"]] + params["feature_columns"]))
+    df = dataset_loader.load(dataset_info, columns=columns)
+    return model_leaderboard.prepare(
+        df,
+        target_column=params["target_column"],
+        feature_columns=params["feature_columns"],
+        task_type=params["task_type"],
+        test_size=params.get("test_size", 0.2),
+        sparse_output=params.get("sparse_output", "auto"),
+        encoding_method=params.get("encoding_method", "auto"),
+        dataset_fingerprint=dataset_loader.content_hash(dataset_info)
+    )